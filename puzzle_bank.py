@@ -0,0 +1,197 @@
+# Slide Puzzle Scramble Bank
+# Auther: G.G.Otto
+# Version: 1.3
+
+import mmap
+import os
+import os.path as path
+import random
+import struct
+import sys
+import time
+import zlib
+from puzzle_batch import get_pool, get_worker_solver
+from puzzle_board import PuzzleBoard, get_randomizer
+
+# file layout: header, then (offset, count) of each distance, then one packed state per board
+MAGIC = b"SPSB"
+VERSION = 1
+HEADER_FORMAT = "<4sBBBHI" # magic, version, width, height, distances, crc32 of the rest
+BUCKET_FORMAT = "<II"
+
+def get_bank_file(width, height):
+    '''get_bank_file(width, height) -> str
+    returns the file of the scramble bank for the board size'''
+    return path.join(path.dirname(path.realpath(__file__)), f"slide_puzzle_bank_{width}x{height}.db")
+
+def get_distance(item):
+    '''get_distance(item) -> (state, distance)
+    returns the optimal distance of (width, height, state) in a worker'''
+    width, height, state = item
+    return (state, len(get_worker_solver(width, height).solve(PuzzleBoard(width, height, state))))
+
+class PuzzleScrambleBank:
+    '''represents boards bucketed by their optimal distance
+    a board is its packed state, so sampling a distance is one read'''
+
+    def __init__(self, width=4, height=4, fileName=None):
+        '''PuzzleScrambleBank(width=4, height=4, fileName=None) -> PuzzleScrambleBank
+        constructs the bank for the board size, nothing is loaded yet'''
+        self.width = width
+        self.height = height
+        self.fileName = get_bank_file(width, height) if fileName == None else fileName
+        board = PuzzleBoard(width, height)
+        self.stateBytes = (board.bits*board.size + 7) // 8
+        self.map = None
+        self.buckets = None
+
+    def get_distances(self):
+        '''PuzzleScrambleBank.get_distances() -> list
+        returns the distances that have boards'''
+        if not self.load():
+            return []
+        return [distance for distance, bucket in enumerate(self.buckets) if bucket[1] > 0]
+
+    def get_count(self, distance):
+        '''PuzzleScrambleBank.get_count(distance) -> int
+        returns how many boards are at distance'''
+        if not self.load() or not 0 <= distance < len(self.buckets):
+            return 0
+        return self.buckets[distance][1]
+
+    def get_nearest(self, distance):
+        '''PuzzleScrambleBank.get_nearest(distance) -> int
+        returns the distance with boards closest to distance, None if the bank is empty'''
+        return min(self.get_distances(), key=lambda other: (abs(other - distance), other), default=None)
+
+    def sample(self, distance, randomizer=random):
+        '''PuzzleScrambleBank.sample(distance, randomizer=random) -> PuzzleBoard
+        returns a uniformly random board at the distance with boards closest to distance'''
+        distance = self.get_nearest(distance)
+        if distance == None:
+            raise ValueError("scramble bank is empty or missing")
+
+        offset, count = self.buckets[distance]
+        start = offset + randomizer.randrange(count)*self.stateBytes
+        return PuzzleBoard(self.width, self.height, int.from_bytes(self.map[start:start + self.stateBytes], "little"))
+
+    def load(self):
+        '''PuzzleScrambleBank.load() -> bool
+        memory maps the bank, returns False if it is missing or damaged'''
+        if self.buckets != None:
+            return True
+        if not path.isfile(self.fileName):
+            return False
+
+        with open(self.fileName, "rb") as file:
+            bankMap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        headerSize = struct.calcsize(HEADER_FORMAT)
+        if len(bankMap) < headerSize:
+            bankMap.close()
+            return False
+
+        magic, version, width, height, distances, crc = struct.unpack_from(HEADER_FORMAT, bankMap)
+        if magic != MAGIC or version != VERSION or (width, height) != (self.width, self.height) or \
+           zlib.crc32(memoryview(bankMap)[headerSize:]) != crc:
+            bankMap.close()
+            return False
+
+        bucketSize = struct.calcsize(BUCKET_FORMAT)
+        self.buckets = [struct.unpack_from(BUCKET_FORMAT, bankMap, headerSize + distance*bucketSize) for distance in range(distances)]
+        self.map = bankMap
+        return True
+
+    def save(self, buckets):
+        '''PuzzleScrambleBank.save(buckets) -> None
+        writes a list of state lists, one for each distance, to the file in one step'''
+        self.close()
+        headerSize = struct.calcsize(HEADER_FORMAT)
+        offset = headerSize + len(buckets)*struct.calcsize(BUCKET_FORMAT)
+        table = b""
+        states = bytearray()
+        for bucket in buckets:
+            table += struct.pack(BUCKET_FORMAT, offset + len(states), len(bucket))
+            for state in bucket:
+                states += state.to_bytes(self.stateBytes, "little")
+
+        body = table + states
+        tempName = self.fileName + ".tmp"
+        with open(tempName, "wb") as file:
+            file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, self.width, self.height, len(buckets), zlib.crc32(body)))
+            file.write(body)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tempName, self.fileName)
+
+    def build(self, boards=2000, perDistance=500, processes=None, report=sys.stderr, seed=None):
+        '''PuzzleScrambleBank.build(boards=2000, perDistance=500, processes=None, report=sys.stderr, seed=None) -> None
+        solves boards random boards with a pool of processes and saves up to
+        perDistance of them at each optimal distance, half are random walks
+        of every length so short distances are filled too
+        seed: seed of the boards, the same seed always builds the same bank'''
+        processes = processes or os.cpu_count()
+        randomizer = get_randomizer(seed)
+        board = PuzzleBoard(self.width, self.height)
+        items = {}
+        for i in range(boards):
+            if i % 2 == 0:
+                board.randomize(randomizer)
+            else:
+                board.reset()
+                board.shuffle(randomizer.randint(1, 4*board.size), randomizer)
+            items[self.width, self.height, board.get_state()] = True
+
+        # load the tables once so forked workers share them
+        solver = get_worker_solver(self.width, self.height)
+        if report != None and hasattr(solver, "get_fallback_note") and solver.get_fallback_note():
+            print(solver.get_fallback_note(), file=report)
+            print("Without it each random board of the bank can take hours to solve.", file=report)
+
+        # results come back in order so which boards are kept does not depend on the workers
+        buckets = []
+        startTime = time.perf_counter()
+        with get_pool(processes) as pool:
+            for state, distance in pool.imap(get_distance, items, chunksize=4):
+                while len(buckets) <= distance:
+                    buckets.append([])
+                if len(buckets[distance]) < perDistance:
+                    buckets[distance].append(state)
+        self.save(buckets)
+
+        if report != None:
+            print(f"banked {sum(len(bucket) for bucket in buckets)} of {len(items)} boards "
+                f"in {int((time.perf_counter() - startTime)*100)/100} s with {processes} processes", file=report)
+
+    def build_from_search(self, maxDepth=None, perDistance=500, report=sys.stderr, seed=None):
+        '''PuzzleScrambleBank.build_from_search(maxDepth=None, perDistance=500, report=sys.stderr, seed=None) -> None
+        saves up to perDistance random boards of each distance up to maxDepth
+        found by a breadth first search from the goal, every distance is exact
+        so it suits boards small enough to search, needs numpy
+        seed: seed of the boards picked at each distance
+        every layer of the search is held in memory, so boards bigger than
+        3x3 need maxDepth'''
+        if maxDepth == None and self.width*self.height > 9:
+            raise ValueError("searching a board bigger than 3x3 needs a max depth")
+        from puzzle_frontier import PuzzleBatcher # imported here as numpy is optional
+        batcher = PuzzleBatcher(self.width, self.height)
+        randomizer = get_randomizer(seed)
+        buckets = []
+        states = 0
+        startTime = time.perf_counter()
+        for depth, keys in batcher.search(maxDepth=maxDepth):
+            picked = sorted(randomizer.sample(range(len(keys)), min(perDistance, len(keys))))
+            buckets.append([int(keys[index]) for index in picked])
+            states += len(keys)
+        self.save(buckets)
+
+        if report != None:
+            print(f"banked {sum(len(bucket) for bucket in buckets)} of {states} boards searched "
+                f"to distance {len(buckets)-1} in {int((time.perf_counter() - startTime)*100)/100} s", file=report)
+
+    def close(self):
+        '''PuzzleScrambleBank.close() -> None
+        unmaps the file'''
+        if self.map != None:
+            self.map.close()
+        self.map = None
+        self.buckets = None
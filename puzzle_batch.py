@@ -0,0 +1,148 @@
+# Slide Puzzle Batch
+# Auther: G.G.Otto
+# Version: 1.3
+
+import json
+import os
+import sys
+import threading
+import time
+from puzzle_board import PuzzleBoard, MOVE_NAMES, get_randomizer
+from puzzle_solver import get_solver
+from puzzle_tables import PuzzleEightTable
+
+# solvers of each worker, by board size, the first is made before the pool forks
+workerSolvers = {}
+
+def read_boards(file):
+    '''read_boards(file) -> generator
+    yields (line, id, tiles) for each board in a JSONL or text file
+    a JSON line is a list of tiles or an object with "tiles" and an optional "id"
+    a text line is the tiles split by spaces or commas, 0 is the empty space'''
+    for lineNumber, line in enumerate(file, 1):
+        line = line.strip()
+        if line == "" or line.startswith("#"):
+            continue
+
+        # get the tiles from the line
+        boardId = lineNumber
+        try:
+            if line[0] in "[{":
+                item = json.loads(line)
+                if isinstance(item, dict):
+                    boardId = item.get("id", lineNumber)
+                    item = item["tiles"]
+                tiles = [int(tile) for tile in item]
+            else:
+                tiles = [int(tile) for tile in line.replace(",", " ").split()]
+        except (ValueError, KeyError, TypeError) as error:
+            yield (lineNumber, boardId, str(error))
+            continue
+
+        yield (lineNumber, boardId, tiles)
+
+def get_worker_solver(width, height):
+    '''get_worker_solver(width, height) -> solver
+    returns the solver of this worker for the board size, made the first time
+    with its tables loaded, so workers forked after it share them'''
+    if (width, height) not in workerSolvers:
+        solver = workerSolvers[width, height] = get_solver(width, height)
+        if isinstance(solver, PuzzleEightTable):
+            solver.get_table()
+        else:
+            solver.is_using_patterns()
+    return workerSolvers[width, height]
+
+def get_pool(processes):
+    '''get_pool(processes) -> multiprocessing.pool.Pool
+    returns a pool of processes, forked where possible so the workers
+    share the solvers made by get_worker_solver before it'''
+    # imported here so the game does not load it at startup
+    import multiprocessing
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork").Pool(processes)
+    return multiprocessing.get_context().Pool(processes)
+
+def solve_item(item):
+    '''solve_item(item) -> dict
+    solves one (width, height, item from read_boards) in a worker'''
+    width, height, (lineNumber, boardId, tiles) = item
+    output = {"line": lineNumber, "id": boardId}
+    if isinstance(tiles, str):
+        output["error"] = tiles
+        return output
+
+    try:
+        solver = get_worker_solver(width, height)
+        board = PuzzleBoard(width, height)
+        board.set_tiles(tiles)
+        moves = solver.solve(board)
+    except ValueError as error:
+        output["error"] = str(error)
+        return output
+
+    nodes, seconds, speed = solver.get_stats()
+    output.update({"length": len(moves), "moves": "".join(MOVE_NAMES[move] for move in moves),
+        "nodes": nodes, "seconds": seconds, "worker": os.getpid()})
+    return output
+
+def solve_boards(inFile, outFile, processes=None, report=sys.stderr, width=4, height=4):
+    '''solve_boards(inFile, outFile, processes=None, report=sys.stderr, width=4, height=4) -> dict
+    solves every width by height board in inFile with a pool of processes and
+    writes one JSON line per board to outFile as they finish, returns the totals'''
+    processes = processes or os.cpu_count()
+
+    # load the tables once so forked workers share them
+    solver = get_worker_solver(width, height)
+    if report != None and hasattr(solver, "get_fallback_note") and solver.get_fallback_note():
+        print(solver.get_fallback_note(), file=report)
+
+    # only keep a few boards per worker waiting at a time
+    waiting = threading.BoundedSemaphore(processes*4)
+    def feed():
+        for item in read_boards(inFile):
+            waiting.acquire()
+            yield (width, height, item)
+
+    totals = {"boards": 0, "errors": 0, "moves": 0, "nodes": 0, "cpuSeconds": 0}
+    startTime = time.perf_counter()
+    with get_pool(processes) as pool:
+        for result in pool.imap_unordered(solve_item, feed()):
+            waiting.release()
+            outFile.write(json.dumps(result) + "\n")
+            outFile.flush()
+
+            # add up the totals
+            totals["boards"] += 1
+            if "error" in result:
+                totals["errors"] += 1
+            else:
+                totals["moves"] += result["length"]
+                totals["nodes"] += result["nodes"]
+                totals["cpuSeconds"] += result["seconds"]
+    totals["seconds"] = time.perf_counter() - startTime
+    totals["processes"] = processes
+
+    if report != None:
+        seconds = totals["seconds"] or 1
+        print(f"solved {totals['boards'] - totals['errors']} boards ({totals['errors']} errors) "
+            f"in {int(seconds*100)/100} s with {processes} processes", file=report)
+        print(f"{int(totals['boards']/seconds/processes*100)/100} boards/s per core, "
+            f"{int(totals['nodes']/seconds/processes)} nodes/s per core", file=report)
+    return totals
+
+def generate_boards(outFile, count, length, width=4, height=4, seed=None):
+    '''generate_boards(outFile, count, length, width=4, height=4, seed=None) -> None
+    writes count boards scrambled by a random walk of length moves as JSON lines
+    seed: seed of the walks, the same seed always writes the same boards'''
+    randomizer = get_randomizer(seed)
+    board = PuzzleBoard(width, height)
+    for i in range(count):
+        board.reset()
+        last = -1
+        for j in range(length):
+            # never undo the last move
+            move = randomizer.choice([move for move in board.get_moves() if move ^ 1 != last])
+            board.slide(move)
+            last = move
+        outFile.write(json.dumps({"id": i+1, "tiles": board.get_tiles()}) + "\n")
@@ -0,0 +1,304 @@
+# Slide Puzzle Benchmarks
+# Auther: G.G.Otto
+# Version: 1.3
+
+import argparse
+import json
+import os.path as path
+import platform
+import subprocess
+import sys
+import time
+from puzzle_board import PuzzleBoard, MOVE_DIRECTIONS, get_randomizer
+from puzzle_solver import PuzzleSolver, get_solver
+from puzzle_frontier import PuzzleBatcher, has_numpy
+
+IMAGE_FILE = path.join(path.dirname(path.realpath(__file__)), "puzzle2.png")
+GAME_FILE = path.join(path.dirname(path.realpath(__file__)), "slide_puzzle.py")
+
+# metrics ending in these are better when higher, everything else timed is better when lower
+HIGHER_IS_BETTER = ("PerSecond", "FrameRate", "FramesPerSlide")
+
+class StubCanvas:
+    '''represents a canvas that only counts the items moved'''
+
+    def __init__(self):
+        '''StubCanvas() -> StubCanvas
+        constructs the stub canvas'''
+        self.moves = 0
+
+    def move(self, tag, x, y):
+        '''StubCanvas.move(tag, x, y) -> None
+        counts a move'''
+        self.moves += 1
+
+class StubTicker:
+    '''represents a ticker that runs its jobs in a plain loop'''
+
+    def __init__(self):
+        '''StubTicker() -> StubTicker
+        constructs the ticker with no jobs'''
+        self.jobs = {}
+
+    def add_job(self, name, interval, function, delay=None):
+        '''StubTicker.add_job(name, interval, function, delay=None) -> None
+        registers function under name'''
+        self.jobs[name] = (interval, function)
+
+    def run(self):
+        '''StubTicker.run() -> list
+        calls the jobs on time until none are left, returns the seconds each call took'''
+        callTimes = []
+        nextTime = time.monotonic()
+        while self.jobs:
+            name, (interval, function) = next(iter(self.jobs.items()))
+            time.sleep(max(0, nextTime - time.monotonic()))
+            startTime = time.perf_counter()
+            if function(time.monotonic()) == False and self.jobs.get(name, (0, None))[1] == function:
+                del self.jobs[name]
+            callTimes.append(time.perf_counter() - startTime)
+            nextTime += interval
+        return callTimes
+
+def get_rate(function, count):
+    '''get_rate(function, count) -> float
+    returns how many times per second function(i) runs over count calls'''
+    startTime = time.perf_counter()
+    for i in range(count):
+        function(i)
+    return count/(time.perf_counter() - startTime)
+
+def bench_engine(seed, count):
+    '''bench_engine(seed, count) -> dict
+    returns the rates of moves, win checks and scrambles'''
+    randomizer = get_randomizer(seed)
+    board = PuzzleBoard(4, 4)
+    moves = [randomizer.randrange(4) for i in range(count)]
+    results = {"movesPerSecond": get_rate(lambda i: board.slide(moves[i]), count)}
+    results["winChecksPerSecond"] = get_rate(lambda i: board.is_solved(), count)
+    results["clickMovesPerSecond"] = get_rate(lambda i: board.move_to((moves[i], moves[i-1])), count)
+
+    # scrambles of each size
+    for size in ((3, 3), (4, 4), (6, 6), (8, 8)):
+        board = PuzzleBoard(*size)
+        results[f"scrambles{size[0]}x{size[1]}PerSecond"] = get_rate(lambda i: board.shuffle(80, randomizer), max(count//200, 10))
+    board = PuzzleBoard(4, 4)
+    results["randomBoardsPerSecond"] = get_rate(lambda i: board.randomize(randomizer), max(count//50, 10))
+    return results
+
+def get_heuristic_name(solver):
+    '''get_heuristic_name(solver) -> str
+    returns how the solver estimates distances, "table" for the 3x3 table'''
+    if isinstance(solver, PuzzleSolver):
+        return solver.get_heuristic_name()
+    return "table"
+
+def bench_solver(seed, boards, size=(4, 4), walk=40, solver=None):
+    '''bench_solver(seed, boards, size=(4, 4), walk=40, solver=None) -> dict
+    solves random walks of up to walk moves and returns the nodes per second,
+    or table lookups per second for the 3x3 table, and the solve time for
+    each bucket of 10 optimal moves
+    solver: solver to use, get_solver(*size) if None'''
+    randomizer = get_randomizer(seed)
+    if solver == None:
+        solver = get_solver(*size)
+    board = PuzzleBoard(*size)
+    buckets = {}
+    nodes = 0
+    seconds = 0
+    for i in range(boards):
+        board.reset()
+        board.shuffle(randomizer.randint(walk//4, walk), randomizer)
+        moves = solver.solve(board)
+        solveNodes, solveSeconds, speed = solver.get_stats()
+        nodes += solveNodes
+        seconds += solveSeconds
+        buckets.setdefault(len(moves)//10*10, []).append(solveSeconds)
+
+    name = f"solver{size[0]}x{size[1]}"
+    unit = "NodesPerSecond" if isinstance(solver, PuzzleSolver) else "LookupsPerSecond"
+    results = {name + unit: nodes/seconds if seconds else 0}
+    for bucket, times in sorted(buckets.items()):
+        results[f"{name}Moves{bucket}to{bucket+9}Seconds"] = sum(times)/len(times)
+    return results
+
+def bench_batch(seed, count):
+    '''bench_batch(seed, count) -> dict
+    returns the rates of expanding and estimating 4x4 boards one at a time,
+    with the board clicks the game uses, and as numpy batches,
+    None if numpy is not installed'''
+    if not has_numpy():
+        return None
+    randomizer = get_randomizer(seed)
+    board = PuzzleBoard(4, 4)
+    states = []
+    for i in range(count):
+        board.randomize(randomizer)
+        states.append(board.get_state())
+
+    # one board at a time, clicking each tile next to the empty space
+    def expand(i):
+        board.set_state(states[i])
+        emptyRow, emptyColumn = board.get_empty()
+        for direction in MOVE_DIRECTIONS:
+            pos = (emptyRow - direction[0], emptyColumn - direction[1])
+            if 0 <= pos[0] < board.width and 0 <= pos[1] < board.height and board.get_tiles_to_move(pos):
+                board.move_to(pos)
+                board.set_state(states[i])
+    solver = PuzzleSolver(4, 4)
+    results = {"scalarExpansionsPerSecond": get_rate(expand, count)}
+    results["scalarHeuristicsPerSecond"] = get_rate(lambda i: solver.get_heuristic(board.unpack(states[i])), count)
+
+    # the whole batch at once, including packing and unpacking
+    batcher = PuzzleBatcher(4, 4)
+    startTime = time.perf_counter()
+    batcher.get_keys(batcher.expand(batcher.from_states(states))[0])
+    results["batchExpansionsPerSecond"] = count/(time.perf_counter() - startTime)
+    startTime = time.perf_counter()
+    batcher.get_heuristic(batcher.from_states(states))
+    results["batchHeuristicsPerSecond"] = count/(time.perf_counter() - startTime)
+
+    # every 3x3 board by breadth first search
+    startTime = time.perf_counter()
+    for depth, keys in PuzzleBatcher(3, 3).search():
+        pass
+    results["batchSearch3x3Seconds"] = time.perf_counter() - startTime
+    return results
+
+def bench_animation(slides):
+    '''bench_animation(slides) -> dict
+    returns the cost of each frame of animate_move against a stub canvas'''
+    from slide_puzzle import PuzzleAnimator
+    canvas = StubCanvas()
+    ticker = StubTicker()
+    animator = PuzzleAnimator(ticker, canvas)
+    stepTimes = []
+    for i in range(slides):
+        animator.start((75, 0))
+        stepTimes += ticker.run()
+    return {"stubFrameSeconds": sum(stepTimes)/len(stepTimes), "stubWorstFrameSeconds": max(stepTimes),
+        "stubFramesPerSlide": len(stepTimes)/slides, "stubFrameRate": animator.get_frame_rate()}
+
+def bench_tk(slides):
+    '''bench_tk(slides) -> dict
+    returns frame timings of animate_move and image slicing on a real Tk root,
+    None if there is no display'''
+    import tkinter
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError:
+        return None
+
+    from slide_puzzle import PuzzleFrame
+    from puzzle_images import PuzzleImageCache
+    results = {}
+    puzzle = PuzzleFrame(root)
+    root.update()
+
+    # slide the piece next to the empty space back and forth
+    pieces = puzzle.get_pieces()
+    for i in range(slides):
+        done = tkinter.StringVar(root)
+        direction = (1, 0) if i % 2 == 0 else (-1, 0)
+        puzzle.animate_move((direction, [pieces[14]]), False, lambda: done.set("done"))
+        root.wait_variable(done)
+    frameTimes = puzzle.animator.get_frame_times()
+    results["tkFrameRate"] = puzzle.animator.get_frame_rate()
+    results["tkWorstFrameSeconds"] = max(frameTimes, default=0)
+
+    # decode and slice an image
+    if path.isfile(IMAGE_FILE):
+        cache = PuzzleImageCache()
+        startTime = time.perf_counter()
+        cache.slice_image(IMAGE_FILE, (4, 4), (73, 73))
+        results["tkImageSliceSeconds"] = time.perf_counter() - startTime
+
+    root.destroy()
+    return results
+
+def bench_startup(runs):
+    '''bench_startup(runs) -> dict
+    returns the best time to the first frame of a fresh game over runs,
+    None if there is no display'''
+    times = []
+    for i in range(runs):
+        result = subprocess.run([sys.executable, GAME_FILE, "startup", "-b", "inf"], capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        times.append(float(result.stdout.split()[4])/1000)
+    return {"startupSeconds": min(times)}
+
+def run_benchmarks(seed=1, quick=False):
+    '''run_benchmarks(seed=1, quick=False) -> dict
+    runs every benchmark, the same seed gives the same workload'''
+    scale = 1 if quick else 5
+    results = {"seed": seed, "python": platform.python_version(), "machine": platform.machine(), "metrics": {}}
+    metrics = results["metrics"]
+    metrics.update(bench_engine(seed, 20000*scale))
+
+    # which heuristic each solver used, timings of different ones do not compare
+    results["heuristics"] = {}
+    for size, boards in (((3, 3), 20*scale), ((4, 4), 4*scale)):
+        solver = get_solver(*size)
+        results["heuristics"][f"solver{size[0]}x{size[1]}"] = get_heuristic_name(solver)
+        metrics.update(bench_solver(seed, boards, size, 40, solver))
+    metrics.update(bench_animation(2*scale))
+
+    batchResults = bench_batch(seed, 20000*scale)
+    if batchResults == None:
+        results["skipped"] = ["batch expansion needs numpy"]
+    else:
+        metrics.update(batchResults)
+
+    tkResults = bench_tk(4*scale)
+    if tkResults == None:
+        results.setdefault("skipped", []).append("tk rendering and image slicing need a display")
+    else:
+        metrics.update(tkResults)
+        startupResults = bench_startup(scale)
+        if startupResults == None:
+            results.setdefault("skipped", []).append("startup time needs the game to start")
+        else:
+            metrics.update(startupResults)
+    return results
+
+def compare(results, baseline, tolerance=0.2):
+    '''compare(results, baseline, tolerance=0.2) -> list
+    returns a message for each metric more than tolerance worse than baseline
+    and for each solver that used another heuristic than in baseline'''
+    output = []
+    for name, heuristic in results.get("heuristics", {}).items():
+        old = baseline.get("heuristics", {}).get(name)
+        if old != None and old != heuristic:
+            output.append(f"{name}: heuristic {old} -> {heuristic}, its timings do not compare")
+    for name, value in results["metrics"].items():
+        old = baseline.get("metrics", {}).get(name)
+        if not old or not value:
+            continue
+        if name.endswith(HIGHER_IS_BETTER):
+            change = old/value - 1
+        else:
+            change = value/old - 1
+        if change > tolerance:
+            output.append(f"{name}: {old:.6g} -> {value:.6g} ({int(change*100)}% worse)")
+    return output
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Slide Puzzle benchmarks")
+    parser.add_argument("-o", "--output", default="-", help="file for the JSON results, - for stdout")
+    parser.add_argument("-b", "--baseline", default=None, help="JSON results of an earlier run to compare with")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.2, help="how much worse a metric may get, 0.2 is 20%%")
+    parser.add_argument("-s", "--seed", type=int, default=1, help="seed of the workloads")
+    parser.add_argument("-q", "--quick", action="store_true", help="run smaller workloads")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.seed, args.quick)
+    if args.baseline != None:
+        with open(args.baseline, "r") as file:
+            results["regressions"] = compare(results, json.load(file), args.tolerance)
+
+    outFile = sys.stdout if args.output == "-" else open(args.output, "w")
+    outFile.write(json.dumps(results, indent=2) + "\n")
+    if results.get("regressions"):
+        print("\n".join(results["regressions"]), file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,292 @@
+# Slide Puzzle Board
+# Auther: G.G.Otto
+# Version: 1.3
+
+import random
+
+# moves are named by the direction the tile slides into the empty space
+UP, DOWN, LEFT, RIGHT = range(4)
+MOVE_NAMES = "UDLR"
+MOVE_DIRECTIONS = ((0,-1), (0,1), (-1,0), (1,0))
+
+def new_seed():
+    '''new_seed() -> int
+    returns a fresh seed for a game'''
+    return random.SystemRandom().randrange(1, 1 << 32)
+
+def get_randomizer(seed):
+    '''get_randomizer(seed) -> random.Random
+    returns the randomizer of a game, the same seed gives the same
+    scramble on any machine'''
+    return random.Random(seed)
+
+class PuzzleBoard:
+    '''represents the state of the puzzle without any graphics
+    the tiles are packed into one int with at least 4 bits per tile, 0 is the empty space'''
+
+    def __init__(self, width=4, height=4, state=None):
+        '''PuzzleBoard(width=4, height=4, state=None) -> PuzzleBoard
+        constructs the board, solved if state is None'''
+        if width < 2 or height < 2:
+            raise ValueError("board must be at least 2x2")
+
+        self.width = width
+        self.height = height
+        self.size = width*height
+        self.bits = max(4, (self.size-1).bit_length())
+        self.mask = (1 << self.bits) - 1
+        self.goal = self.pack([n+1 for n in range(self.size-1)] + [0])
+        self.neighbors = self.get_neighbor_table()
+        self.history = []
+
+        # set up state
+        if state == None:
+            state = self.goal
+        self.set_state(state)
+
+    def __eq__(self, other):
+        '''PuzzleBoard == other -> bool
+        returns if the boards are in the same state'''
+        return isinstance(other, PuzzleBoard) and self.state == other.state and \
+            (self.width, self.height) == (other.width, other.height)
+
+    def __hash__(self):
+        '''hash(PuzzleBoard) -> int
+        returns the hash of the board state'''
+        return hash(self.state)
+
+    def __str__(self):
+        '''str(PuzzleBoard) -> str
+        returns the board as rows of numbers'''
+        tiles = self.get_tiles()
+        return "\n".join(" ".join(f"{tile:2}" if tile else " ." for tile in tiles[column*self.width:(column+1)*self.width])
+            for column in range(self.height))
+
+    def get_neighbor_table(self):
+        '''PuzzleBoard.get_neighbor_table() -> tuple
+        returns a table of the index that slides into each empty index
+        for each move, -1 if the move is not possible'''
+        table = []
+        for index in range(self.size):
+            row, column = index % self.width, index // self.width
+            moves = []
+            for direction in MOVE_DIRECTIONS:
+                # the tile comes from the opposite side of the empty space
+                newRow, newColumn = row - direction[0], column - direction[1]
+                if 0 <= newRow < self.width and 0 <= newColumn < self.height:
+                    moves.append(newColumn*self.width + newRow)
+                else:
+                    moves.append(-1)
+            table.append(tuple(moves))
+        return tuple(table)
+
+    def pack(self, tiles):
+        '''PuzzleBoard.pack(tiles) -> int
+        packs a list of tiles into an int'''
+        state = 0
+        for index, tile in enumerate(tiles):
+            state |= tile << (index*self.bits)
+        return state
+
+    def unpack(self, state):
+        '''PuzzleBoard.unpack(state) -> list
+        unpacks an int into a list of tiles'''
+        return [(state >> (index*self.bits)) & self.mask for index in range(self.size)]
+
+    def get_size(self):
+        '''PuzzleBoard.get_size() -> (width, height)
+        returns the size of the board'''
+        return (self.width, self.height)
+
+    def get_state(self):
+        '''PuzzleBoard.get_state() -> int
+        returns the packed state of the board'''
+        return self.state
+
+    def get_tiles(self):
+        '''PuzzleBoard.get_tiles() -> list
+        returns a list of the tiles in index order'''
+        return self.unpack(self.state)
+
+    def get_tile(self, pos):
+        '''PuzzleBoard.get_tile(pos) -> int
+        returns the tile at (row, column), 0 if empty'''
+        return (self.state >> ((pos[1]*self.width + pos[0])*self.bits)) & self.mask
+
+    def get_empty(self):
+        '''PuzzleBoard.get_empty() -> (row, column)
+        returns the position of the empty space'''
+        return (self.emptyIndex % self.width, self.emptyIndex // self.width)
+
+    def get_empty_index(self):
+        '''PuzzleBoard.get_empty_index() -> int
+        returns the index of the empty space'''
+        return self.emptyIndex
+
+    def get_history(self):
+        '''PuzzleBoard.get_history() -> list
+        returns the moves made since the history was cleared'''
+        return self.history
+
+    def set_state(self, state):
+        '''PuzzleBoard.set_state(state) -> None
+        sets the board to the packed state and clears the history'''
+        self.state = state
+        self.emptyIndex = self.unpack(state).index(0)
+        self.history = []
+
+    def set_tiles(self, tiles):
+        '''PuzzleBoard.set_tiles(tiles) -> None
+        sets the board to a list of tiles in index order'''
+        if sorted(tiles) != list(range(self.size)):
+            raise ValueError("tiles must use every number from 0 to " + str(self.size-1))
+        self.set_state(self.pack(tiles))
+
+    def reset(self):
+        '''PuzzleBoard.reset() -> None
+        puts the board back in the solved state'''
+        self.set_state(self.goal)
+
+    def clear_history(self):
+        '''PuzzleBoard.clear_history() -> None
+        forgets the moves made so far'''
+        self.history = []
+
+    def copy(self):
+        '''PuzzleBoard.copy() -> PuzzleBoard
+        returns a copy of the board without its history'''
+        return PuzzleBoard(self.width, self.height, self.state)
+
+    def is_solved(self):
+        '''PuzzleBoard.is_solved() -> bool
+        returns if the board is solved'''
+        return self.state == self.goal
+
+    def is_solvable(self):
+        '''PuzzleBoard.is_solvable() -> bool
+        returns if the goal can be reached from the board'''
+        tiles = [tile for tile in self.get_tiles() if tile != 0]
+        inversions = 0
+        for i in range(len(tiles)):
+            for j in range(i+1, len(tiles)):
+                if tiles[i] > tiles[j]:
+                    inversions += 1
+
+        # odd widths only care about inversions
+        if self.width % 2 == 1:
+            return inversions % 2 == 0
+        return (inversions + self.height - 1 - self.emptyIndex // self.width) % 2 == 0
+
+    def can_slide(self, move):
+        '''PuzzleBoard.can_slide(move) -> bool
+        returns if the move is possible'''
+        return self.neighbors[self.emptyIndex][move] >= 0
+
+    def get_moves(self):
+        '''PuzzleBoard.get_moves() -> list
+        returns a list of the possible moves'''
+        return [move for move in range(4) if self.neighbors[self.emptyIndex][move] >= 0]
+
+    def slide(self, move):
+        '''PuzzleBoard.slide(move) -> bool
+        slides a tile into the empty space, returns False if not possible'''
+        source = self.neighbors[self.emptyIndex][move]
+        if source < 0:
+            return False
+
+        # the empty space is 0 so xor moves the tile across
+        shift = source*self.bits
+        tile = (self.state >> shift) & self.mask
+        self.state ^= (tile << shift) | (tile << (self.emptyIndex*self.bits))
+        self.emptyIndex = source
+        self.history.append(move)
+        return True
+
+    def undo(self):
+        '''PuzzleBoard.undo() -> int
+        undoes the last move, returns the move undone or None'''
+        if not self.history:
+            return None
+
+        move = self.history.pop()
+        self.slide(move ^ 1) # UP/DOWN and LEFT/RIGHT are pairs
+        self.history.pop()
+        return move
+
+    def get_move_to(self, pos):
+        '''PuzzleBoard.get_move_to(pos) -> (move, count)
+        returns the move and number of times needed for the tile at pos
+        to reach the empty space, None if not in line'''
+        row, column = pos
+        emptyRow, emptyColumn = self.get_empty()
+        if (row, column) == (emptyRow, emptyColumn):
+            return None
+        elif column == emptyColumn:
+            return (RIGHT, emptyRow - row) if row < emptyRow else (LEFT, row - emptyRow)
+        elif row == emptyRow:
+            return (DOWN, emptyColumn - column) if column < emptyColumn else (UP, column - emptyColumn)
+        return None
+
+    def get_tiles_to_move(self, pos):
+        '''PuzzleBoard.get_tiles_to_move(pos) -> list
+        returns the tiles between pos and the empty space that would slide'''
+        moveTo = self.get_move_to(pos)
+        if moveTo == None:
+            return []
+
+        # walk back from the empty space
+        direction = MOVE_DIRECTIONS[moveTo[0]]
+        step = -(direction[1]*self.width + direction[0])
+        index = self.emptyIndex
+        output = []
+        for i in range(moveTo[1]):
+            index += step
+            output.append((self.state >> (index*self.bits)) & self.mask)
+        return output
+
+    def move_to(self, pos):
+        '''PuzzleBoard.move_to(pos) -> list
+        slides the tile at pos and all tiles between it and the empty space
+        returns the tiles moved'''
+        tiles = self.get_tiles_to_move(pos)
+        if tiles:
+            move = self.get_move_to(pos)[0]
+            for i in range(len(tiles)):
+                self.slide(move)
+        return tiles
+
+    def shuffle(self, length, randomizer=random):
+        '''PuzzleBoard.shuffle(length, randomizer=random) -> list
+        shuffles the board with length random clicks in line with the empty space,
+        switching between rows and columns, returns the positions clicked'''
+        output = []
+        indexToUse = randomizer.randint(0,1)
+        for i in range(length):
+            # get random piece info
+            empty = self.get_empty()
+            indexToUse = (indexToUse + 1) % 2 # index to be using on empty
+            otherIndex = (indexToUse + 1) % 2
+            listToUse = [n for n in range(self.get_size()[otherIndex]) if n != empty[otherIndex]]
+
+            # get random piece
+            randomPos = [0, 0]
+            randomPos[indexToUse] = empty[indexToUse]
+            randomPos[otherIndex] = randomizer.choice(listToUse)
+            self.move_to(tuple(randomPos))
+            output.append(tuple(randomPos))
+
+        self.clear_history()
+        return output
+
+    def randomize(self, randomizer=random):
+        '''PuzzleBoard.randomize(randomizer=random) -> None
+        sets the board to a uniformly random solvable state'''
+        tiles = list(range(self.size))
+        randomizer.shuffle(tiles)
+        self.set_tiles(tiles)
+
+        # swapping two tiles flips the parity
+        if not self.is_solvable():
+            first, second = [index for index, tile in enumerate(tiles) if tile != 0][:2]
+            tiles[first], tiles[second] = tiles[second], tiles[first]
+            self.set_tiles(tiles)
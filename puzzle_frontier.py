@@ -0,0 +1,157 @@
+# Slide Puzzle Frontiers
+# Auther: G.G.Otto
+# Version: 1.3
+
+from puzzle_board import PuzzleBoard
+
+# numpy is only needed by the batch tools, the game runs without it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def has_numpy():
+    '''has_numpy() -> bool
+    returns if numpy is installed for the batch tools'''
+    return numpy != None
+
+class PuzzleBatcher:
+    '''represents the vectorized moves and heuristics of one board size
+    a batch is a numpy array of tiles with one row for each board, and
+    its keys are the packed states of PuzzleBoard as uint64'''
+
+    def __init__(self, width=4, height=4):
+        '''PuzzleBatcher(width=4, height=4) -> PuzzleBatcher
+        constructs the tables for the board size, which must pack into 64 bits'''
+        if numpy == None:
+            raise ImportError("the batch tools need numpy, install it with: pip install numpy")
+        board = PuzzleBoard(width, height)
+        if board.bits*board.size > 64:
+            raise ValueError("batches only hold boards that pack into 64 bits, 4x4 or smaller")
+
+        self.width = width
+        self.height = height
+        self.size = board.size
+        self.bits = board.bits
+        self.goal = board.get_state()
+        self.neighbors = numpy.array(board.neighbors, dtype=numpy.int16)
+        self.shifts = numpy.arange(self.size, dtype=numpy.uint64)*numpy.uint64(self.bits)
+
+        # goal place of every tile, -1 for the empty space
+        tiles = numpy.arange(self.size)
+        self.goalRows = numpy.where(tiles > 0, (tiles-1) % width, -1)
+        self.goalColumns = numpy.where(tiles > 0, (tiles-1) // width, -1)
+
+        # manhattan distance of every tile from every index, as in PuzzleSolver
+        rows, columns = tiles % width, tiles // width
+        self.distances = numpy.abs(rows[None, :] - self.goalRows[:, None]) + numpy.abs(columns[None, :] - self.goalColumns[:, None])
+        self.distances[0] = 0
+        self.distances = self.distances.astype(numpy.uint8)
+
+    def from_states(self, states):
+        '''PuzzleBatcher.from_states(states) -> numpy.ndarray
+        returns the batch of an iterable of packed states'''
+        keys = numpy.asarray(states, dtype=numpy.uint64)
+        return ((keys[:, None] >> self.shifts[None, :]) & numpy.uint64((1 << self.bits) - 1)).astype(numpy.uint8)
+
+    def get_keys(self, batch):
+        '''PuzzleBatcher.get_keys(batch) -> numpy.ndarray
+        returns the packed state of each board'''
+        return numpy.bitwise_or.reduce(batch.astype(numpy.uint64) << self.shifts[None, :], axis=1)
+
+    def get_empties(self, batch):
+        '''PuzzleBatcher.get_empties(batch) -> numpy.ndarray
+        returns the index of the empty space of each board'''
+        return (batch == 0).argmax(axis=1)
+
+    def expand(self, batch):
+        '''PuzzleBatcher.expand(batch) -> (children, parents, moves)
+        returns every board one move from the batch, with the row of the
+        board it came from and the move made'''
+        empties = self.get_empties(batch)
+        children, parents, moves = [], [], []
+        for move in range(4):
+            sources = self.neighbors[empties, move]
+            rows = numpy.nonzero(sources >= 0)[0]
+            child = batch[rows]
+            places = numpy.arange(len(rows))
+            child[places, empties[rows]] = child[places, sources[rows]]
+            child[places, sources[rows]] = 0
+            children.append(child)
+            parents.append(rows)
+            moves.append(numpy.full(len(rows), move, dtype=numpy.uint8))
+        return numpy.concatenate(children), numpy.concatenate(parents), numpy.concatenate(moves)
+
+    def get_manhattan(self, batch):
+        '''PuzzleBatcher.get_manhattan(batch) -> numpy.ndarray
+        returns the manhattan distance of each board'''
+        return self.distances[batch, numpy.arange(self.size)[None, :]].sum(axis=1, dtype=numpy.int32)
+
+    def get_line_conflicts(self, places):
+        '''PuzzleBatcher.get_line_conflicts(places) -> numpy.ndarray
+        returns the conflict cost of lines given the goal place along the line
+        of each tile, -1 for tiles that do not belong in it'''
+        # tiles outside the longest increasing run must step out of the line
+        valid = places >= 0
+        longest = numpy.zeros(places.shape, dtype=numpy.int8)
+        for i in range(places.shape[1]):
+            best = numpy.zeros(len(places), dtype=numpy.int8)
+            for j in range(i):
+                isBefore = valid[:, j] & (places[:, j] < places[:, i])
+                best = numpy.where(isBefore, numpy.maximum(best, longest[:, j]), best)
+            longest[:, i] = numpy.where(valid[:, i], best + 1, 0)
+        return 2*(valid.sum(axis=1, dtype=numpy.int32) - longest.max(axis=1))
+
+    def get_conflicts(self, batch):
+        '''PuzzleBatcher.get_conflicts(batch) -> numpy.ndarray
+        returns the linear conflict cost of each board'''
+        goalRows = self.goalRows[batch]
+        goalColumns = self.goalColumns[batch]
+        conflicts = numpy.zeros(len(batch), dtype=numpy.int32)
+        for column in range(self.height):
+            line = slice(column*self.width, (column+1)*self.width)
+            conflicts += self.get_line_conflicts(numpy.where(goalColumns[:, line] == column, goalRows[:, line], -1))
+        for row in range(self.width):
+            line = slice(row, None, self.width)
+            conflicts += self.get_line_conflicts(numpy.where(goalRows[:, line] == row, goalColumns[:, line], -1))
+        return conflicts
+
+    def get_heuristic(self, batch):
+        '''PuzzleBatcher.get_heuristic(batch) -> numpy.ndarray
+        returns manhattan distance plus linear conflicts of each board,
+        the same estimate as PuzzleSolver.get_heuristic'''
+        return self.get_manhattan(batch) + self.get_conflicts(batch)
+
+    def get_unique(self, keys, exclude=()):
+        '''PuzzleBatcher.get_unique(keys, exclude=()) -> numpy.ndarray
+        returns the sorted keys without repeats or keys in the sorted array exclude'''
+        keys = numpy.unique(keys)
+        if len(exclude) > 0:
+            places = numpy.searchsorted(exclude, keys).clip(max=len(exclude)-1)
+            keys = keys[exclude[places] != keys]
+        return keys
+
+    def search(self, start=None, maxDepth=None, chunkSize=65536):
+        '''PuzzleBatcher.search(start=None, maxDepth=None, chunkSize=65536) -> generator
+        breadth first search from the packed state start, the goal if None,
+        yields (depth, keys) with the sorted keys of each layer
+        the board graph has no odd cycles, so a layer only needs the one
+        before it to drop repeats, and it is expanded chunkSize boards at a time
+        memory is not bounded: the whole layer and the one before it are kept
+        as 8 bytes a board, so searching all of a 4x4 board needs maxDepth'''
+        layer = numpy.array([self.goal if start == None else start], dtype=numpy.uint64)
+        previous = numpy.array([], dtype=numpy.uint64)
+        depth = 0
+        while len(layer) > 0:
+            yield depth, layer
+            if depth == maxDepth:
+                return
+
+            # expand in chunks so only chunkSize boards are unpacked at once,
+            # the keys of the new layer are still all kept
+            parts = []
+            for index in range(0, len(layer), chunkSize):
+                children = self.expand(self.from_states(layer[index:index + chunkSize]))[0]
+                parts.append(self.get_unique(self.get_keys(children), previous))
+            previous, layer = layer, self.get_unique(numpy.concatenate(parts))
+            depth += 1
@@ -0,0 +1,121 @@
+# Slide Puzzle Hints
+# Auther: G.G.Otto
+# Version: 1.3
+
+import queue
+import threading
+from puzzle_solver import get_distances, get_solver, solve_in_budget
+from puzzle_trace import tracer
+
+class PuzzleHinter:
+    '''represents the next move hints for a board size
+    keeps the next move of every state on the solutions found so far,
+    keyed by the packed state, and solves new states in a worker thread'''
+
+    def __init__(self, width=4, height=4, maxSeconds=2, maxStates=500000):
+        '''PuzzleHinter(width=4, height=4, maxSeconds=2, maxStates=500000) -> PuzzleHinter
+        constructs the hinter with its own solver for the board size
+        maxSeconds: budget of each solve before a quick solution is used
+        maxStates: size of the table before it is cleared'''
+        self.width = width
+        self.height = height
+        self.maxSeconds = maxSeconds
+        self.maxStates = maxStates
+        self.solver = get_solver(width, height)
+        self.table = {}
+        self.distances = get_distances(width, height)
+
+        # worker thread
+        self.requests = queue.Queue()
+        self.cancel = threading.Event()
+        self.pending = None
+        self.thread = None
+
+    def get_move(self, board):
+        '''PuzzleHinter.get_move(board) -> int
+        returns the next move on a known solution from board, None if not known yet'''
+        return self.table.get(board.get_state())
+
+    def get_quick_move(self, board):
+        '''PuzzleHinter.get_quick_move(board) -> int
+        returns the move that brings its tile closest to its goal without
+        undoing the last move, used until the worker has a solution'''
+        history = board.get_history()
+        last = history[-1] if history else -1
+        empty = board.get_empty_index()
+        bestMove = None
+        bestChange = None
+        for move in board.get_moves():
+            if move == last ^ 1:
+                continue
+            source = board.neighbors[empty][move]
+            tile = board.get_tile((source % board.width, source // board.width))
+            change = self.distances[tile][empty] - self.distances[tile][source]
+            if bestChange == None or change < bestChange:
+                bestMove, bestChange = move, change
+        return bestMove
+
+    def request(self, board):
+        '''PuzzleHinter.request(board) -> None
+        asks the worker to solve board, stopping the solve it is on'''
+        state = board.get_state()
+        if state in self.table or state == self.pending or board.is_solved():
+            return
+
+        self.pending = state
+        self.cancel.set()
+        self.requests.put(board.copy())
+        if self.thread == None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def remember(self, board, moves):
+        '''PuzzleHinter.remember(board, moves) -> None
+        adds every state on the moves from board to the table'''
+        if len(self.table) + len(moves) > self.maxStates:
+            self.table = {}
+
+        board = board.copy()
+        table = self.table
+        for move in moves:
+            table[board.get_state()] = move
+            board.slide(move)
+
+    def run(self):
+        '''PuzzleHinter.run() -> None
+        solves the newest request until close is called, runs in the worker thread'''
+        try:
+            while True:
+                board = self.requests.get()
+                self.cancel.clear()
+
+                # only the newest request matters
+                while not self.requests.empty():
+                    board = self.requests.get_nowait()
+                if board == None:
+                    return
+
+                # a failed solve only loses this hint, quick moves are used for it
+                try:
+                    if board.get_state() not in self.table:
+                        with tracer.span("hint solve", "solver"):
+                            moves = solve_in_budget(self.solver, board, self.maxSeconds, cancel=self.cancel)[0]
+                        self.remember(board, moves)
+                except Exception:
+                    pass
+                finally:
+                    # the state can be asked for again after a failure or once the table is cleared
+                    if self.pending == board.get_state():
+                        self.pending = None
+        finally:
+            # let request start a new worker if this one stopped
+            if self.thread == threading.current_thread():
+                self.thread = None
+
+    def close(self):
+        '''PuzzleHinter.close() -> None
+        stops the worker thread'''
+        if self.thread != None:
+            self.cancel.set()
+            self.requests.put(None)
+            self.thread = None
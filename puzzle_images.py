@@ -0,0 +1,197 @@
+# Slide Puzzle Images
+# Auther: G.G.Otto
+# Version: 1.3
+
+import hashlib
+import json
+import math
+import os
+import os.path as path
+from collections import OrderedDict
+from tkinter import PhotoImage, TclError
+from puzzle_trace import tracer
+
+# atlases of pre-sliced boards and their index, one atlas for each
+# source hash, board size and tile size
+TILE_DIR = path.join(path.dirname(path.realpath(__file__)), "slide_puzzle_tiles")
+INDEX_FILE = "index.json"
+
+def get_scale(imageSize, boardPixels, maxFactor=8):
+    '''get_scale(imageSize, boardPixels, maxFactor=8) -> (zoom, subsample)
+    returns the smallest zoom/subsample that makes the image cover the board'''
+    scale = max(boardPixels[0]/imageSize[0], boardPixels[1]/imageSize[1])
+    options = [(math.ceil(scale), 1)]
+    if scale < 1:
+        options.append((1, int(1/scale)))
+    options += [(zoom, subsample) for zoom in range(1, maxFactor+1)
+        for subsample in range(1, maxFactor+1) if zoom/subsample >= scale]
+    return min(options, key=lambda option: (option[0]/option[1], option[0]))
+
+class PuzzleImageCache:
+    '''represents a cache of puzzle images already cut into tiles
+    each file is decoded once for each board and tile size'''
+
+    def __init__(self, maxBytes=64*1024*1024, tileDir=TILE_DIR):
+        '''PuzzleImageCache(maxBytes=64*1024*1024, tileDir=TILE_DIR) -> PuzzleImageCache
+        constructs the cache, the least recently used images are dropped
+        once the tiles take more than maxBytes
+        tileDir: folder of the atlases, None to keep nothing on disk'''
+        self.maxBytes = maxBytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.tileDir = tileDir
+        self.index = None
+
+    def get_stats(self):
+        '''PuzzleImageCache.get_stats() -> dict
+        returns the hits, misses, entries and bytes of the cache'''
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries), "bytes": self.bytes}
+
+    def get_index(self):
+        '''PuzzleImageCache.get_index() -> dict
+        returns the index of the atlases, reading it the first time'''
+        if self.index == None:
+            self.index = {"sources": {}, "atlases": {}}
+            if self.tileDir != None and path.isfile(path.join(self.tileDir, INDEX_FILE)):
+                try:
+                    with open(path.join(self.tileDir, INDEX_FILE), "r") as file:
+                        self.index = json.load(file)
+                except (OSError, ValueError):
+                    pass
+        return self.index
+
+    def save_index(self):
+        '''PuzzleImageCache.save_index() -> None
+        writes the index in one step'''
+        tempName = path.join(self.tileDir, INDEX_FILE + ".tmp")
+        with open(tempName, "w") as file:
+            json.dump(self.index, file)
+        os.replace(tempName, path.join(self.tileDir, INDEX_FILE))
+
+    def get_source_hash(self, image):
+        '''PuzzleImageCache.get_source_hash(image) -> str
+        returns the hash of the file, read from the index if the file is unchanged'''
+        stat = os.stat(image)
+        sources = self.get_index()["sources"]
+        fileName = path.realpath(image)
+        if fileName in sources and sources[fileName][:2] == [stat.st_mtime_ns, stat.st_size]:
+            return sources[fileName][2]
+
+        with open(image, "rb") as file:
+            sourceHash = hashlib.sha1(file.read()).hexdigest()
+        sources[fileName] = [stat.st_mtime_ns, stat.st_size, sourceHash]
+        return sourceHash
+
+    def get_atlas(self, image, boardSize, tileSize):
+        '''PuzzleImageCache.get_atlas(image, boardSize, tileSize) -> PhotoImage
+        returns the scaled and cropped board of the image, loaded from its
+        atlas if there is one, otherwise made and saved as an atlas'''
+        boardPixels = (boardSize[0]*tileSize[0], boardSize[1]*tileSize[1])
+        if self.tileDir == None:
+            return self.prepare_image(image, boardPixels)
+
+        key = f"{self.get_source_hash(image)}_{boardSize[0]}x{boardSize[1]}_{tileSize[0]}x{tileSize[1]}"
+        atlases = self.get_index()["atlases"]
+        if key in atlases:
+            try:
+                return PhotoImage(file=path.join(self.tileDir, atlases[key]))
+            except TclError:
+                del atlases[key]
+
+        # a missing or damaged atlas is made again, the board still works if it cannot be saved
+        atlas = self.prepare_image(image, boardPixels)
+        try:
+            os.makedirs(self.tileDir, exist_ok=True)
+            atlas.write(path.join(self.tileDir, key + ".png"), format="png")
+            atlases[key] = key + ".png"
+            self.save_index()
+        except (OSError, TclError):
+            pass
+        return atlas
+
+    def get_key(self, image, boardSize, tileSize):
+        '''PuzzleImageCache.get_key(image, boardSize, tileSize) -> tuple
+        returns the key for the image, a changed file gets a new key'''
+        return (path.realpath(image), os.stat(image).st_mtime_ns, tuple(boardSize), tuple(tileSize))
+
+    def get_tiles(self, image, boardSize, tileSize):
+        '''PuzzleImageCache.get_tiles(image, boardSize, tileSize) -> dict
+        returns the tiles of the image by (row, column)'''
+        key = self.get_key(image, boardSize, tileSize)
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+        # decode and slice the image
+        self.misses += 1
+        with tracer.span("image load", "image"):
+            tiles = self.cut_tiles(self.get_atlas(image, boardSize, tileSize), boardSize, tileSize)
+        size = sum(4*tile.width()*tile.height() for tile in tiles.values())
+        self.entries[key] = (tiles, size)
+        self.bytes += size
+
+        # drop old images, always keep the newest
+        while self.bytes > self.maxBytes and len(self.entries) > 1:
+            oldKey, (oldTiles, oldSize) = self.entries.popitem(last=False)
+            self.bytes -= oldSize
+        return tiles
+
+    def get_tile(self, image, boardSize, tileSize, pos):
+        '''PuzzleImageCache.get_tile(image, boardSize, tileSize, pos) -> PhotoImage
+        returns the tile of the image for the piece solved at pos (row, column)'''
+        return self.get_tiles(image, boardSize, tileSize)[tuple(pos)]
+
+    def prepare_image(self, image, boardPixels):
+        '''PuzzleImageCache.prepare_image(image, boardPixels) -> PhotoImage
+        decodes the image, scales it to cover the board with zoom and subsample
+        and crops the middle of it to the board'''
+        photo = PhotoImage(file=image)
+        zoom, subsample = get_scale((photo.width(), photo.height()), boardPixels)
+        if subsample > 1:
+            photo = photo.subsample(subsample)
+        if zoom > 1:
+            photo = photo.zoom(zoom)
+
+        board = PhotoImage(width=boardPixels[0], height=boardPixels[1])
+        left = max(photo.width() - boardPixels[0], 0)//2
+        top = max(photo.height() - boardPixels[1], 0)//2
+        board.tk.call(board, "copy", photo, "-from", left, top,
+            min(left + boardPixels[0], photo.width()), min(top + boardPixels[1], photo.height()))
+        return board
+
+    def slice_image(self, image, boardSize, tileSize):
+        '''PuzzleImageCache.slice_image(image, boardSize, tileSize) -> dict
+        decodes, scales and cuts the image without the atlases'''
+        return self.cut_tiles(self.prepare_image(image, (boardSize[0]*tileSize[0], boardSize[1]*tileSize[1])),
+            boardSize, tileSize)
+
+    def cut_tiles(self, photo, boardSize, tileSize):
+        '''PuzzleImageCache.cut_tiles(photo, boardSize, tileSize) -> dict
+        cuts the board out of the center of photo into tiles by (row, column)'''
+        width, height = photo.width(), photo.height()
+        left = width//2 - boardSize[0]*tileSize[0]//2
+        top = height//2 - boardSize[1]*tileSize[1]//2
+
+        tiles = {}
+        for row in range(boardSize[0]):
+            for column in range(boardSize[1]):
+                tile = PhotoImage(width=tileSize[0], height=tileSize[1])
+
+                # only copy the part that is inside the image
+                x1, y1 = left + row*tileSize[0], top + column*tileSize[1]
+                fromX1, fromY1 = max(x1, 0), max(y1, 0)
+                fromX2, fromY2 = min(x1 + tileSize[0], width), min(y1 + tileSize[1], height)
+                if fromX1 < fromX2 and fromY1 < fromY2:
+                    tile.tk.call(tile, "copy", photo, "-from", fromX1, fromY1, fromX2, fromY2,
+                        "-to", fromX1 - x1, fromY1 - y1)
+                tiles[row, column] = tile
+        return tiles
+
+    def clear(self):
+        '''PuzzleImageCache.clear() -> None
+        drops every image'''
+        self.entries.clear()
+        self.bytes = 0
@@ -0,0 +1,254 @@
+# Slide Puzzle Pattern Database
+# Auther: G.G.Otto
+# Version: 1.3
+
+import os
+import os.path as path
+import mmap
+import struct
+import zlib
+from array import array
+from puzzle_board import PuzzleBoard
+
+# disjoint 5-5-5 patterns for the 4x4 board
+PATTERNS = ((1,2,3,5,6), (4,7,8,11,12), (9,10,13,14,15))
+PATTERN_FILE = path.join(path.dirname(path.realpath(__file__)), "slide_puzzle_patterns.db")
+
+# file layout: header, then one table of 16**5 bytes per pattern
+MAGIC = b"SPPD"
+VERSION = 1
+HEADER_SIZE = 64
+ENTRY_FORMAT = "<5sBI" # tiles, done flag, crc32
+TABLE_SIZE = 1 << 20
+
+class PuzzlePatternDatabase:
+    '''represents the additive pattern database for the 4x4 board
+    each table is indexed by the positions of its tiles, 4 bits each'''
+
+    def __init__(self, fileName=PATTERN_FILE, patterns=PATTERNS):
+        '''PuzzlePatternDatabase(fileName=PATTERN_FILE, patterns=PATTERNS) -> PuzzlePatternDatabase
+        constructs the database for the file, nothing is built or loaded yet'''
+        self.fileName = fileName
+        self.patterns = patterns
+        self.neighbors = PuzzleBoard(4, 4).neighbors
+        self.map = None
+        self.tables = None
+
+        # where each tile is found in the patterns
+        self.patternOf = [-1]*16
+        self.shiftOf = [0]*16
+        for number, pattern in enumerate(patterns):
+            for slot, tile in enumerate(pattern):
+                self.patternOf[tile] = number
+                self.shiftOf[tile] = slot << 2
+
+    def get_table_offset(self, number):
+        '''PuzzlePatternDatabase.get_table_offset(number) -> int
+        returns where the table for the pattern starts in the file'''
+        return HEADER_SIZE + number*TABLE_SIZE
+
+    def read_header(self, file):
+        '''PuzzlePatternDatabase.read_header(file) -> list
+        returns a list of (done, crc) for each pattern,
+        None if the file is for other patterns'''
+        file.seek(0)
+        header = file.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE or header[:4] != MAGIC or header[4] != VERSION or header[5] != len(self.patterns):
+            return None
+
+        # check each entry
+        output = []
+        entrySize = struct.calcsize(ENTRY_FORMAT)
+        for number, pattern in enumerate(self.patterns):
+            tiles, done, crc = struct.unpack_from(ENTRY_FORMAT, header, 6 + number*entrySize)
+            if tiles != bytes(pattern):
+                return None
+            output.append((done, crc))
+        return output
+
+    def write_header(self, file, entries):
+        '''PuzzlePatternDatabase.write_header(file, entries) -> None
+        writes the header with (done, crc) for each pattern'''
+        header = bytearray(HEADER_SIZE)
+        header[:6] = MAGIC + bytes((VERSION, len(self.patterns)))
+        entrySize = struct.calcsize(ENTRY_FORMAT)
+        for number, pattern in enumerate(self.patterns):
+            struct.pack_into(ENTRY_FORMAT, header, 6 + number*entrySize, bytes(pattern), *entries[number])
+
+        file.seek(0)
+        file.write(header)
+        file.flush()
+        os.fsync(file.fileno())
+
+    def is_built(self):
+        '''PuzzlePatternDatabase.is_built() -> bool
+        returns if every table is in the file'''
+        if not path.isfile(self.fileName):
+            return False
+        with open(self.fileName, "rb") as file:
+            entries = self.read_header(file)
+        return entries != None and all(done for done, crc in entries)
+
+    def build(self, report=None):
+        '''PuzzlePatternDatabase.build(report=None) -> None
+        builds the missing tables into the file, tables that are already
+        done and pass their checksum are kept
+        report: function called as report(pattern, cost, states)'''
+        self.close()
+        size = self.get_table_offset(len(self.patterns))
+        mode = "r+b" if path.isfile(self.fileName) else "w+b"
+
+        with open(self.fileName, mode) as file:
+            entries = self.read_header(file)
+            if entries == None:
+                entries = [(0, 0)]*len(self.patterns)
+                self.write_header(file, entries)
+            file.truncate(size)
+
+            for number, pattern in enumerate(self.patterns):
+                # skip tables that are already good
+                if entries[number][0]:
+                    file.seek(self.get_table_offset(number))
+                    if zlib.crc32(file.read(TABLE_SIZE)) == entries[number][1]:
+                        continue
+
+                # write the table before marking it done
+                table = self.build_table(pattern, number, report)
+                file.seek(self.get_table_offset(number))
+                file.write(table)
+                file.flush()
+                os.fsync(file.fileno())
+                entries[number] = (1, zlib.crc32(table))
+                self.write_header(file, entries)
+
+    def build_table(self, pattern, number=0, report=None):
+        '''PuzzlePatternDatabase.build_table(pattern, number=0, report=None) -> bytearray
+        returns the table for the pattern made by breadth first search from the goal,
+        only moves of the pattern tiles are counted'''
+        neighbors = self.neighbors
+        shifts = [slot << 2 for slot in range(len(pattern))]
+
+        # states are the pattern positions with the empty space above them
+        start = 15 << 20
+        for slot, tile in enumerate(pattern):
+            start |= (tile-1) << shifts[slot]
+        seen = bytearray(1 << 24)
+        table = bytearray(b"\xff")*TABLE_SIZE
+
+        layer = array("I", [start])
+        seen[start] = 1
+        cost = 0
+        while layer:
+            nextLayer = array("I")
+            i = 0
+            # the layer grows as the empty space moves for free
+            while i < len(layer):
+                state = layer[i]
+                i += 1
+                positions = state & 0xFFFFF
+                if table[positions] == 255:
+                    table[positions] = cost
+
+                # find which slot is at each place
+                places = {}
+                for shift in shifts:
+                    places[(positions >> shift) & 15] = shift
+
+                empty = state >> 20
+                for source in neighbors[empty]:
+                    if source < 0:
+                        continue
+                    shift = places.get(source)
+                    if shift == None:
+                        newState = positions | (source << 20)
+                        if not seen[newState]:
+                            seen[newState] = 1
+                            layer.append(newState)
+                    else:
+                        newState = (positions ^ ((source ^ empty) << shift)) | (source << 20)
+                        if not seen[newState]:
+                            nextLayer.append(newState)
+
+            if report != None:
+                report(number, cost, len(layer))
+
+            # keep only states not reached for less
+            layer = array("I")
+            for state in nextLayer:
+                if not seen[state]:
+                    seen[state] = 1
+                    layer.append(state)
+            cost += 1
+
+        return table
+
+    def load(self):
+        '''PuzzlePatternDatabase.load() -> bool
+        memory maps the tables, returns False if they are missing or damaged'''
+        if self.tables != None:
+            return True
+        if not path.isfile(self.fileName):
+            return False
+
+        with open(self.fileName, "rb") as file:
+            entries = self.read_header(file)
+            if entries == None or not all(done for done, crc in entries):
+                return False
+            tableMap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # check every table before using it
+        view = memoryview(tableMap)
+        tables = []
+        for number in range(len(self.patterns)):
+            offset = self.get_table_offset(number)
+            table = view[offset:offset+TABLE_SIZE]
+            if zlib.crc32(table) != entries[number][1]:
+                table.release()
+                for table in tables:
+                    table.release()
+                view.release()
+                tableMap.close()
+                return False
+            tables.append(table)
+
+        view.release()
+        self.map = tableMap
+        self.tables = tables
+        return True
+
+    def close(self):
+        '''PuzzlePatternDatabase.close() -> None
+        unmaps the tables'''
+        if self.tables != None:
+            for table in self.tables:
+                table.release()
+            self.map.close()
+        self.map = None
+        self.tables = None
+
+    def get_tables(self):
+        '''PuzzlePatternDatabase.get_tables() -> list
+        returns the loaded tables'''
+        return self.tables
+
+    def get_indexes(self, tiles):
+        '''PuzzlePatternDatabase.get_indexes(tiles) -> list
+        returns the index into each table for a list of tiles'''
+        indexes = [0]*len(self.patterns)
+        for index, tile in enumerate(tiles):
+            if tile != 0:
+                indexes[self.patternOf[tile]] |= index << self.shiftOf[tile]
+        return indexes
+
+    def get_estimate(self, tiles):
+        '''PuzzlePatternDatabase.get_estimate(tiles) -> int
+        returns the sum of the tables for a list of tiles'''
+        return sum(table[index] for table, index in zip(self.tables, self.get_indexes(tiles)))
+
+if __name__ == "__main__":
+    def report(number, cost, states):
+        print(f"pattern {number+1}: cost {cost}, {states} states")
+
+    database = PuzzlePatternDatabase()
+    database.build(report)
+    print("tables are built in", database.fileName)
@@ -0,0 +1,165 @@
+# Slide Puzzle Replays
+# Auther: G.G.Otto
+# Version: 1.3
+
+import os
+import os.path as path
+import struct
+import sys
+import time
+import zlib
+from array import array
+from puzzle_board import PuzzleBoard
+
+# file layout: header, moves at 2 bits each, times in ms, keyframe states, crc32 of all before it
+MAGIC = b"SPRP"
+VERSION = 1
+HEADER_FORMAT = "<4sBBBIIH" # magic, version, width, height, moves, scramble moves, keyframe interval
+KEYFRAME_INTERVAL = 256
+
+# games are saved here when they end
+REPLAY_FOLDER = path.join(path.dirname(path.realpath(__file__)), "slide_puzzle_replays")
+
+class PuzzleRecording:
+    '''represents the moves of one game with the time of each move
+    moves are packed 4 to a byte, the board is kept every KEYFRAME_INTERVAL moves
+    so any move can be reached without playing from the start'''
+
+    def __init__(self, board, interval=KEYFRAME_INTERVAL):
+        '''PuzzleRecording(board, interval=KEYFRAME_INTERVAL) -> PuzzleRecording
+        constructs an empty recording starting from board'''
+        self.width = board.width
+        self.height = board.height
+        self.interval = interval
+        self.board = board.copy() # board after the last move
+        self.moves = bytearray()
+        self.times = array("I")
+        self.count = 0
+        self.scrambleCount = 0
+        self.keyframes = [board.get_state()]
+        self.startTime = time.perf_counter()
+
+    def __len__(self):
+        '''len(PuzzleRecording) -> int
+        returns the number of moves'''
+        return self.count
+
+    def get_size(self):
+        '''PuzzleRecording.get_size() -> (width, height)
+        returns the size of the board'''
+        return (self.width, self.height)
+
+    def get_scramble_count(self):
+        '''PuzzleRecording.get_scramble_count() -> int
+        returns how many of the first moves were the scramble'''
+        return self.scrambleCount
+
+    def get_move(self, index):
+        '''PuzzleRecording.get_move(index) -> int
+        returns the move at index'''
+        return (self.moves[index >> 2] >> ((index & 3) << 1)) & 3
+
+    def get_time(self, index):
+        '''PuzzleRecording.get_time(index) -> float
+        returns the seconds from the start to the move at index'''
+        return self.times[index]/1000
+
+    def get_board(self, index):
+        '''PuzzleRecording.get_board(index) -> PuzzleBoard
+        returns the board after the first index moves, starting at the keyframe before it'''
+        index = max(0, min(index, self.count))
+        keyframe = index // self.interval
+        board = PuzzleBoard(self.width, self.height, self.keyframes[keyframe])
+        for i in range(keyframe*self.interval, index):
+            board.slide(self.get_move(i))
+        board.clear_history()
+        return board
+
+    def add_moves(self, moves, isScramble=False):
+        '''PuzzleRecording.add_moves(moves, isScramble=False) -> None
+        adds a list of moves made now
+        isScramble: bool to tell the moves are part of the scramble'''
+        ms = int((time.perf_counter() - self.startTime)*1000)
+        for move in moves:
+            if not self.board.slide(move):
+                raise ValueError("move is not possible on the recorded board")
+            if self.count & 3 == 0:
+                self.moves.append(0)
+            self.moves[-1] |= move << ((self.count & 3) << 1)
+            self.times.append(ms)
+            self.count += 1
+            if self.count % self.interval == 0:
+                self.keyframes.append(self.board.get_state())
+
+        self.board.clear_history()
+        if isScramble:
+            self.scrambleCount = self.count
+
+    def save(self, fileName):
+        '''PuzzleRecording.save(fileName) -> None
+        writes the recording to a file in one step'''
+        times = array("I", self.times)
+        if sys.byteorder == "big":
+            times.byteswap()
+        stateBytes = (self.board.bits*self.board.size + 7) // 8
+        data = struct.pack(HEADER_FORMAT, MAGIC, VERSION, self.width, self.height, self.count, self.scrambleCount, self.interval)
+        data += bytes(self.moves) + times.tobytes() + b"".join(state.to_bytes(stateBytes, "little") for state in self.keyframes)
+
+        tempName = fileName + ".tmp"
+        with open(tempName, "wb") as file:
+            file.write(data + zlib.crc32(data).to_bytes(4, "little"))
+        os.replace(tempName, fileName)
+
+def load_recording(fileName):
+    '''load_recording(fileName) -> PuzzleRecording
+    reads a recording written by PuzzleRecording.save'''
+    with open(fileName, "rb") as file:
+        data = file.read()
+    if len(data) < struct.calcsize(HEADER_FORMAT) + 4 or int.from_bytes(data[-4:], "little") != zlib.crc32(data[:-4]):
+        raise ValueError("replay file is damaged")
+    magic, version, width, height, count, scrambleCount, interval = struct.unpack_from(HEADER_FORMAT, data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a replay file")
+
+    # sizes of each part
+    board = PuzzleBoard(width, height)
+    stateBytes = (board.bits*board.size + 7) // 8
+    offset = struct.calcsize(HEADER_FORMAT)
+    movesEnd = offset + (count + 3) // 4
+    timesEnd = movesEnd + 4*count
+    keyframeCount = count // interval + 1
+    if timesEnd + keyframeCount*stateBytes + 4 != len(data):
+        raise ValueError("replay file is damaged")
+
+    recording = PuzzleRecording(board, interval)
+    recording.moves = bytearray(data[offset:movesEnd])
+    recording.times = array("I")
+    recording.times.frombytes(data[movesEnd:timesEnd])
+    if sys.byteorder == "big":
+        recording.times.byteswap()
+    recording.keyframes = [int.from_bytes(data[timesEnd + i*stateBytes:timesEnd + (i+1)*stateBytes], "little")
+        for i in range(keyframeCount)]
+    recording.count = count
+    recording.scrambleCount = scrambleCount
+    recording.board = recording.get_board(count)
+    return recording
+
+def save_to_folder(recording, folder=REPLAY_FOLDER, keep=100):
+    '''save_to_folder(recording, folder=REPLAY_FOLDER, keep=100) -> str
+    saves the recording in folder named by the time it ended, only the
+    newest keep replays are kept, returns the file name'''
+    os.makedirs(folder, exist_ok=True)
+    microseconds = time.time_ns() // 1000
+    while True:
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(microseconds // 1000000))
+        fileName = path.join(folder, f"{stamp}-{microseconds % 1000000:06d}.sprp")
+        if not path.exists(fileName):
+            break
+        microseconds += 1
+    recording.save(fileName)
+
+    # names sort by time, so the oldest are first
+    replays = sorted(name for name in os.listdir(folder) if name.endswith(".sprp"))
+    for name in replays[:max(0, len(replays) - keep)]:
+        os.remove(path.join(folder, name))
+    return fileName
@@ -0,0 +1,97 @@
+# Slide Puzzle Scores
+# Auther: G.G.Otto
+# Version: 1.3
+
+import os.path as path
+import time
+from puzzle_tables import PuzzleEightTable
+
+SCORE_FILE = path.join(path.dirname(path.realpath(__file__)), "slide_puzzle_scores.db")
+
+# a key is (width, height, shuffle length, difficulty, image), the length is 0 for a random board
+# and -1 for a board from the scramble bank, whose difficulty is its optimal moves
+KEY_COLUMNS = ("width", "height", "length", "difficulty", "image")
+
+def get_difficulty(board):
+    '''get_difficulty(board) -> int
+    returns the difficulty grade of a scrambled board, its distance from
+    the goal in steps of 10, the optimal moves from the table on 3x3
+    and the manhattan distance on other sizes'''
+    if board.get_size() == (3, 3):
+        return PuzzleEightTable().get_distance(board) // 10
+    distance = 0
+    for index, tile in enumerate(board.get_tiles()):
+        if tile != 0:
+            distance += abs(index % board.width - (tile-1) % board.width) + abs(index // board.width - (tile-1) // board.width)
+    return distance // 10
+
+class PuzzleScoreStore:
+    '''represents the scores of every won game in an sqlite file
+    scores are indexed by key so bests, top lists and percentiles
+    only read the scores of one key'''
+
+    def __init__(self, fileName=SCORE_FILE):
+        '''PuzzleScoreStore(fileName=SCORE_FILE) -> PuzzleScoreStore
+        constructs the store, the file is opened the first time it is used'''
+        self.fileName = fileName
+        self.connection = None
+
+    def get_connection(self):
+        '''PuzzleScoreStore.get_connection() -> sqlite3.Connection
+        returns the connection, creating the tables if needed'''
+        if self.connection == None:
+            import sqlite3 # imported here so the game does not load it at startup
+            self.connection = sqlite3.connect(self.fileName)
+            with self.connection:
+                self.connection.execute("""CREATE TABLE IF NOT EXISTS scores (
+                    width INTEGER, height INTEGER, length INTEGER, difficulty INTEGER, image TEXT,
+                    moves INTEGER, seconds REAL, played REAL)""")
+                self.connection.execute("CREATE INDEX IF NOT EXISTS scores_moves ON scores (width, height, length, image, difficulty, moves)")
+                self.connection.execute("CREATE INDEX IF NOT EXISTS scores_seconds ON scores (width, height, length, image, difficulty, seconds)")
+        return self.connection
+
+    def get_where(self, key):
+        '''PuzzleScoreStore.get_where(key) -> (str, list)
+        returns the where clause and its values for key,
+        a difficulty of None matches every difficulty'''
+        columns = [column for column, value in zip(KEY_COLUMNS, key) if value != None]
+        return " AND ".join(column + " = ?" for column in columns), [value for value in key if value != None]
+
+    def add_score(self, key, moves, seconds):
+        '''PuzzleScoreStore.add_score(key, moves, seconds) -> None
+        adds the score of a won game in one transaction'''
+        with self.get_connection() as connection:
+            connection.execute("INSERT INTO scores VALUES (?, ?, ?, ?, ?, ?, ?, ?)", tuple(key) + (moves, seconds, time.time()))
+
+    def get_best(self, key):
+        '''PuzzleScoreStore.get_best(key) -> (moves, seconds)
+        returns the best moves and time for key, None for each if there are no scores'''
+        where, values = self.get_where(key)
+        return self.get_connection().execute(f"SELECT MIN(moves), MIN(seconds) FROM scores WHERE {where}", values).fetchone()
+
+    def get_top(self, key, count=10, by="seconds"):
+        '''PuzzleScoreStore.get_top(key, count=10, by="seconds") -> list
+        returns the best count (moves, seconds) for key
+        by: "moves" or "seconds"'''
+        if by not in ("moves", "seconds"):
+            raise ValueError("scores can only be sorted by moves or seconds")
+        where, values = self.get_where(key)
+        return self.get_connection().execute(f"SELECT moves, seconds FROM scores WHERE {where} ORDER BY {by} LIMIT ?",
+            values + [count]).fetchall()
+
+    def get_percentile(self, key, value, by="seconds"):
+        '''PuzzleScoreStore.get_percentile(key, value, by="seconds") -> float
+        returns the percent of scores for key that are worse than value'''
+        if by not in ("moves", "seconds"):
+            raise ValueError("scores can only be compared by moves or seconds")
+        where, values = self.get_where(key)
+        total, worse = self.get_connection().execute(f"SELECT COUNT(*), SUM({by} > ?) FROM scores WHERE {where}",
+            [value] + values).fetchone()
+        return 100*worse/total if total else 100
+
+    def close(self):
+        '''PuzzleScoreStore.close() -> None
+        closes the file'''
+        if self.connection != None:
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,459 @@
+# Slide Puzzle Solver
+# Auther: G.G.Otto
+# Version: 1.3
+
+import heapq
+import time
+from puzzle_board import PuzzleBoard, MOVE_DIRECTIONS
+from puzzle_patterns import PuzzlePatternDatabase
+from puzzle_tables import PuzzleEightTable
+
+# nodes between progress reports, a multiple of the 4096 between limit checks
+PROGRESS_NODES = 1 << 18
+
+# most nodes of the quick solve after a budget runs out, it keeps every board it sees
+FALLBACK_NODES = 100000
+
+# manhattan distance tables already made, by board size
+distanceTables = {}
+
+def get_distances(width, height):
+    '''get_distances(width, height) -> list
+    returns the manhattan distance of every tile from every index,
+    distances[tile][index], shared by everything using the board size'''
+    if (width, height) not in distanceTables:
+        size = width*height
+        distances = [[0]*size]
+        for tile in range(1, size):
+            goalRow, goalColumn = (tile-1) % width, (tile-1) // width
+            distances.append([abs(index % width - goalRow) + abs(index // width - goalColumn)
+                for index in range(size)])
+        distanceTables[width, height] = distances
+    return distanceTables[width, height]
+
+class SolverStopped(Exception):
+    '''raised when a solve is cancelled or runs out of its budget'''
+
+    def __init__(self, reason):
+        '''SolverStopped(reason) -> SolverStopped
+        reason: "cancelled" or "budget"'''
+        Exception.__init__(self, reason)
+        self.reason = reason
+
+class PuzzleSolver:
+    '''represents an optimal IDA* solver for the puzzle
+    uses manhattan distance plus linear conflicts as the heuristic'''
+
+    def __init__(self, width=4, height=4, database=None):
+        '''PuzzleSolver(width=4, height=4, database=None) -> PuzzleSolver
+        constructs the solver and its tables for the board size
+        database: PuzzlePatternDatabase used instead of conflicts once it loads'''
+        self.width = width
+        self.database = database
+        self.height = height
+        self.size = width*height
+        self.neighbors = PuzzleBoard(width, height).neighbors
+        self.distances = get_distances(width, height)
+
+        # caches of conflicts for each line, keyed by the tiles in it
+        self.horizontalCache = [{} for i in range(height)]
+        self.verticalCache = [{} for i in range(width)]
+
+        # stats
+        self.nodes = 0
+        self.seconds = 0
+
+        # limits of the running solve
+        self.maxNodes = None
+        self.deadline = None
+        self.progress = None
+        self.cancel = None
+
+    def get_stats(self):
+        '''PuzzleSolver.get_stats() -> (nodes, seconds, nodes per second)
+        returns the stats of the last solve'''
+        return (self.nodes, self.seconds, self.nodes/self.seconds if self.seconds else 0)
+
+    def get_report(self):
+        '''PuzzleSolver.get_report() -> str
+        returns a readable report of the last solve'''
+        nodes, seconds, speed = self.get_stats()
+        return f"{nodes} nodes in {int(seconds*1000)/1000} s ({int(speed)} nodes/s)"
+
+    def get_line_conflict(self, line, goalLine, isHorizontal):
+        '''PuzzleSolver.get_line_conflict(line, goalLine, isHorizontal) -> int
+        returns the linear conflict cost of a line of tiles'''
+        # goal places along the line of tiles that belong in it
+        places = []
+        for tile in line:
+            if tile == 0:
+                continue
+            if isHorizontal and (tile-1) // self.width == goalLine:
+                places.append((tile-1) % self.width)
+            elif not isHorizontal and (tile-1) % self.width == goalLine:
+                places.append((tile-1) // self.width)
+
+        # tiles outside the longest increasing run must step out of the line
+        longest = [1]*len(places)
+        for i in range(len(places)):
+            for j in range(i):
+                if places[j] < places[i] and longest[j] + 1 > longest[i]:
+                    longest[i] = longest[j] + 1
+        return 2*(len(places) - max(longest, default=0))
+
+    def get_horizontal_conflict(self, tiles, column):
+        '''PuzzleSolver.get_horizontal_conflict(tiles, column) -> int
+        returns the conflicts in the horizontal line at column'''
+        line = tuple(tiles[column*self.width:(column+1)*self.width])
+        cache = self.horizontalCache[column]
+        if line not in cache:
+            cache[line] = self.get_line_conflict(line, column, True)
+        return cache[line]
+
+    def get_vertical_conflict(self, tiles, row):
+        '''PuzzleSolver.get_vertical_conflict(tiles, row) -> int
+        returns the conflicts in the vertical line at row'''
+        line = tuple(tiles[row::self.width])
+        cache = self.verticalCache[row]
+        if line not in cache:
+            cache[line] = self.get_line_conflict(line, row, False)
+        return cache[line]
+
+    def get_heuristic(self, tiles):
+        '''PuzzleSolver.get_heuristic(tiles) -> int
+        returns the estimate of moves left for a list of tiles'''
+        estimate = sum(self.distances[tile][index] for index, tile in enumerate(tiles))
+        estimate += sum(self.get_horizontal_conflict(tiles, column) for column in range(self.height))
+        estimate += sum(self.get_vertical_conflict(tiles, row) for row in range(self.width))
+        return estimate
+
+    def is_using_patterns(self):
+        '''PuzzleSolver.is_using_patterns() -> bool
+        returns if the pattern database is loaded for the solver'''
+        return self.database != None and (self.width, self.height) == (4, 4) and self.database.load()
+
+    def get_heuristic_name(self):
+        '''PuzzleSolver.get_heuristic_name() -> str
+        returns the heuristic the solver uses, "patterns" or "conflicts"'''
+        return "patterns" if self.is_using_patterns() else "conflicts"
+
+    def get_fallback_note(self):
+        '''PuzzleSolver.get_fallback_note() -> str
+        returns how to build the pattern database if the solver could use it
+        but it is missing, "" otherwise'''
+        if self.database == None or self.is_using_patterns():
+            return ""
+        return ("The pattern database is not built, so 4x4 solves use slower linear conflicts.\n"
+            "Build it once with: python slide_puzzle.py patterns")
+
+    def set_limits(self, maxNodes=None, maxSeconds=None, progress=None, cancel=None):
+        '''PuzzleSolver.set_limits(maxNodes=None, maxSeconds=None, progress=None, cancel=None) -> None
+        sets the limits of the next solve
+        progress: function called with a dict of "bound", "nodes" and "best"
+            at each new bound and every PROGRESS_NODES nodes
+        cancel: object with is_set(), like a threading.Event'''
+        self.maxNodes = maxNodes
+        self.deadline = None if maxSeconds == None else time.perf_counter() + maxSeconds
+        self.progress = progress
+        self.cancel = cancel
+
+    def check_limits(self, nodes, bound, best, report=False):
+        '''PuzzleSolver.check_limits(nodes, bound, best, report=False) -> None
+        raises SolverStopped if the solve must stop, reports the progress
+        if asked or every PROGRESS_NODES nodes'''
+        self.nodes = nodes
+        if self.cancel != None and self.cancel.is_set():
+            raise SolverStopped("cancelled")
+        if (self.maxNodes != None and nodes >= self.maxNodes) or \
+           (self.deadline != None and time.perf_counter() >= self.deadline):
+            raise SolverStopped("budget")
+        if (report or nodes % PROGRESS_NODES == 0) and self.progress != None:
+            self.progress({"bound": bound, "nodes": nodes, "best": best})
+
+    def solve(self, board, maxNodes=None, maxSeconds=None, progress=None, cancel=None):
+        '''PuzzleSolver.solve(board, maxNodes=None, maxSeconds=None, progress=None, cancel=None) -> list
+        returns an optimal list of moves that solves the board
+        raises SolverStopped if cancelled or over a budget, see set_limits'''
+        if (board.width, board.height) != (self.width, self.height):
+            raise ValueError("board size does not match the solver")
+        if not board.is_solvable():
+            raise ValueError("board cannot be solved")
+
+        self.set_limits(maxNodes, maxSeconds, progress, cancel)
+        startTime = time.perf_counter()
+        try:
+            if self.is_using_patterns():
+                path, self.nodes = self.search_patterns(board.get_tiles(), board.get_empty_index())
+            else:
+                path, self.nodes = self.search_conflicts(board.get_tiles(), board.get_empty_index())
+        finally:
+            self.seconds = time.perf_counter() - startTime
+            self.set_limits()
+
+        return path
+
+    def solve_fast(self, board, weight=3, maxNodes=None, cancel=None):
+        '''PuzzleSolver.solve_fast(board, weight=3, maxNodes=None, cancel=None) -> list
+        returns a list of moves that solves the board found by weighted A*,
+        it is quick but not always optimal'''
+        if not board.is_solvable():
+            raise ValueError("board cannot be solved")
+
+        self.set_limits(maxNodes, None, None, cancel)
+        startTime = time.perf_counter()
+        width = self.width
+        neighbors = self.neighbors
+        distances = self.distances
+        horizontal = self.get_horizontal_conflict
+        vertical = self.get_vertical_conflict
+
+        # each entry is (weighted cost, count, moves, estimate, tiles as a tuple, empty),
+        # the tuple is also the key in parents so each board is kept once
+        key = tuple(board.get_tiles())
+        estimate = self.get_heuristic(key)
+        parents = {key: None}
+        heap = [(weight*estimate, 0, 0, estimate, key, board.get_empty_index())]
+        nodes = 0
+        try:
+            while heap:
+                cost, count, moves, estimate, key, empty = heapq.heappop(heap)
+                tiles = list(key)
+                nodes += 1
+                if nodes & 1023 == 0:
+                    self.check_limits(nodes, None, estimate)
+                if estimate == 0:
+                    break
+
+                for move in range(4):
+                    source = neighbors[empty][move]
+                    if source < 0:
+                        continue
+
+                    # same estimate update as the search
+                    tile = tiles[source]
+                    newTiles = tiles[:]
+                    newEstimate = estimate + distances[tile][empty] - distances[tile][source]
+                    if move < 2:
+                        goalLine = (tile-1) // width
+                        newEstimate -= horizontal(newTiles, goalLine)
+                        newTiles[empty], newTiles[source] = tile, 0
+                        newEstimate += horizontal(newTiles, goalLine)
+                    else:
+                        goalLine = (tile-1) % width
+                        newEstimate -= vertical(newTiles, goalLine)
+                        newTiles[empty], newTiles[source] = tile, 0
+                        newEstimate += vertical(newTiles, goalLine)
+
+                    newKey = tuple(newTiles)
+                    if newKey not in parents:
+                        parents[newKey] = (key, move)
+                        heapq.heappush(heap, (moves + 1 + weight*newEstimate, nodes*4 + move, moves + 1, newEstimate, newKey, source))
+        finally:
+            self.nodes = nodes
+            self.seconds = time.perf_counter() - startTime
+            self.set_limits()
+
+        # follow the parents back to the start
+        path = []
+        while parents[key] != None:
+            key, move = parents[key]
+            path.append(move)
+        path.reverse()
+        return path
+
+    def search_conflicts(self, tiles, empty):
+        '''PuzzleSolver.search_conflicts(tiles, empty) -> (path, nodes)
+        runs IDA* with manhattan distance and linear conflicts'''
+        path = []
+
+        # local names keep the inner loop fast
+        width = self.width
+        neighbors = self.neighbors
+        distances = self.distances
+        horizontal = self.get_horizontal_conflict
+        vertical = self.get_vertical_conflict
+        check = self.check_limits
+        nodes = 0
+
+        def search(empty, estimate, depth, bound, last):
+            '''search(empty, estimate, depth, bound, last) -> int
+            searches below the current state, returns None if solved
+            or the smallest cost over the bound'''
+            nonlocal nodes, best
+            nodes += 1
+            if estimate < best:
+                best = estimate
+            if nodes & 4095 == 0:
+                check(nodes, bound, best)
+            if estimate == 0:
+                return None
+
+            smallest = 1000
+            for move in range(4):
+                # never undo the last move
+                if move ^ 1 == last:
+                    continue
+                source = neighbors[empty][move]
+                if source < 0:
+                    continue
+
+                # move the tile, only the goal line of the tile can change its conflicts
+                tile = tiles[source]
+                newEstimate = estimate + distances[tile][empty] - distances[tile][source]
+                if move < 2:
+                    goalLine = (tile-1) // width
+                    if source // width == goalLine or empty // width == goalLine:
+                        newEstimate -= horizontal(tiles, goalLine)
+                        tiles[empty], tiles[source] = tile, 0
+                        newEstimate += horizontal(tiles, goalLine)
+                    else:
+                        tiles[empty], tiles[source] = tile, 0
+                else:
+                    goalLine = (tile-1) % width
+                    if source % width == goalLine or empty % width == goalLine:
+                        newEstimate -= vertical(tiles, goalLine)
+                        tiles[empty], tiles[source] = tile, 0
+                        newEstimate += vertical(tiles, goalLine)
+                    else:
+                        tiles[empty], tiles[source] = tile, 0
+
+                # go deeper if under the bound
+                cost = depth + 1 + newEstimate
+                if cost <= bound:
+                    path.append(move)
+                    cost = search(source, newEstimate, depth + 1, bound, move)
+                    if cost == None:
+                        return None
+                    path.pop()
+                if cost < smallest:
+                    smallest = cost
+
+                # put the tile back
+                tiles[source], tiles[empty] = tile, 0
+
+            return smallest
+
+        # deepen the bound until the goal is found
+        estimate = self.get_heuristic(tiles)
+        bound = best = estimate
+        while bound != None:
+            check(nodes, bound, best, True)
+            bound = search(empty, estimate, 0, bound, -1)
+
+        return path, nodes
+
+    def search_patterns(self, tiles, empty):
+        '''PuzzleSolver.search_patterns(tiles, empty) -> (path, nodes)
+        runs IDA* with the additive pattern database'''
+        path = []
+
+        # local names keep the inner loop fast
+        neighbors = self.neighbors
+        tables = self.database.get_tables()
+        indexes = self.database.get_indexes(tiles)
+        patternOf = self.database.patternOf
+        shiftOf = self.database.shiftOf
+        check = self.check_limits
+        nodes = 0
+
+        def search(empty, estimate, depth, bound, last):
+            '''search(empty, estimate, depth, bound, last) -> int
+            searches below the current state, returns None if solved
+            or the smallest cost over the bound'''
+            nonlocal nodes, best
+            nodes += 1
+            if estimate < best:
+                best = estimate
+            if nodes & 4095 == 0:
+                check(nodes, bound, best)
+            if estimate == 0:
+                return None
+
+            smallest = 1000
+            for move in range(4):
+                # never undo the last move
+                if move ^ 1 == last:
+                    continue
+                source = neighbors[empty][move]
+                if source < 0:
+                    continue
+
+                # only the table of the moved tile changes
+                tile = tiles[source]
+                number = patternOf[tile]
+                table = tables[number]
+                oldIndex = indexes[number]
+                newIndex = oldIndex ^ ((source ^ empty) << shiftOf[tile])
+                newEstimate = estimate - table[oldIndex] + table[newIndex]
+
+                # go deeper if under the bound
+                cost = depth + 1 + newEstimate
+                if cost <= bound:
+                    tiles[empty], tiles[source] = tile, 0
+                    indexes[number] = newIndex
+                    path.append(move)
+                    cost = search(source, newEstimate, depth + 1, bound, move)
+                    if cost == None:
+                        return None
+                    path.pop()
+                    indexes[number] = oldIndex
+                    tiles[source], tiles[empty] = tile, 0
+                if cost < smallest:
+                    smallest = cost
+
+            return smallest
+
+        # deepen the bound until the goal is found
+        estimate = self.database.get_estimate(tiles)
+        bound = best = estimate
+        while bound != None:
+            check(nodes, bound, best, True)
+            bound = search(empty, estimate, 0, bound, -1)
+
+        return path, nodes
+
+def get_solver(width=4, height=4):
+    '''get_solver(width=4, height=4) -> PuzzleSolver
+    returns the best solver for the board size, all of them have solve and get_report'''
+    if (width, height) == (3, 3):
+        return PuzzleEightTable()
+    elif (width, height) == (4, 4):
+        return PuzzleSolver(4, 4, PuzzlePatternDatabase())
+    return PuzzleSolver(width, height)
+
+def solve_in_budget(solver, board, maxSeconds=None, maxNodes=None, progress=None, cancel=None):
+    '''solve_in_budget(solver, board, maxSeconds=None, maxNodes=None, progress=None, cancel=None) -> (moves, isOptimal)
+    solves the board optimally if it can within the budget,
+    otherwise falls back to a quick solution that may be longer
+    raises SolverStopped with reason "budget" if the quick solve also
+    runs past FALLBACK_NODES'''
+    if not isinstance(solver, PuzzleSolver):
+        return (solver.solve(board), True)
+    try:
+        return (solver.solve(board, maxNodes, maxSeconds, progress, cancel), True)
+    except SolverStopped as stopped:
+        if stopped.reason != "budget":
+            raise
+    return (solver.solve_fast(board, maxNodes=FALLBACK_NODES, cancel=cancel), False)
+
+def get_click_path(board, moves):
+    '''get_click_path(board, moves) -> list
+    returns the positions to click to play moves on a copy of board,
+    runs of the same move are joined into one click'''
+    board = board.copy()
+    output = []
+    i = 0
+    while i < len(moves):
+        # count the run of the same move
+        count = 1
+        while i + count < len(moves) and moves[i + count] == moves[i]:
+            count += 1
+
+        # the clicked tile is count places behind the empty space
+        direction = MOVE_DIRECTIONS[moves[i]]
+        empty = board.get_empty()
+        pos = (empty[0] - direction[0]*count, empty[1] - direction[1]*count)
+        board.move_to(pos)
+        output.append(pos)
+        i += count
+    return output
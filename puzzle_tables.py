@@ -0,0 +1,205 @@
+# Slide Puzzle Tables
+# Auther: G.G.Otto
+# Version: 1.3
+
+import os
+import os.path as path
+import threading
+import time
+import zlib
+from puzzle_board import PuzzleBoard
+
+EIGHT_FILE = path.join(path.dirname(path.realpath(__file__)), "slide_puzzle_eight.db")
+EIGHT_STATES = 181440 # 9!/2, every solvable 3x3 board
+
+# file layout: magic, crc32 of the table, then one byte per state
+MAGIC = b"SP8T"
+HEADER_SIZE = 8
+
+# tables already loaded or built in this process, by file name
+eightTables = {}
+tableLock = threading.Lock()
+
+class PuzzleEightTable:
+    '''represents the distance to the goal of every solvable 3x3 board
+    boards are ranked by the empty space and the first 6 tiles in reading order,
+    the parity fixes the last 2'''
+
+    def __init__(self, fileName=EIGHT_FILE):
+        '''PuzzleEightTable(fileName=EIGHT_FILE) -> PuzzleEightTable
+        constructs the table, it is loaded or built the first time it is used'''
+        self.fileName = fileName
+        self.width = 3
+        self.height = 3
+        self.neighbors = PuzzleBoard(3, 3).neighbors
+        self.table = None
+
+        # stats
+        self.nodes = 0
+        self.seconds = 0
+
+    def get_stats(self):
+        '''PuzzleEightTable.get_stats() -> (lookups, seconds, lookups per second)
+        returns the stats of the last solve'''
+        return (self.nodes, self.seconds, self.nodes/self.seconds if self.seconds else 0)
+
+    def get_report(self):
+        '''PuzzleEightTable.get_report() -> str
+        returns a readable report of the last solve'''
+        nodes, seconds, speed = self.get_stats()
+        return f"{nodes} lookups in {int(seconds*1000)/1000} s ({int(speed)} lookups/s)"
+
+    def get_rank(self, tiles):
+        '''PuzzleEightTable.get_rank(tiles) -> int
+        returns the index of a list of tiles in the table'''
+        rank = tiles.index(0)
+        used = 0
+        i = 0
+        for tile in tiles:
+            if tile == 0:
+                continue
+            # count the smaller tiles not used yet
+            rank = rank*(8 - i) + tile - 1 - (used & ((1 << tile) - 1)).bit_count()
+            used |= 1 << tile
+            i += 1
+            if i == 6:
+                return rank
+
+    def get_table(self):
+        '''PuzzleEightTable.get_table() -> bytearray
+        returns the table, loading or building it if needed,
+        every PuzzleEightTable of the process with the same file shares it'''
+        if self.table == None:
+            with tableLock:
+                if self.fileName not in eightTables:
+                    if not self.load():
+                        self.build()
+                        # the table still works if it cannot be saved, it is built again next run
+                        try:
+                            self.save()
+                        except OSError:
+                            pass
+                    eightTables[self.fileName] = self.table
+                self.table = eightTables[self.fileName]
+        return self.table
+
+    def load(self):
+        '''PuzzleEightTable.load() -> bool
+        loads the table from its file, returns False if it is missing or damaged'''
+        if not path.isfile(self.fileName):
+            return False
+
+        with open(self.fileName, "rb") as file:
+            data = file.read()
+        table = data[HEADER_SIZE:]
+        if data[:4] != MAGIC or len(table) != EIGHT_STATES or int.from_bytes(data[4:8], "little") != zlib.crc32(table):
+            return False
+
+        self.table = bytearray(table)
+        return True
+
+    def save(self):
+        '''PuzzleEightTable.save() -> None
+        writes the table to its file in one step'''
+        tempName = f"{self.fileName}.{os.getpid()}.tmp"
+        with open(tempName, "wb") as file:
+            file.write(MAGIC + zlib.crc32(self.table).to_bytes(4, "little"))
+            file.write(self.table)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tempName, self.fileName)
+
+    def build(self):
+        '''PuzzleEightTable.build() -> None
+        builds the table by breadth first search from the goal'''
+        neighbors = self.neighbors
+        table = bytearray(b"\xff")*EIGHT_STATES
+        goal = [1,2,3,4,5,6,7,8,0]
+        table[self.get_rank(goal)] = 0
+
+        # each layer is a list of (tiles, empty)
+        layer = [(goal, 8)]
+        cost = 0
+        while layer:
+            cost += 1
+            nextLayer = []
+            for tiles, empty in layer:
+                for source in neighbors[empty]:
+                    if source < 0:
+                        continue
+                    newTiles = tiles[:]
+                    newTiles[empty], newTiles[source] = newTiles[source], 0
+                    rank = self.get_rank(newTiles)
+                    if table[rank] == 255:
+                        table[rank] = cost
+                        nextLayer.append((newTiles, source))
+            layer = nextLayer
+
+        self.table = table
+
+    def get_distance(self, board):
+        '''PuzzleEightTable.get_distance(board) -> int
+        returns the number of moves in an optimal solution of the board'''
+        return self.get_table()[self.get_rank(board.get_tiles())]
+
+    def solve(self, board):
+        '''PuzzleEightTable.solve(board) -> list
+        returns an optimal list of moves that solves the board'''
+        if (board.width, board.height) != (3, 3):
+            raise ValueError("board size does not match the solver")
+        if not board.is_solvable():
+            raise ValueError("board cannot be solved")
+
+        table = self.get_table()
+        startTime = time.perf_counter()
+        tiles = board.get_tiles()
+        empty = board.get_empty_index()
+        distance = table[self.get_rank(tiles)]
+        self.nodes = 1
+
+        # always step to a neighbor one move closer
+        path = []
+        while distance > 0:
+            for move in range(4):
+                source = self.neighbors[empty][move]
+                if source < 0:
+                    continue
+                tiles[empty], tiles[source] = tiles[source], 0
+                self.nodes += 1
+                if table[self.get_rank(tiles)] == distance - 1:
+                    path.append(move)
+                    empty = source
+                    distance -= 1
+                    break
+                tiles[source], tiles[empty] = tiles[empty], 0
+        self.seconds = time.perf_counter() - startTime
+
+        return path
+
+    def benchmark(self, count=100000):
+        '''PuzzleEightTable.benchmark(count=100000) -> dict
+        returns the load time and lookups per second over random boards'''
+        startTime = time.perf_counter()
+        with tableLock:
+            eightTables.pop(self.fileName, None)
+        self.table = None
+        self.get_table()
+        loadSeconds = time.perf_counter() - startTime
+
+        # random solvable boards
+        board = PuzzleBoard(3, 3)
+        boards = []
+        for i in range(1000):
+            board.randomize()
+            boards.append(board.copy())
+
+        startTime = time.perf_counter()
+        for i in range(count):
+            self.get_distance(boards[i % 1000])
+        seconds = time.perf_counter() - startTime
+        return {"loadSeconds": loadSeconds, "lookups": count, "seconds": seconds, "lookupsPerSecond": count/seconds}
+
+if __name__ == "__main__":
+    results = PuzzleEightTable().benchmark()
+    print(f"table ready in {int(results['loadSeconds']*1000)} ms")
+    print(f"{int(results['lookupsPerSecond'])} lookups/s")
@@ -0,0 +1,125 @@
+# Slide Puzzle Tracing
+# Auther: G.G.Otto
+# Version: 1.3
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+class PuzzleSpan:
+    '''represents one timed span, use it in a with statement'''
+
+    def __init__(self, tracer, name, category):
+        '''PuzzleSpan(tracer, name, category) -> PuzzleSpan
+        constructs the span, it is timed when it is entered'''
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.startTime = 0
+
+    def __enter__(self):
+        '''PuzzleSpan.__enter__() -> PuzzleSpan
+        starts the span'''
+        self.startTime = time.perf_counter()
+        return self
+
+    def __exit__(self, *error):
+        '''PuzzleSpan.__exit__(*error) -> None
+        ends the span and adds it to the tracer'''
+        self.tracer.add_span(self.name, self.category, self.startTime, time.perf_counter())
+
+class PuzzleNullSpan:
+    '''represents the span used while tracing is off, it does nothing'''
+
+    def __enter__(self):
+        '''PuzzleNullSpan.__enter__() -> PuzzleNullSpan
+        does nothing'''
+        return self
+
+    def __exit__(self, *error):
+        '''PuzzleNullSpan.__exit__(*error) -> None
+        does nothing'''
+
+nullSpan = PuzzleNullSpan()
+
+class PuzzleTracer:
+    '''represents the opt-in counters and timing spans of the game
+    events are kept in Chrome trace form, while it is off a span is one
+    attribute check and the shared null span'''
+
+    def __init__(self, maxEvents=200000):
+        '''PuzzleTracer(maxEvents=200000) -> PuzzleTracer
+        constructs the tracer, it is off until enabled
+        maxEvents: events kept before the oldest are dropped'''
+        self.enabled = False
+        self.events = deque(maxlen=maxEvents)
+        self.counters = {}
+        self.recent = {} # name: deque of the latest span seconds
+        self.startTime = time.perf_counter()
+
+    def is_enabled(self):
+        '''PuzzleTracer.is_enabled() -> bool
+        returns if the tracer is recording'''
+        return self.enabled
+
+    def set_enabled(self, boolean):
+        '''PuzzleTracer.set_enabled(boolean) -> None
+        turns recording on or off'''
+        self.enabled = boolean
+
+    def clear(self):
+        '''PuzzleTracer.clear() -> None
+        drops every event and counter'''
+        self.events.clear()
+        self.counters = {}
+        self.recent = {}
+
+    def span(self, name, category="ui"):
+        '''PuzzleTracer.span(name, category="ui") -> PuzzleSpan
+        returns a span to time a with statement'''
+        if not self.enabled:
+            return nullSpan
+        return PuzzleSpan(self, name, category)
+
+    def add_span(self, name, category, startTime, endTime):
+        '''PuzzleTracer.add_span(name, category, startTime, endTime) -> None
+        adds a span between two time.perf_counter times'''
+        if not self.enabled:
+            return
+        self.events.append({"name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+            "ts": (startTime - self.startTime)*1000000, "dur": (endTime - startTime)*1000000})
+        if name not in self.recent:
+            self.recent[name] = deque(maxlen=120)
+        self.recent[name].append(endTime - startTime)
+
+    def count(self, name, amount=1):
+        '''PuzzleTracer.count(name, amount=1) -> None
+        adds amount to a counter'''
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + amount
+        self.events.append({"name": name, "ph": "C", "pid": os.getpid(), "tid": threading.get_ident(),
+            "ts": (time.perf_counter() - self.startTime)*1000000, "args": {name: self.counters[name]}})
+
+    def get_counter(self, name):
+        '''PuzzleTracer.get_counter(name) -> int
+        returns the value of a counter'''
+        return self.counters.get(name, 0)
+
+    def get_recent(self, name):
+        '''PuzzleTracer.get_recent(name) -> list
+        returns the seconds of the latest spans named name'''
+        return list(self.recent.get(name, ()))
+
+    def export(self, fileName):
+        '''PuzzleTracer.export(fileName) -> None
+        writes the events as Chrome trace JSON, for chrome://tracing or Perfetto'''
+        tempName = fileName + ".tmp"
+        with open(tempName, "w") as file:
+            json.dump({"traceEvents": list(self.events), "displayTimeUnit": "ms"}, file)
+        os.replace(tempName, fileName)
+
+# tracer shared by every part of the game
+tracer = PuzzleTracer()
@@ -2,59 +2,81 @@
 # Auther: G.G.Otto
 # Version: 1.3
 
-from tkinter import *
-import random
 import time
+loadTime = time.perf_counter() # start of the import, for the startup command
+
+from tkinter import *
+import argparse
+import sys
+import math
 import os
 import os.path as path
-import tkinter.messagebox as msg
-import tkinter.colorchooser as color
-import tkinter.filedialog as fileopen
-import tkinter.ttk as ttk
-
-class PuzzlePiece(Canvas):
-    '''represents one of the puzzle pieces'''
-
-    def __init__(self, master, number, row, column, image=None, clickable=True, bg="#46bf79", numColor="#ecd9a9"):
-        '''PuzzlePiece(master, number, row, column, image=None, clickable=True) -> PuzzlePiece
-        constructs the puzzle piece'''
-        Canvas.__init__(self, master, bg=bg, width=300/4-2, height=300/4-2, highlightthickness=0)
+import queue
+import threading
+from collections import deque
+from puzzle_board import PuzzleBoard, MOVE_DIRECTIONS, UP, DOWN, LEFT, RIGHT, new_seed, get_randomizer
+from puzzle_solver import SolverStopped, get_solver, get_click_path, solve_in_budget
+from puzzle_patterns import PuzzlePatternDatabase
+from puzzle_batch import solve_boards, generate_boards
+from puzzle_images import PuzzleImageCache
+from puzzle_hints import PuzzleHinter
+from puzzle_replay import PuzzleRecording, load_recording, save_to_folder
+from puzzle_scores import PuzzleScoreStore, get_difficulty
+from puzzle_bank import PuzzleScrambleBank
+from puzzle_trace import tracer
+
+# dialogs and ttk are imported where they are used so most games never load them
+
+# tiles of puzzle images shared by every piece
+tileCache = PuzzleImageCache()
+
+# keys that slide a tile into the empty space
+KEY_MOVES = {"up": UP, "w": UP, "down": DOWN, "s": DOWN, "left": LEFT, "a": LEFT, "right": RIGHT, "d": RIGHT}
+
+def get_tile_size(size):
+    '''get_tile_size(size) -> int
+    returns the pixels across a piece for a board of size (width, height)'''
+    return max(300//max(size), 45)
+
+class PuzzlePiece:
+    '''represents one of the puzzle pieces
+    the piece is a group of items on the canvas tagged "piece" + number'''
+
+    def __init__(self, master, number, row, column, image=None, clickable=True, bg="#46bf79", numColor="#ecd9a9", size=(4,4)):
+        '''PuzzlePiece(master, number, row, column, image=None, clickable=True, size=(4,4)) -> PuzzlePiece
+        constructs the puzzle piece for a board of size (width, height)'''
         self.number = number
+        self.size = size
+        self.tileSize = get_tile_size(size)
         self.row = row
         self.column = column
         self.oldRow = row
         self.oldColumn = column
         self.master = master
+        self.tag = "piece"+str(number)
 
         # get canvas for piece
         if isinstance(master, Canvas):
             clickable = False
-            canvas = master
-        else:
-            canvas = self.master.get_slide_canvas()
-
-        # draw piece
-        canvas.create_window(300*(row + 0.5)/4,300*(column + 0.5)/4, window=self, tags="piece"+str(number))
-        if image == None:
-            self.create_text(75/2, 37, text=str(number), fill=numColor, font=("Arial",30))
+            self.canvas = master
         else:
-            # get tkinter image object
-            self["bg"] = "white"
-            photo = PhotoImage(file=image)
-            self.create_image(-(row-2)*int(self["width"]), -(column-2)*int(self["height"]), image=photo)
-            self.img = photo # keeps image in place
+            self.canvas = self.master.get_slide_canvas()
 
         # update stats
         self.image = image
+        self.bg = "white" if image != None else bg
         self.numColor = numColor
         self.hints = False
-
         self.clickable = clickable
+        self.img = None
+
+        # draw piece
+        self.draw()
 
     def get_look(self):
         '''PuzzlePiece.get_look() -> tuple
         returns a tuple with the look of the piece'''
-        return self["bg"], self.numColor, self.image
+        return self.bg, self.numColor, self.image
 
     def get_number(self):
         '''PuzzlePiece.get_number() -> int
@@ -66,6 +88,11 @@ class PuzzlePiece(Canvas):
         returns a tuple with the position'''
         return (self.row, self.column)
 
+    def get_corner(self):
+        '''PuzzlePiece.get_corner() -> (x, y)
+        returns the top left corner of the piece on the canvas'''
+        return (self.tileSize*self.row + 1, self.tileSize*self.column + 1)
+
     def is_clickable(self):
         '''PuzzlePiece.is_clickable() -> None
         returns if the piece is clickable'''
@@ -76,54 +103,119 @@ class PuzzlePiece(Canvas):
         sets the clickable state of the piece'''
         self.clickable = boolean
 
+    def set_bg(self, bg):
+        '''PuzzlePiece.set_bg(bg) -> None
+        sets the background color of the piece'''
+        self.bg = bg
+        self.canvas.itemconfig(self.tag+"bg", fill=bg)
+
+    def set_pos(self, pos):
+        '''PuzzlePiece.set_pos(pos) -> None
+        moves the piece straight to pos'''
+        self.canvas.move(self.tag, self.tileSize*(pos[0] - self.row), self.tileSize*(pos[1] - self.column))
+        self.row, self.column = pos
+
     def move_by(self, moveBy):
         '''PuzzlePiece.move_by(moveBy) -> None
         moves the piece by tuple moveBy'''
         self.column += moveBy[1]
         self.row += moveBy[0]
 
-    def select_piece(self, event=''):
-        '''PuzzlePiece.select_piece(event) -> None
-        selects the piece for moving'''
-        if not self.clickable:
-            return
-        
-        self.master.move_piece((self.row, self.column))
+    def draw(self):
+        '''PuzzlePiece.draw() -> None
+        creates every item of the piece once, the look and hints
+        only change their options and states afterwards'''
+        x, y = self.get_corner()
+        size = self.tileSize-2
+        self.canvas.create_rectangle(x, y, x+size, y+size, width=0, tags=(self.tag, self.tag+"bg", "piece", "piecebg"))
+        self.canvas.create_text(x+size/2, y+size/2, text=str(self.number), font=("Arial",self.tileSize*2//5),
+            tags=(self.tag, self.tag+"num", "piece", "piecenum"))
+        self.canvas.create_image(x, y, anchor=NW, tags=(self.tag, self.tag+"img", "piece", "pieceimg"))
+
+        # hint badge, hidden until hints are shown
+        right = x + size
+        radius = max(self.tileSize//7, 7)
+        self.canvas.create_oval(right-2*radius-1, y+1, right-1, y+2*radius+1, fill="black", state=HIDDEN,
+            tags=(self.tag, self.tag+"hint", "piece", "piecehint"))
+        self.canvas.create_text(right-radius-1, y+radius+1, text=str(self.number), fill="white", state=HIDDEN,
+            font=("Arial",max(radius*2//3, 6)), tags=(self.tag, self.tag+"hint", "piece", "piecehint"))
+        self.update_look()
+
+    def update_look(self):
+        '''PuzzlePiece.update_look() -> None
+        sets the options of the items to the look of the piece'''
+        self.canvas.itemconfig(self.tag+"bg", fill=self.bg)
+        if self.image == None:
+            self.canvas.itemconfig(self.tag+"num", fill=self.numColor, state=NORMAL)
+            self.canvas.itemconfig(self.tag+"img", image="", state=HIDDEN)
+            self.img = None
+        else:
+            # get tkinter image object
+            size = self.tileSize-2
+            self.img = tileCache.get_tile(self.image, self.size, (size, size), (self.oldRow, self.oldColumn)) # keeps image in place
+            self.canvas.itemconfig(self.tag+"num", state=HIDDEN)
+            self.canvas.itemconfig(self.tag+"img", image=self.img, state=NORMAL)
+
+    def destroy(self):
+        '''PuzzlePiece.destroy() -> None
+        removes the piece from the canvas'''
+        self.canvas.delete(self.tag)
 
     def change_piece(self, bg=None, fg=None, image=None):
         '''PuzzlePiece.change_piece(bg=None, fg=None, image=None) -> None
         changes the look of the piece'''
-        self.delete("all")
-        
         if image != None:
-            # get tkinter image object
-            self["bg"] = "white"
-            photo = PhotoImage(file=image)
-            self.create_image(-(self.oldRow-2)*int(self["width"]), -(self.oldColumn-2)*int(self["height"]), image=photo)
-            self.img = photo # keeps image in place
+            # make sure the image can be read first
+            size = self.tileSize-2
+            tileCache.get_tile(image, self.size, (size, size), (self.oldRow, self.oldColumn))
+            self.bg = "white"
             self.image = image
         else:
             self.image = None
-            self.delete("all")
-            self["bg"] = bg
-            self.create_text(75/2, 37, text=str(self.number), fill=fg, font=("Arial",30))
+            self.bg = bg
             self.numColor = fg
+        self.update_look()
 
-        # draw hint if needed
-        if self.hints:
-            for i in range(2):
-                self.toggle_hints()
+    def set_hints(self, boolean):
+        '''PuzzlePiece.set_hints(boolean) -> None
+        shows or hides the hint on the piece'''
+        self.hints = boolean
+        self.canvas.itemconfig(self.tag+"hint", state=NORMAL if boolean else HIDDEN)
 
     def toggle_hints(self):
         '''PuzzlePiece.toggle_hints() -> None
         toggles the hints on the piece'''
-        if self.hints:
-            self.hints = False
-            self.delete("hint")
-        else:
-            self.hints = True
-            self.create_oval(float(self["width"])-21, 1, float(self["width"])-1, 21, fill="black", tags="hint")
-            self.create_text(float(self["width"])-11, 11, text=str(self.number), fill="white", tags="hint")
+        self.set_hints(not self.hints)
+
+def change_pieces(pieces, bg=None, fg=None, image=None):
+    '''change_pieces(pieces, bg=None, fg=None, image=None) -> None
+    changes the look of every piece on a canvas, colors are set
+    with one call for the canvas instead of one for each piece'''
+    if len(pieces) == 0:
+        return
+    if image != None:
+        # each piece has its own part of the image
+        for piece in pieces:
+            piece.change_piece(image=image)
+        return
+
+    for piece in pieces:
+        piece.image = None
+        piece.img = None
+        piece.bg = bg
+        piece.numColor = fg
+    canvas = pieces[0].canvas
+    canvas.itemconfig("piecebg", fill=bg)
+    canvas.itemconfig("piecenum", fill=fg, state=NORMAL)
+    canvas.itemconfig("pieceimg", image="", state=HIDDEN)
+
+def set_hints(pieces, boolean):
+    '''set_hints(pieces, boolean) -> None
+    shows or hides the hints of every piece on a canvas in one call'''
+    for piece in pieces:
+        piece.hints = boolean
+    if len(pieces) > 0:
+        pieces[0].canvas.itemconfig("piecehint", state=NORMAL if boolean else HIDDEN)
 
 class PuzzleStats(Frame):
     '''represents the bar for teh stats'''
@@ -140,48 +232,56 @@ class PuzzleStats(Frame):
         # attributes
         self.master = master
         self.bestShown = False
-        self.bestScores = self.retrieve_best()
+        self.store = PuzzleScoreStore()
+        self.key = None
         self.moves = 0
 
         # time attributes
         self.timeRecord = 0
-        self.startTime = time.time()
-        self.last = self.startTime
-        self.stopped = False
+        self.startTime = time.monotonic()
+        self.stopped = True
         
-        # labels for best scores
-        self.bestMoves = Label(master, text=f"Best: {self.bestScores[0]}", font=("calibri", 14), bg="white")
-        if self.bestScores[0] != "NA":
-            self.bestTime = Label(master, text=f"Best: {int(self.bestScores[1]//60)}:{int(self.bestScores[1]%60*10)/10}", font=("calibri", 14), bg="white")
-        else:
-            self.bestTime = Label(master, text="Best: NA", font=("calibri", 14), bg="white")
+        # labels for best scores, read from the store when shown
+        self.bestMoves = Label(master, text="Best: NA", font=("calibri", 14), bg="white")
+        self.bestTime = Label(master, text="Best: NA", font=("calibri", 14), bg="white")
 
     def is_best_shown(self):
         '''PuzzleStats.is_best_shown() -> bool
         returns if the best scores are shown or not'''
         return self.bestShown
 
+    def set_key(self, key):
+        '''PuzzleStats.set_key(key) -> None
+        sets the score key of the game, see PuzzleScoreStore'''
+        self.key = key
+        if self.bestShown:
+            self.show_best()
+
+    def show_best(self):
+        '''PuzzleStats.show_best() -> None
+        reads the best scores of the key into the labels'''
+        bestMoves, bestTime = (None, None) if self.key == None else self.store.get_best(self.key)
+        self.bestMoves["text"] = "Best: NA" if bestMoves == None else f"Best: {bestMoves}"
+        self.bestTime["text"] = "Best: NA" if bestTime == None else f"Best: {int(bestTime//60)}:{int(bestTime%60*10)/10}"
+
     def update_best(self):
         '''PuzzleStats.update_best() -> str
-        updates the best scores. returns a str with message if updated'''
-        if self.bestScores == ["NA","NA"]:
-            self.bestScores = [10000, 10000]
-        
+        adds the score to the store. returns a str with message if a best was beaten'''
+        bestMoves, bestTime = self.store.get_best(self.key)
         output = "\n"
-        
-        # update best moves
-        if self.moves < self.bestScores[0]:
-            self.bestScores[0] = self.moves
-            self.bestMoves["text"] = "Best:" + self.moveLabel["text"][6:]
-            output += "\nNew best moves!"
 
-        # update timer
-        if self.timeRecord < self.bestScores[1]:
-            self.bestScores[1] = self.timeRecord
-            self.bestTime["text"] = "Best:" + self.timeLabel["text"][5:]
+        # check the bests before this game is added
+        if bestMoves == None or self.moves < bestMoves:
+            output += "\nNew best moves!"
+        if bestTime == None or self.timeRecord < bestTime:
             output += "\nNew best time!"
 
-        self.save_best()
+        # compared with the earlier games only, so this one is not counted
+        if bestTime != None:
+            output += f"\nFaster than {int(self.store.get_percentile(self.key, self.timeRecord))}% of your games."
+        self.store.add_score(self.key, self.moves, self.timeRecord)
+        if self.bestShown:
+            self.show_best()
         return output
     
     def update_moves(self, movesToAdd=1):
@@ -190,34 +290,38 @@ class PuzzleStats(Frame):
         self.moves += movesToAdd
         self.moveLabel["text"] = f"Moves: {self.moves}"
 
-    def start_timer(self, startTime=None):
-        '''PuzzleStats.start_timer(time.time()) -> None
-        starts the timer to record current time'''
-        if startTime != None:
-            self.stopped = False
-            self.startTime = startTime
-
-        if not self.stopped:
-            self.last = time.time()
-            record = self.timeRecord + self.last - self.startTime # time since start
+    def start_timer(self):
+        '''PuzzleStats.start_timer() -> None
+        starts the timer to record current time, the label is the "timer" job
+        of the puzzle's ticker so starting twice never adds a second loop'''
+        self.stopped = False
+        self.startTime = time.monotonic()
+        self.master.ticker.add_job("timer", 0.1, self.update_timer, 0)
 
-            # update timer
-            self.timeLabel["text"] = "Time: " + str(int(record//60)) + ":" + str(int(record%60*10)/10)
-            self.master.after(100, self.start_timer)
+    def update_timer(self, now):
+        '''PuzzleStats.update_timer(now) -> bool
+        shows the time since the start'''
+        if self.stopped:
+            return False
+        record = self.timeRecord + now - self.startTime
+        set_text(self.timeLabel, "Time: " + str(int(record//60)) + ":" + str(int(record%60*10)/10))
+        return True
 
     def stop_timer(self): 
         '''PuzzleStats.stop_timer() -> None
         stops the timer that records current time'''
-        self.timeRecord += self.last - self.startTime
+        if not self.stopped:
+            self.timeRecord += time.monotonic() - self.startTime
         self.stopped = True
+        self.master.ticker.remove_job("timer")
 
     def clear_stats(self):
         '''PuzzleStats.clear_stats() -> None
         clears all the stats for the game'''
         self.stopped = True
+        self.master.ticker.remove_job("timer")
         self.timeRecord = 0
-        self.startTime = time.time()
-        self.last = self.startTime
+        self.startTime = time.monotonic()
         self.moves = 0
 
         # clear out labels
@@ -235,26 +339,7 @@ class PuzzleStats(Frame):
             self.bestMoves.grid(row=4, column=0)
             self.bestTime.grid(row=4, column=1)
             self.bestShown = True
-
-    def retrieve_best(self):
-        '''PuzzleStats.retrieve_best() -> tuple
-        return the best scores as (moves, time)'''
-        if not path.isfile("slide_puzzle_best_scores.txt"):
-            return ["NA","NA"]
-
-        # retrieve from file
-        inFile = open("slide_puzzle_best_scores.txt", "r")
-        scores = inFile.read().split()
-        inFile.close()
-
-        return [int(scores[0]), float(scores[1])]
-
-    def save_best(self):
-        '''PuzzleStats.save_best() -> None
-        saves the best high score'''
-        outFile = open("slide_puzzle_best_scores.txt", "w")
-        outFile.write(f"{self.bestScores[0]} {self.bestScores[1]}")
-        outFile.close()
+            self.show_best()
 
 class PuzzleCustomize(Frame):
     '''represents the root for the new window for customizing'''
@@ -262,6 +347,7 @@ class PuzzleCustomize(Frame):
     def __init__(self, master):
         '''PuzzleCustomize(master) -> Tk
         constructs the window for the custom root'''
+        import tkinter.ttk as ttk
         Frame.__init__(self, bg="white")
         self.master = master
 
@@ -295,32 +381,49 @@ class PuzzleCustomize(Frame):
         
         # shuffle length
         ttk.Separator(self).grid(row=6, column=0, columnspan=4, sticky=W+E)
-        self.shuffleLength = Scale(self, orient=HORIZONTAL, length=270, label="Shuffle Length", showvalue=0,
+        self.shuffleLength = Scale(self, orient=HORIZONTAL, length=270, label="Shuffle Length (optimal moves for graded boards)", showvalue=0,
             bg="white", sliderrelief=GROOVE, sliderlength=18, highlightthickness=5, 
             highlightbackground="white", from_=5, to=55, activebackground="#a0ffff")
         self.shuffleLength.grid(row=7, column=0, columnspan=4)
         self.shuffleLength.set(master.get_shuffle_length().get())
         
+        # board size
+        sizeFrame = Frame(self, bg="white")
+        sizeFrame.grid(row=8, column=0, columnspan=4)
+        size = master.get_board().get_size()
+        self.boardWidth = IntVar(value=size[0])
+        self.boardHeight = IntVar(value=size[1])
+        Label(sizeFrame, text="Board Size:", bg="white", font=("times new roman", 10)).grid(row=0, column=0)
+        Spinbox(sizeFrame, from_=3, to=8, width=3, textvariable=self.boardWidth, state="readonly",
+            command=self.draw_preview).grid(row=0, column=1)
+        Label(sizeFrame, text="x", bg="white").grid(row=0, column=2)
+        Spinbox(sizeFrame, from_=3, to=8, width=3, textvariable=self.boardHeight, state="readonly",
+            command=self.draw_preview).grid(row=0, column=3)
+        
         # cancel and apply buttons and frame for buttons
         buttonFrame = Frame(self, bg="white")
-        buttonFrame.grid(row=8, column=0, columnspan=4)
+        buttonFrame.grid(row=9, column=0, columnspan=4)
         ttk.Button(buttonFrame, text="Cancel", command=self.cancel).grid(row=3, column=1, sticky=W)
         ttk.Button(buttonFrame, text="Apply", command=self.apply).grid(row=3, column=0, sticky=E)
 
         # canvas to preview the picture
-        self.previewCanvas = Canvas(buttonFrame, bg=master.get_slide_canvas()["bg"], width=298, height=298)
+        self.previewCanvas = Canvas(buttonFrame, bg=master.get_slide_canvas()["bg"])
         self.previewCanvas.grid(row=1, column=0, columnspan=2)
 
         # add puzzle pieces
-        num = 1
         self.pieces = {}
-        for row in range(4):
-            for column in range(4):
-                looks = master.get_pieces()[0].get_look()
-                newPiece = PuzzlePiece(self, num, row, column, None, False)
-                newPiece.change_piece(looks[0], looks[1], looks[2])
-                self.pieces[row, column] = newPiece
-                num += 1
+        self.reset()
+
+    def reset(self):
+        '''PuzzleCustomize.reset() -> None
+        sets every choice back to the settings of the puzzle'''
+        self.previewCanvas["bg"] = self.master.get_slide_canvas()["bg"]
+        self.fileChoice.set("")
+        self.shuffleLength.set(self.master.get_shuffle_length().get())
+        size = self.master.get_board().get_size()
+        self.boardWidth.set(size[0])
+        self.boardHeight.set(size[1])
+        self.draw_preview(self.master.get_pieces()[0].get_look())
         self.pieceBg = self.pieces[0,0].get_look()[0]
 
     def get_slide_canvas(self):
@@ -328,48 +431,79 @@ class PuzzleCustomize(Frame):
         returns the canvas for the pieces to slide on'''
         return self.previewCanvas
 
+    def get_board_size(self):
+        '''PuzzleCustomize.get_board_size() -> (width, height)
+        returns the board size chosen'''
+        return (self.boardWidth.get(), self.boardHeight.get())
+
+    def draw_preview(self, looks=None):
+        '''PuzzleCustomize.draw_preview(looks=None) -> None
+        draws the preview pieces for the board size chosen
+        looks: look of the pieces, the current preview look if None'''
+        if looks == None:
+            looks = self.pieces[0,0].get_look()
+        size = self.get_board_size()
+
+        # same size, only restyle the pieces
+        if len(self.pieces) > 0 and self.pieces[0,0].size == size:
+            if self.pieces[0,0].get_look() != tuple(looks):
+                change_pieces(list(self.pieces.values()), *looks)
+            return
+
+        for piece in self.pieces.values():
+            piece.destroy()
+
+        # resize canvas
+        tileSize = get_tile_size(size)
+        self.previewCanvas.config(width=tileSize*size[0]-2, height=tileSize*size[1]-2)
+
+        # add puzzle pieces
+        num = 1
+        self.pieces = {}
+        for column in range(size[1]):
+            for row in range(size[0]):
+                newPiece = PuzzlePiece(self, num, row, column, looks[2], False, looks[0], looks[1], size)
+                self.pieces[row, column] = newPiece
+                num += 1
+
     def cancel(self):
         '''PuzzleCustomize.cancel() -> None
         cancels the customization'''
         self.master.toggle_customize()
-        self.destroy()
-        PuzzleCustomize.__init__(self, self.master)
+        self.reset()
 
     def apply(self):
         '''PuzzleCustomize.apply() -> None
         applies the customization'''
-        if self.shuffleLength.get() < 25 and \
-           not msg.askyesno(message="If the shuffle length is set to less than normal, best scores will not be counted. Do you want to continue?"):
-            return
-        
         self.master.get_shuffle_length().set(self.shuffleLength.get())
         self.master.get_slide_canvas()["bg"] = self.previewCanvas["bg"]
+        if self.get_board_size() != self.master.get_board().get_size():
+            self.master.set_board_size(self.get_board_size())
         
         # change piece look
-        for piece in self.master.get_pieces():
-            look = self.pieces[0,0].get_look()
-            piece.change_piece(look[0], look[1], look[2])
+        change_pieces(self.master.get_pieces(), *self.pieces[0,0].get_look())
         self.master.toggle_customize()
 
     def change_puzzle(self, key):
         '''PuzzleCustomize.change_puzzle(key) -> None
         changes the background of the canvas
         keys: can be "bg", "pc", "nc"'''
+        import tkinter.colorchooser as color
         # background of canvas
         if key == "bg":
             self.previewCanvas["bg"] = color.askcolor("#ecd9a9")[1]
         # piece background
         elif key == "pc":
             self.pieceBg = color.askcolor("#46bf79")[1]
-            for piece in self.pieces:
-                self.pieces[piece]["bg"] = self.pieceBg
+            self.previewCanvas.itemconfig("piecebg", fill=self.pieceBg)
+            for piece in self.pieces.values():
+                piece.bg = self.pieceBg
         elif key == "nc":
             # get color
             numColor = color.askcolor("#ecd9a9")[1]
             if numColor == None:
                 return
-            for piece in self.pieces:
-                self.pieces[piece].change_piece(self.pieceBg, numColor)
+            change_pieces(list(self.pieces.values()), self.pieceBg, numColor)
 
     def is_valid_file(self, file):
         '''PuzzleCustomize.is_valid_file(file) -> bool
@@ -379,9 +513,13 @@ class PuzzleCustomize(Frame):
     def export(self, choose=False):
         '''PuzzleCustomize.export(choose) -> None
         exports the file in combobox'''
+        import tkinter.messagebox as msg
+        import tkinter.filedialog as fileopen
         # get file name
         if choose:
-            file = fileopen.askopenfilename(title="Optimal Picture Size: 300x300")
+            # any size works, it is scaled and cropped to the board
+            file = fileopen.askopenfilename(title="Choose a Picture",
+                filetypes=[("Pictures", "*.png *.gif *.PNG *.GIF"), ("All Files", "*")])
             if file == "":
                 return
         else:
@@ -395,16 +533,11 @@ class PuzzleCustomize(Frame):
             msg.showerror(message="Invalid file. Please choose a different file.")
             return
 
-        # change pieces
-        for piece in self.pieces:
-            # make sure the file is readable
-            try:
-                self.pieces[piece].change_piece(image=file)
-            except:
-                look = self.pieces[0,1].get_look()
-                self.pieces[0,0].change_piece(look[0], look[1], look[2])
-                msg.showerror(message="This file cannot be read. Please choose a new file.")
-                return
+        # change pieces, the first one reads the file so nothing changes if it cannot be read
+        try:
+            change_pieces(list(self.pieces.values()), image=file)
+        except:
+            msg.showerror(message="This file cannot be read. Please choose a new file.")
 
     def get_puzzles(self):
         '''PuzzleCustomize.get_puzzles() -> tuple
@@ -418,51 +551,340 @@ class PuzzleCustomize(Frame):
     def clear_photo(self):
         '''PuzzleCustomize.get_puzzle() -> tuple
         clears the photo from the pieces'''
-        for piece in self.pieces:
-            look = self.pieces[0,0].get_look()
-            self.pieces[piece].change_piece(self.pieceBg, look[1])
+        change_pieces(list(self.pieces.values()), self.pieceBg, self.pieces[0,0].get_look()[1])
                 
+def set_text(widget, text):
+    '''set_text(widget, text) -> None
+    sets the text of widget only if it changed'''
+    if widget["text"] != text:
+        widget["text"] = text
+
+class PuzzleTicker:
+    '''represents the one scheduler for all periodic work of the window
+    each job is a function called with the monotonic time every interval,
+    it is removed if it returns False, only one after is ever pending'''
+
+    def __init__(self, widget):
+        '''PuzzleTicker(widget) -> PuzzleTicker
+        constructs the ticker that schedules on widget'''
+        self.widget = widget
+        self.jobs = {} # name: [interval, next time, function, running]
+        self.pending = None
+        self.pendingTime = None
+
+    def add_job(self, name, interval, function, delay=None):
+        '''PuzzleTicker.add_job(name, interval, function, delay=None) -> None
+        registers function under name in place of any job already there
+        delay: seconds to the first call, interval if None'''
+        delay = interval if delay == None else delay
+        self.jobs[name] = [interval, time.monotonic() + delay, function, False]
+        self.schedule()
+
+    def remove_job(self, name):
+        '''PuzzleTicker.remove_job(name) -> None
+        removes the job under name if there is one'''
+        if self.jobs.pop(name, None) != None:
+            self.schedule()
+
+    def schedule(self):
+        '''PuzzleTicker.schedule() -> None
+        keeps one after pending for the earliest job'''
+        times = [job[1] for job in self.jobs.values() if not job[3]]
+        nextTime = min(times, default=None)
+        if nextTime == self.pendingTime:
+            return
+
+        if self.pending != None:
+            self.widget.after_cancel(self.pending)
+            self.pending = None
+        self.pendingTime = nextTime
+        if nextTime != None:
+            delay = max(1, math.ceil((nextTime - time.monotonic())*1000))
+            self.pending = self.widget.after(delay, self.tick)
+
+    def tick(self):
+        '''PuzzleTicker.tick() -> None
+        calls every job that is due'''
+        self.pending = None
+        self.pendingTime = None
+        now = time.monotonic()
+
+        # move the due jobs on first, so a job that waits inside still lets others run
+        dueJobs = []
+        for name, job in self.jobs.items():
+            if not job[3] and job[1] <= now + 0.001:
+                dueJobs.append((name, job))
+                job[3] = True
+                job[1] += job[0]
+                if job[1] < now:
+                    # a job with no interval just runs again as soon as it can
+                    job[1] = now if job[0] <= 0 else now + job[0] - (now - job[1]) % job[0]
+        self.schedule()
+
+        # a job that raises is still run again and the others stay scheduled
+        try:
+            for name, job in dueJobs:
+                with tracer.span(name, "tick"):
+                    result = job[2](now)
+                job[3] = False
+                if self.jobs.get(name) is job and result == False:
+                    del self.jobs[name]
+        finally:
+            for name, job in dueJobs:
+                job[3] = False
+            self.schedule()
+
+class PuzzleAnimator:
+    '''represents the scheduler for sliding pieces
+    positions come from the time passed so slow machines skip frames instead of dragging'''
+
+    def __init__(self, ticker, canvas, frameRate=60, duration=0.2):
+        '''PuzzleAnimator(ticker, canvas, frameRate=60, duration=0.2) -> PuzzleAnimator
+        constructs the animator for the items tagged "sliding" on canvas,
+        frames are the "animation" job of ticker'''
+        self.ticker = ticker
+        self.canvas = canvas
+        self.frameTime = 1/frameRate
+        self.duration = duration
+        self.running = False
+        self.frameTimes = deque(maxlen=240)
+
+    def is_running(self):
+        '''PuzzleAnimator.is_running() -> bool
+        returns if a slide is being animated'''
+        return self.running
+
+    def get_frame_times(self):
+        '''PuzzleAnimator.get_frame_times() -> list
+        returns the seconds between the latest frames'''
+        return list(self.frameTimes)
+
+    def get_frame_rate(self):
+        '''PuzzleAnimator.get_frame_rate() -> float
+        returns the average frames per second of the latest frames'''
+        if not self.frameTimes:
+            return 0
+        return len(self.frameTimes)/sum(self.frameTimes)
+
+    def start(self, distance, onDone=None, duration=None):
+        '''PuzzleAnimator.start(distance, onDone=None, duration=None) -> None
+        slides the "sliding" items by distance (x, y), calls onDone at the end
+        duration: seconds of this slide, the animator's duration if None'''
+        self.distance = distance
+        self.slideTime = self.duration if duration == None else duration
+        self.moved = (0, 0)
+        self.onDone = onDone
+        self.running = True
+        self.startTime = time.monotonic()
+        self.lastFrame = self.startTime
+        if self.step(self.startTime):
+            self.ticker.add_job("animation", self.frameTime, self.step)
+
+    def step(self, now):
+        '''PuzzleAnimator.step(now) -> bool
+        draws one frame, returns False once the slide is done'''
+        if now > self.lastFrame:
+            self.frameTimes.append(now - self.lastFrame)
+            if now - self.lastFrame > 1.5*self.frameTime:
+                tracer.count("dropped frames", round((now - self.lastFrame)/self.frameTime) - 1)
+        self.lastFrame = now
+
+        # move all sliding items to where they should be now
+        progress = min(1, (now - self.startTime)/self.slideTime)
+        target = (self.distance[0]*progress, self.distance[1]*progress)
+        self.canvas.move("sliding", target[0] - self.moved[0], target[1] - self.moved[1])
+        self.moved = target
+
+        if progress == 1:
+            self.running = False
+            if self.onDone != None:
+                self.onDone()
+            return False
+        return True
+
+class PuzzleReplayBar(Frame):
+    '''represents the controls for playing a recording on the puzzle
+    moves are slid by the puzzle's own pieces and animator'''
+
+    def __init__(self, master):
+        '''PuzzleReplayBar(master) -> Frame
+        constructs the replay bar, it is shown by open'''
+        Frame.__init__(self, master, bg="white")
+        self.recording = None
+        self.index = 0
+        self.playing = False
+        self.speed = IntVar(value=1)
+
+        # controls
+        self.playButton = Button(self, text="Play", bg="white", activebackground="white", relief=FLAT, command=self.toggle_play)
+        self.playButton.grid(row=0, column=0)
+        self.positionScale = Scale(self, from_=0, to=0, orient=HORIZONTAL, showvalue=False, length=120, bg="white",
+            highlightthickness=0, command=lambda value: self.seek(int(value)))
+        self.positionScale.grid(row=0, column=1)
+        self.moveLabel = Label(self, text="0/0", font=("calibri", 12), bg="white")
+        self.moveLabel.grid(row=0, column=2)
+        Label(self, text="Speed", font=("calibri", 12), bg="white").grid(row=0, column=3)
+        Scale(self, from_=1, to=100, orient=HORIZONTAL, variable=self.speed, length=80, bg="white",
+            highlightthickness=0).grid(row=0, column=4)
+        Button(self, text="Close", bg="white", activebackground="white", relief=FLAT, command=self.close).grid(row=0, column=5)
+
+    def open(self, recording):
+        '''PuzzleReplayBar.open(recording) -> None
+        ends the game and shows the start of recording on the puzzle'''
+        puzzle = self.master
+        puzzle.set_board_size(recording.get_size())
+        puzzle.hide_final_piece()
+        puzzle.toggle_button_disable()
+        puzzle.pauseButton["state"] = DISABLED
+        puzzle.toggle_piece_clickable(False)
+
+        self.recording = recording
+        self.index = -1
+        self.positionScale.config(to=len(recording))
+        self.grid(row=5, column=0, columnspan=2)
+        self.seek(0)
+
+    def close(self):
+        '''PuzzleReplayBar.close() -> None
+        stops the replay and puts the puzzle back to a solved board'''
+        if self.playing:
+            self.toggle_play()
+        puzzle = self.master
+        puzzle.clear_queue()
+        self.grid_remove()
+        self.recording = None
+        puzzle.toggle_button_disable()
+        puzzle.set_board_size(puzzle.get_board().get_size())
+
+    def update_position(self):
+        '''PuzzleReplayBar.update_position() -> None
+        shows the current move on the scale and label'''
+        self.positionScale.set(self.index)
+        self.moveLabel["text"] = f"{self.index}/{len(self.recording)}"
+
+    def seek(self, index):
+        '''PuzzleReplayBar.seek(index) -> None
+        jumps straight to the board after index moves'''
+        puzzle = self.master
+        if self.recording == None or index == self.index or puzzle.animator.is_running():
+            return
+
+        self.index = index
+        puzzle.get_board().set_state(self.recording.get_board(index).get_state())
+        puzzle.place_pieces()
+        self.update_position()
+
+    def toggle_play(self):
+        '''PuzzleReplayBar.toggle_play() -> None
+        plays or pauses the replay'''
+        if self.playing:
+            self.playing = False
+            self.playButton["text"] = "Play"
+            self.master.ticker.remove_job("replay")
+        else:
+            if self.index >= len(self.recording):
+                self.seek(0)
+            self.playing = True
+            self.playButton["text"] = "Pause"
+            self.step()
+
+    def step(self, now=None):
+        '''PuzzleReplayBar.step(now=None) -> bool
+        slides the next move of the recording,
+        returns False so it runs once as the "replay" job of the ticker'''
+        if not self.playing or self.master.animator.is_running():
+            return False
+        if self.index >= len(self.recording):
+            self.toggle_play()
+            return False
+
+        # the tile next to the empty space slides into it
+        puzzle = self.master
+        board = puzzle.get_board()
+        move = self.recording.get_move(self.index)
+        source = board.neighbors[board.get_empty_index()][move]
+        piece = puzzle.get_pieces()[board.get_tile((source % board.width, source // board.width)) - 1]
+        direction = MOVE_DIRECTIONS[move]
+        puzzle.animate_move((direction, [piece]), False, lambda: self.finish_step(move, piece, direction),
+            puzzle.animator.duration/self.speed.get())
+        return False
+
+    def finish_step(self, move, piece, direction):
+        '''PuzzleReplayBar.finish_step(move, piece, direction) -> None
+        applies a replayed move and waits as long as the player did'''
+        self.master.get_board().slide(move)
+        piece.move_by(direction)
+        self.index += 1
+        self.update_position()
+
+        # long thinking pauses are cut to 2 seconds
+        if self.playing and self.index < len(self.recording):
+            wait = min(2, self.recording.get_time(self.index) - self.recording.get_time(self.index-1))
+            self.master.ticker.add_job("replay", wait/self.speed.get(), self.step)
+        elif self.playing:
+            self.toggle_play()
+
 class PuzzleFrame(Frame):
     '''represents the frame of the puzzle'''
 
-    def __init__(self, master, image=None):
-        '''PuzzleFrame(master, image=None) -> PuzzleFrame
-        constructs the puzzle frame'''
+    def __init__(self, master, image=None, size=(4,4), seed=None):
+        '''PuzzleFrame(master, image=None, size=(4,4), seed=None) -> PuzzleFrame
+        constructs the puzzle frame for a board of size (width, height)
+        seed: seed of the first game, a new one for each game if None'''
         Frame.__init__(self, master, bg="white")
         self.grid()
 
         # canvas for pieces to slide on
-        self.slideCanvas = Canvas(self, width=298, height=298, bg="#ecd9a9")
+        self.slideCanvas = Canvas(self, bg="#ecd9a9")
         self.slideCanvas.grid(row=1, column=0, columnspan=2)
+        self.slideCanvas.bind("<Button-1>", self.click_piece)
         
         # create pieces
-        pieceNum = 1
-        self.pieces = {}
+        self.hints = False
+        self.nextHint = False
         self.pieceList = []
-        self.empty = (3,3)
-        for column in range(4):
-            for row in range(4):
-                # stop if enough
-                if pieceNum == 16:
-                    break
-                # add pice
-                newPiece = PuzzlePiece(self, pieceNum, row, column, image)
-                self.pieces[row,column] = newPiece
-                self.pieceList.append(newPiece)
-                pieceNum += 1
-        self.pieceList.append(PuzzlePiece(self, 16, 3, 3, image))
+        self.create_board(size, ("#46bf79", "#ecd9a9", image))
 
         # information for puzzle
         self.aWait = StringVar()
+        self.ticker = PuzzleTicker(self)
+        self.animator = PuzzleAnimator(self.ticker, self.slideCanvas)
         self.isWin = True
         self.image = image
         self.shuffleLength = IntVar(value=30)
+        self.shuffleMode = StringVar(value="animated")
+        self.seed = None
+        self.nextSeed = seed
+
+        # clicks and keys waiting for the slide before them, checked against
+        # plannedBoard which is the board after all of them
+        self.moveQueue = deque()
+        self.plannedBoard = self.board.copy()
+        self.maxQueued = 8
+        self.catchUp = BooleanVar(value=True)
+        self.latencies = deque(maxlen=240)
+        master.bind("<Key>", self.press_key)
+        master.protocol("WM_DELETE_WINDOW", self.quit_game)
+
+        # solver running in the worker thread
+        self.solveBudget = IntVar(value=15)
+        self.solveThread = None
+        self.solveQueue = None
+        self.solveCancel = None
+        self.solveLabel = Label(self, text="", font=("calibri", 12), bg="white")
         
         # stats
         self.stats = PuzzleStats(self)
-        self.customize = PuzzleCustomize(self)
+        self.customize = None # made the first time it is shown
+        self.previewCanvas = None
+        self.previewPieces = []
+        self.difficulty = None
+        self.scoreKey = None
+        self.replayBar = PuzzleReplayBar(self)
+        self.recording = None
+        self.savedRecording = None
+        self.recordedMoves = 0
         self.customShown = False
-        self.hints = False
         self.paused = False
 
         # buttons
@@ -484,11 +906,40 @@ class PuzzleFrame(Frame):
         options['menu'] = self.optionBar
 
         # create option menu
-        self.optionBar.add_command(label="Quit", command=master.destroy)
+        self.optionBar.add_command(label="Quit", command=self.quit_game)
         self.optionBar.add_command(label="Clear", command=self.complete_restart)
         self.optionBar.add_command(label="Customize", command=self.toggle_customize)
         self.optionBar.add_checkbutton(label="Hints", command=self.toggle_hints)
         self.optionBar.add_checkbutton(label="Best Stats", command=self.stats.toggle_best)
+        self.optionBar.add_checkbutton(label="Next Move", command=self.toggle_next_hint)
+        self.optionBar.add_checkbutton(label="Catch Up", variable=self.catchUp)
+
+        # shuffle modes
+        shuffleMenu = Menu(self.optionBar, tearoff=0)
+        shuffleMenu.add_radiobutton(label="Animated", value="animated", variable=self.shuffleMode)
+        shuffleMenu.add_radiobutton(label="Instant", value="instant", variable=self.shuffleMode)
+        shuffleMenu.add_radiobutton(label="Instant Random Board", value="random", variable=self.shuffleMode)
+        shuffleMenu.add_radiobutton(label="Graded Board", value="graded", variable=self.shuffleMode)
+        self.optionBar.add_cascade(label="Shuffle Mode", menu=shuffleMenu)
+
+        # solve budgets, the solver falls back to a quick solution after it
+        budgetMenu = Menu(self.optionBar, tearoff=0)
+        for seconds in (5, 15, 60):
+            budgetMenu.add_radiobutton(label=f"{seconds} seconds", value=seconds, variable=self.solveBudget)
+        self.optionBar.add_cascade(label="Solve Budget", menu=budgetMenu)
+
+        # replays
+        self.optionBar.add_command(label="Save Replay", command=self.save_replay)
+        self.optionBar.add_command(label="Open Replay", command=self.open_replay)
+        self.optionBar.add_command(label="Set Seed", command=self.ask_seed)
+
+        # instrumentation stays on across restarts like the tracer
+        self.tracing = BooleanVar(value=tracer.is_enabled())
+        self.overlayLabel = Label(self, text="", font=("calibri", 10), bg="white", fg="#7f7f7f")
+        self.optionBar.add_checkbutton(label="Instrumentation", variable=self.tracing, command=self.toggle_tracing)
+        self.optionBar.add_command(label="Export Trace", command=self.export_trace)
+        if tracer.is_enabled():
+            self.toggle_tracing()
 
         self.buttons = (self.shuffleButton, self.solveButton, self.pauseButton, self.previewButton, options)
             
@@ -512,34 +963,186 @@ class PuzzleFrame(Frame):
         returns the stats for the puzzle'''
         return self.stats
 
+    def get_board(self):
+        '''PuzzleFrame.get_board() -> PuzzleBoard
+        returns the board engine for the puzzle'''
+        return self.board
+
+    def get_score_key(self):
+        '''PuzzleFrame.get_score_key() -> tuple
+        returns the key of the scores for the game, see PuzzleScoreStore'''
+        length = {"random": 0, "graded": -1}.get(self.shuffleMode.get(), self.shuffleLength.get())
+        image = self.pieceList[0].get_look()[2]
+        return self.board.get_size() + (length, self.difficulty, "" if image == None else path.realpath(image))
+
+    def set_board_size(self, size, look=None):
+        '''PuzzleFrame.set_board_size(size, look=None) -> None
+        ends the game and sets up a solved board of size (width, height)
+        look: look of the pieces, the current look if None'''
+        self.clear_queue()
+        if self.paused:
+            self.toggle_pause()
+        self.hinter.close()
+        self.clear_hint()
+        self.autosave_replay()
+        self.recording = None
+        self.create_board(size, self.pieceList[0].get_look() if look == None else look)
+        self.isWin = True
+        self.difficulty = None
+        self.stats.clear_stats()
+        self.stats.set_key(self.get_score_key())
+        self.pauseButton["state"] = DISABLED
+
+    def create_board(self, size, look):
+        '''PuzzleFrame.create_board(size, look) -> None
+        creates the engine and solved pieces for a board of size (width, height),
+        the pieces are kept and put back in order if the size is the same'''
+        if len(self.pieceList) > 0 and self.board.get_size() == size:
+            self.board = PuzzleBoard(*size)
+            self.hinter = PuzzleHinter(*size)
+            for piece in self.pieceList:
+                number = piece.get_number() - 1
+                piece.set_pos((number % size[0], number // size[0]))
+            if self.pieceList[0].get_look() != tuple(look):
+                change_pieces(self.pieceList, *look)
+            set_hints(self.pieceList, self.hints)
+            return
+
+        for piece in self.pieceList:
+            piece.destroy()
+
+        # engine for the size
+        self.board = PuzzleBoard(*size)
+        self.solver = get_solver(*size)
+        self.hinter = PuzzleHinter(*size)
+        self.bank = PuzzleScrambleBank(*size)
+        self.tileSize = get_tile_size(size)
+        self.slideCanvas.config(width=self.tileSize*size[0]-2, height=self.tileSize*size[1]-2)
+
+        # create pieces in solved order
+        self.pieceList = []
+        for index in range(self.board.size):
+            newPiece = PuzzlePiece(self, index+1, index % size[0], index // size[0], look[2], True, look[0], look[1], size)
+            self.pieceList.append(newPiece)
+        set_hints(self.pieceList, self.hints)
+
+    def click_piece(self, event):
+        '''PuzzleFrame.click_piece(event) -> None
+        selects the piece under the click'''
+        if self.isWin:
+            return
+
+        # find the place on the board
+        pos = (int(self.slideCanvas.canvasx(event.x)//self.tileSize), int(self.slideCanvas.canvasy(event.y)//self.tileSize))
+        if not (0 <= pos[0] < self.board.width and 0 <= pos[1] < self.board.height):
+            return
+        if self.pieceList[0].is_clickable():
+            self.queue_move(pos)
+
+    def press_key(self, event):
+        '''PuzzleFrame.press_key(event) -> None
+        queues the move of an arrow or WASD key'''
+        move = KEY_MOVES.get(event.keysym.lower())
+        if move == None or self.isWin or self.customShown or not self.pieceList[0].is_clickable():
+            return
+
+        # the tile next to the empty space after the queued moves
+        board = self.get_planned_board()
+        source = board.neighbors[board.get_empty_index()][move]
+        if source >= 0:
+            self.queue_move((source % board.width, source // board.width))
+
+    def get_planned_board(self):
+        '''PuzzleFrame.get_planned_board() -> PuzzleBoard
+        returns the board as it will be after the queued moves'''
+        if not self.moveQueue and not self.animator.is_running():
+            self.plannedBoard = self.board.copy()
+        return self.plannedBoard
+
+    def get_input_latency(self):
+        '''PuzzleFrame.get_input_latency() -> (average, worst)
+        returns the seconds from the latest inputs to the first frame of their
+        slides, at most maxQueued slides, each sped up when catch up is on'''
+        if not self.latencies:
+            return (0, 0)
+        return (sum(self.latencies)/len(self.latencies), max(self.latencies))
+
+    def queue_move(self, pos):
+        '''PuzzleFrame.queue_move(pos) -> None
+        queues a click at pos if it is a legal move after the queued moves'''
+        if self.isWin or len(self.moveQueue) >= self.maxQueued:
+            tracer.count("dropped inputs")
+            return
+        if not self.get_planned_board().move_to(pos):
+            return
+
+        self.moveQueue.append((pos, time.perf_counter()))
+        if not self.animator.is_running():
+            self.next_move()
+
+    def next_move(self):
+        '''PuzzleFrame.next_move() -> None
+        starts the slide of the oldest queued move'''
+        pos, queuedTime = self.moveQueue.popleft()
+        direction = self.get_direction_to_move(pos)
+        pieces = self.get_pieces_to_move(pos)
+
+        # slides get quicker as the queue backs up
+        duration = None
+        if self.catchUp.get() and self.moveQueue:
+            duration = self.animator.duration/(1 + len(self.moveQueue))
+        self.animate_move((direction, pieces), False, lambda: self.finish_queued_move(pos, direction, pieces, queuedTime), duration)
+        # the first frame is drawn by animate_move
+        self.latencies.append(time.perf_counter() - queuedTime)
+
+    def finish_queued_move(self, pos, direction, pieces, queuedTime):
+        '''PuzzleFrame.finish_queued_move(pos, direction, pieces, queuedTime) -> None
+        applies a queued move to the board and starts the next one'''
+        tracer.add_span("click to settle", "input", queuedTime, time.perf_counter())
+        self.board.move_to(pos)
+        self.record_moves()
+        for pieceToMove in pieces:
+            pieceToMove.move_by(direction)
+        self.stats.update_moves()
+        self.check_win()
+
+        if self.isWin:
+            self.moveQueue.clear()
+        elif self.moveQueue:
+            self.next_move()
+        else:
+            self.update_hint()
+
+    def clear_queue(self):
+        '''PuzzleFrame.clear_queue() -> None
+        drops the queued moves and waits for the slide in progress'''
+        self.moveQueue.clear()
+        if self.animator.is_running():
+            self.master.wait_variable(self.aWait)
+
     def get_direction_to_move(self, piece):
         '''PuzzleFrame.get_direction_to_move(piece, divideBy=20) -> tuple
         returns a tuple with the direction the piece must move'''
         direction = (0,0)
         num = 1
+        empty = self.board.get_empty()
         # get direction
-        if piece[0] < self.empty[0]:
+        if piece[0] < empty[0]:
             direction = (num, 0)
-        elif piece[0] > self.empty[0]:
+        elif piece[0] > empty[0]:
             direction = (-num, 0)
-        elif piece[1] < self.empty[1]:
+        elif piece[1] < empty[1]:
             direction = (0, num)
-        elif piece[1] > self.empty[1]:
+        elif piece[1] > empty[1]:
             direction = (0, -num)
 
         return direction
 
     def get_pieces_to_move(self, piece):
-        '''PuzzleFrame.get_direction_to_move(piece) -> list
+        '''PuzzleFrame.get_pieces_to_move(piece) -> list
         returns a list of the pieces to move'''
-        output = []
-        # loop through all pieces
-        for otherPiece in self.pieces:
-            if ((self.empty[0] < otherPiece[0] <= piece[0] or piece[0] <= otherPiece[0] < self.empty[0]) and otherPiece[1] == self.empty[1]) or \
-               ((self.empty[1] < otherPiece[1] <= piece[1] or piece[1] <= otherPiece[1] < self.empty[1]) and otherPiece[0] == self.empty[0]):
-                output.append(self.pieces[otherPiece])
-
-        return output
+        with tracer.span("get_pieces_to_move", "move"):
+            return [self.pieceList[number-1] for number in self.board.get_tiles_to_move(piece)]
 
     def toggle_button_disable(self):
         '''PuzzleFrame.toggle_button_disable() -> None
@@ -559,6 +1162,13 @@ class PuzzleFrame(Frame):
             else:
                 piece.set_clickable(setTo)
 
+    def get_customize(self):
+        '''PuzzleFrame.get_customize() -> PuzzleCustomize
+        returns the customize window, making it if needed'''
+        if self.customize == None:
+            self.customize = PuzzleCustomize(self)
+        return self.customize
+
     def toggle_customize(self):
         '''PuzzleFrame.toggle_customize() -> None
         shows or hides the customize window'''
@@ -568,262 +1178,618 @@ class PuzzleFrame(Frame):
             self.grid()
             self.customShown = False
             if not self.isWin and not self.paused:
-                self.stats.start_timer(time.time())
+                self.stats.start_timer()
 
         # if hidden
         else:
             if not self.isWin and not self.paused:
                 self.stats.stop_timer()
             self.grid_remove()
-            self.customize.grid()
+            self.get_customize().grid()
             self.customShown = True
         self.focus_set()
 
     def toggle_hints(self):
         '''PuzzleFrame.toggle_hints() -> None
         shows or hides the hints'''
-        for piece in self.pieceList:
-            piece.toggle_hints()
         self.hints = not self.hints
+        set_hints(self.pieceList, self.hints)
+
+    def toggle_next_hint(self):
+        '''PuzzleFrame.toggle_next_hint() -> None
+        shows or hides the outline on the piece to click next'''
+        self.nextHint = not self.nextHint
+        self.update_hint()
+
+    def clear_hint(self):
+        '''PuzzleFrame.clear_hint() -> None
+        removes the next move outline and stops waiting for the hinter'''
+        self.ticker.remove_job("hint")
+        self.slideCanvas.delete("nexthint")
+
+    def update_hint(self):
+        '''PuzzleFrame.update_hint() -> None
+        outlines the piece to click next, a dashed outline is a quick guess
+        shown until the hinter has solved the board'''
+        self.clear_hint()
+        if not self.nextHint or self.isWin or self.paused or self.solveThread != None:
+            return
+
+        move = self.hinter.get_move(self.board)
+        isKnown = move != None
+        if not isKnown:
+            self.hinter.request(self.board)
+            move = self.hinter.get_quick_move(self.board)
+            self.ticker.add_job("hint", 0.05, lambda now: self.update_hint())
+
+        # the piece that slides into the empty space
+        source = self.board.neighbors[self.board.get_empty_index()][move]
+        number = self.board.get_tile((source % self.board.width, source // self.board.width))
+        x, y = self.pieceList[number-1].get_corner()
+        size = self.tileSize-2
+        self.slideCanvas.create_rectangle(x+2, y+2, x+size-2, y+size-2, outline="#d94b4b" if isKnown else "#7f7f7f",
+            width=4, dash=() if isKnown else (6, 4), tags="nexthint")
         
     def toggle_pause(self):
         '''PuzzleFrame.toggle_pause() -> None
         plays or pauses the game'''
+        self.clear_queue()
         # play 
         if self.paused:
             self.slideCanvas.delete("pause")
             self.paused = False
             self.pauseButton["text"] = "Pause"
             # start up
-            self.stats.start_timer(time.time())
+            self.stats.start_timer()
             self.toggle_piece_clickable()
             self.previewButton["state"] = ACTIVE
+            self.update_hint()
         # pause
         else:
-            self.slideCanvas.create_window(298/2, 151, window=Label(text="Paused", font=("calabri",39), height=5, width=10), tags="pause")
+            self.slideCanvas.create_window(int(self.slideCanvas["width"])/2, int(self.slideCanvas["height"])/2,
+                window=Label(text="Paused", font=("calabri",39), height=5, width=10), tags="pause")
             self.paused = True
             self.pauseButton["text"] = "Play"
             # stop
             self.stats.stop_timer()
             self.toggle_piece_clickable()
             self.previewButton["state"] = DISABLED
+            self.clear_hint()
            
     def move_piece(self, piece, checkWin=True, isSolving=False):
         '''PuzzleFrame.move_piece(piece, checkWin, isSolving) -> None
         moves piece if possible
         checkWin: bool to tell code to check for win or not'''
-        if piece[0] != self.empty[0] and piece[1] != self.empty[1]:
+        if self.board.get_move_to(piece) == None:
             return
         
         # animate the move
         direction = self.get_direction_to_move(piece)
         pieces = self.get_pieces_to_move(piece)
-        self.animate_move((direction, pieces), checkWin)
-        self.master.wait_variable(self.aWait)
+        self.animate_move((direction, pieces), checkWin and not isSolving)
+        with tracer.span("wait_variable", "move"):
+            self.master.wait_variable(self.aWait)
 
-        # move all internally
+        # move all internally, moves that do not check for a win are the scramble
+        self.board.move_to(piece)
+        self.record_moves(not checkWin)
         for pieceToMove in pieces:
             pieceToMove.move_by(direction)
-            self.pieces[pieceToMove.get_pos()] = pieceToMove
-        self.empty = piece
 
         # check for win
         if checkWin and not self.isWin:
             if not isSolving:
                 self.stats.update_moves()
-            self.check_win()
+            self.check_win(isSolving)
+            if not isSolving:
+                self.update_hint()
         
-    def animate_move(self, info=None, toggle=True):
-        '''PuzzleFrame.animate_move(info, toggle) -> None
-        animates a single frame of the move'''
+    def animate_move(self, info, toggle=True, onDone=None, duration=None):
+        '''PuzzleFrame.animate_move(info, toggle=True, onDone=None, duration=None) -> None
+        starts animating the move of info (direction, pieces)
+        onDone: function called after the slide ends'''
         # set up animation attributes
-        if info != None:
-           # set up animation attributes
-           self.aDirection = info[0]
-           self.aPieces = info[1]
-           self.aCount = 0
-           self.aWait.set("yes")
-           self.aToggle = toggle
-
-           # disable all buttons that are being moved
-           if self.aToggle:
-               self.toggle_piece_clickable(False)
-
-        # move all pieces
-        for piece in self.aPieces:
-            self.slideCanvas.move("piece"+str(piece.get_number()), self.aDirection[0]/2, self.aDirection[1]/2)
-        self.aCount += 1
-
-        # end if needed
-        if self.aCount == 150:
-            # enable pieces
-            if self.aToggle:
-                self.toggle_piece_clickable(True)
-            self.aWait.set("no")
-            return
+        self.aDirection = info[0]
+        self.aPieces = info[1]
+        self.aWait.set("yes")
+        self.aToggle = toggle
+        self.clear_hint()
+
+        # disable all buttons that are being moved
+        if self.aToggle:
+            self.toggle_piece_clickable(False)
 
-        # do over again
-        self.master.after(1, self.animate_move)
+        # group the pieces so they move together
+        for piece in self.aPieces:
+            self.slideCanvas.addtag_withtag("sliding", "piece"+str(piece.get_number()))
+        self.animator.start((self.aDirection[0]*self.tileSize, self.aDirection[1]*self.tileSize),
+            lambda: self.finish_move(onDone), duration)
+
+    def finish_move(self, onDone=None):
+        '''PuzzleFrame.finish_move(onDone=None) -> None
+        ends the animation of the move'''
+        self.slideCanvas.dtag("sliding", "sliding")
+        # enable pieces
+        if self.aToggle:
+            self.toggle_piece_clickable(True)
+        self.aWait.set("no")
+        if onDone != None:
+            onDone()
 
     def shuffle(self):
         '''PuzzleFrame.shuffle() -> None
         shuffles the puzzle for amount of times'''
+        import tkinter.messagebox as msg
+        self.clear_queue()
+        mode = self.shuffleMode.get()
+        if mode == "graded" and not self.bank.load():
+            width, height = self.board.get_size()
+            msg.showinfo(message=f"There is no scramble bank for {width}x{height} boards yet.\n"
+                f"Build it with: python slide_puzzle.py bank -W {width} -H {height}")
+            return
+
+        # keep the game that is ending
+        self.autosave_replay()
+
         # reset up if win
         if self.isWin:
             self.isWin = False
-            self.pieceList.pop(-1)
-            self.slideCanvas.delete("piece16")
+            self.hide_final_piece()
             self.pauseButton["state"] = ACTIVE
-            # bind all pieces
-            for piece in self.pieces:
-                self.pieces[piece].bind("<Button-1>", self.pieces[piece].select_piece)
 
         # unpause game
         if self.paused:
-            self.toggdle_pause()
+            self.toggle_pause()
             
         self.toggle_button_disable()
         self.toggle_piece_clickable(False)
         self.stats.clear_stats()
+        self.board.clear_history()
+        self.recordedMoves = 0
         
-        indexToUse = random.randint(0,1)
-        # loop until finished
-        for i in range(self.shuffleLength.get()):
-            # get random piece info
-            indexToUse = (indexToUse + 1) % 2 # index to be using on self.empty
-            listToUse = [n for n in range(4) if n != self.empty[(indexToUse+1)%2]] # list to choose new coord from
-
-            # get random piece
-            randomPos = [0, 0]
-            randomPos[indexToUse] = self.empty[indexToUse]
-            randomPos[(indexToUse+1)%2] = random.choice(listToUse)
-
-            # move piece
-            self.move_piece(randomPos, False)
+        # every game has its own seeded randomizer
+        self.seed = new_seed() if self.nextSeed == None else self.nextSeed
+        self.nextSeed = None
+        randomizer = get_randomizer(self.seed)
+        self.master.title(f"Slide Puzzle (seed {self.seed})")
+
+        # scramble the board
+        if mode == "random":
+            self.board.randomize(randomizer)
+            self.place_pieces()
+            self.recording = PuzzleRecording(self.board)
+        elif mode == "graded":
+            self.board.set_state(self.bank.sample(self.shuffleLength.get(), randomizer).get_state())
+            self.place_pieces()
+            self.recording = PuzzleRecording(self.board)
+        elif mode == "instant":
+            self.recording = PuzzleRecording(self.board)
+            for piece in self.board.copy().shuffle(self.shuffleLength.get(), randomizer):
+                self.board.move_to(piece)
+            self.place_pieces()
+        else:
+            self.recording = PuzzleRecording(self.board)
+            for piece in self.board.copy().shuffle(self.shuffleLength.get(), randomizer):
+                self.move_piece(piece, False)
 
         if self.aWait.get() == "yes":
             self.master.wait_variable(self.aWait)
+        self.record_moves(True)
+        self.board.clear_history()
+        self.recordedMoves = 0
+        if mode == "graded":
+            self.difficulty = self.bank.get_nearest(self.shuffleLength.get())
+        else:
+            self.difficulty = get_difficulty(self.board)
+        self.scoreKey = self.get_score_key()
+        self.stats.set_key(self.scoreKey)
             
         self.toggle_button_disable()
         self.toggle_piece_clickable(True)
-        self.stats.start_timer(time.time())
+        self.stats.start_timer()
+        self.update_hint()
+
+    def toggle_tracing(self):
+        '''PuzzleFrame.toggle_tracing() -> None
+        turns the tracer and its overlay on or off to match the menu'''
+        tracer.set_enabled(self.tracing.get())
+        if self.tracing.get():
+            self.overlayLabel.grid(row=0, column=1, sticky=E)
+            self.ticker.add_job("overlay", 0.5, self.update_overlay, 0)
+        else:
+            self.overlayLabel.grid_remove()
+            self.ticker.remove_job("overlay")
+
+    def update_overlay(self, now):
+        '''PuzzleFrame.update_overlay(now) -> bool
+        shows the frame rate, dropped frames, input to first frame latency
+        and click to settle latency'''
+        settle = tracer.get_recent("click to settle")
+        latency = int(sum(settle)/len(settle)*1000) if settle else 0
+        inputLatency, worstLatency = self.get_input_latency()
+        set_text(self.overlayLabel, f"{int(self.animator.get_frame_rate())} fps  "
+            f"{tracer.get_counter('dropped frames')} dropped  input {int(inputLatency*1000)} ms "
+            f"(worst {int(worstLatency*1000)})  settle {latency} ms")
+        return True
 
-    def open_preview(self):
-        '''PuzzleFrame.open_preview() -> None
-        opens the preview window'''
-        canvas = Canvas(self, width=298, height=298, bg=self.slideCanvas["bg"])
+    def export_trace(self):
+        '''PuzzleFrame.export_trace() -> None
+        asks for a file and writes the trace to it'''
+        import tkinter.filedialog as fileopen
+        fileName = fileopen.asksaveasfilename(defaultextension=".json", filetypes=[("Chrome Trace", "*.json")])
+        if fileName:
+            tracer.export(fileName)
+
+    def get_seed(self):
+        '''PuzzleFrame.get_seed() -> int
+        returns the seed of the game, None before the first shuffle'''
+        return self.seed
+
+    def set_seed(self, seed):
+        '''PuzzleFrame.set_seed(seed) -> None
+        sets the seed of the next shuffle'''
+        self.nextSeed = seed
+
+    def ask_seed(self):
+        '''PuzzleFrame.ask_seed() -> None
+        asks for the seed of the next shuffle'''
+        import tkinter.simpledialog as ask
+        seed = ask.askinteger("Set Seed", "Seed for the next shuffle:", minvalue=0, initialvalue=self.seed)
+        if seed != None:
+            self.set_seed(seed)
+
+    def record_moves(self, isScramble=False):
+        '''PuzzleFrame.record_moves(isScramble=False) -> None
+        adds the moves made since the last call to the recording of the game'''
+        history = self.board.get_history()
+        if self.recording != None:
+            self.recording.add_moves(history[self.recordedMoves:], isScramble)
+        self.recordedMoves = len(history)
+
+    def save_replay(self):
+        '''PuzzleFrame.save_replay() -> None
+        asks for a file and saves the recording of the game in it'''
+        import tkinter.messagebox as msg
+        import tkinter.filedialog as fileopen
+        if self.recording == None or len(self.recording) == 0:
+            msg.showinfo(message="There is no game to save yet.")
+            return
 
-        # get look
-        if self.empty != (0,0):
-            look = self.pieces[0,0].get_look()
-        else:
-            look = self.pieces[0,1].get_look()
+        fileName = fileopen.asksaveasfilename(defaultextension=".sprp", filetypes=[("Slide Puzzle Replay", "*.sprp")])
+        if fileName:
+            self.recording.save(fileName)
 
-        # create pieces    
-        num = 1
-        for column in range(4):
-            for row in range(4):
-                PuzzlePiece(canvas, num, row, column, look[2], False, look[0], look[1])
-                num += 1
+    def autosave_replay(self):
+        '''PuzzleFrame.autosave_replay() -> None
+        saves the recording of the game to the replay folder once,
+        games with no moves after the scramble are not kept'''
+        if self.recording == None or self.recording is self.savedRecording:
+            return
+        self.record_moves()
+        if len(self.recording) == self.recording.get_scramble_count():
+            return
+
+        # a game that cannot be saved is only lost from the folder
+        self.savedRecording = self.recording
+        try:
+            save_to_folder(self.recording)
+        except OSError:
+            pass
+
+    def quit_game(self):
+        '''PuzzleFrame.quit_game() -> None
+        saves the game to the replay folder and closes the window'''
+        self.autosave_replay()
+        self.master.destroy()
+
+    def open_replay(self):
+        '''PuzzleFrame.open_replay() -> None
+        asks for a replay file and shows it on the puzzle'''
+        import tkinter.messagebox as msg
+        import tkinter.filedialog as fileopen
+        fileName = fileopen.askopenfilename(filetypes=[("Slide Puzzle Replay", "*.sprp")])
+        if not fileName:
+            return
+
+        try:
+            recording = load_recording(fileName)
+        except (OSError, ValueError) as error:
+            msg.showerror(message=f"Could not open the replay.\n{error}")
+            return
+        self.replayBar.open(recording)
+
+    def hide_final_piece(self):
+        '''PuzzleFrame.hide_final_piece() -> None
+        moves the last piece off the canvas to leave the empty space,
+        it keeps its look and hints for the next win'''
+        self.pieceList[-1].set_pos((-2, -2))
+
+    def show_final_piece(self):
+        '''PuzzleFrame.show_final_piece() -> None
+        moves the last piece back into the empty corner'''
+        size = self.board.get_size()
+        self.pieceList[-1].set_pos((size[0]-1, size[1]-1))
+
+    def place_pieces(self):
+        '''PuzzleFrame.place_pieces() -> None
+        puts every piece where the board has it in one pass'''
+        for index, number in enumerate(self.board.get_tiles()):
+            if number != 0:
+                self.pieceList[number-1].set_pos((index % self.board.width, index // self.board.width))
+
+    def open_preview(self):
+        '''PuzzleFrame.open_preview() -> None
+        opens the preview window, its canvas and pieces are kept
+        and only restyled or remade for a new size'''
+        look = self.pieceList[0].get_look()
+        size = self.board.get_size()
+        if self.previewCanvas == None:
+            self.previewCanvas = Canvas(self)
+        self.previewCanvas.config(width=self.slideCanvas["width"], height=self.slideCanvas["height"], bg=self.slideCanvas["bg"])
+
+        # create pieces for a new size, restyle them otherwise
+        if len(self.previewPieces) != self.board.size or self.previewPieces[0].size != size:
+            for piece in self.previewPieces:
+                piece.destroy()
+            self.previewPieces = [PuzzlePiece(self.previewCanvas, index+1, index % size[0], index // size[0],
+                look[2], False, look[0], look[1], size) for index in range(self.board.size)]
+        elif self.previewPieces[0].get_look() != look:
+            change_pieces(self.previewPieces, *look)
 
         # disable preview button
         self.previewButton["state"] = DISABLED
         self.slideCanvas.grid_remove()
-        canvas.grid(row=1, column=0, columnspan=2)
+        self.previewCanvas.grid(row=1, column=0, columnspan=2)
 
-        # remove canvas
+        # hide canvas
         wait = StringVar()
         self.master.after(2000, lambda: wait.set("go"))
         self.master.wait_variable(wait)
-        canvas.destroy()
+        self.previewCanvas.grid_remove()
         self.slideCanvas.grid()
         self.previewButton["state"] = ACTIVE
 
     def is_win(self):
         '''PuzzleFrame.is_win() -> bool
         returns if the game is won or not'''
-        if self.empty != (3,3):
-            return False
-
-        # loop and check if false
-        last = 0
-        for column in range(4):
-            for row in range(4):
-                if (row, column) == (3,3):
-                    break
-                # get if false
-                if self.pieces[row, column].get_number() - last != 1:
-                    return False
-                last = self.pieces[row, column].get_number()
-        return True
+        return self.board.is_solved()
 
-    def check_win(self):
-        '''PuzzleFrame.is_win() -> None
-        returns if the player has won or not'''
+    def check_win(self, isSolving=False):
+        '''PuzzleFrame.check_win(isSolving=False) -> None
+        returns if the player has won or not
+        isSolving: bool to tell code the solver made the moves'''
+        import tkinter.messagebox as msg
         # check for a win
         if self.is_win():
-            look = self.pieces[0,0].get_look()
-            finalPiece = PuzzlePiece(self, 16, 3, 3, look[2], bg=look[0], numColor=look[1])
-            self.pieceList.append(finalPiece)
-
-            # add hint if needed
-            if self.hints:
-                finalPiece.toggle_hints()
-
+            self.show_final_piece()
             self.pauseButton["state"] = DISABLED
             self.stats.stop_timer()
 
             # get best
             bests = "\n"
-            if self.shuffleLength.get() >= 25:
+            # the key is the one the game was shuffled with, settings changed since do not count
+            if not isSolving:
+                self.stats.set_key(self.scoreKey)
                 bests = self.stats.update_best()
-            
-            msg.showinfo(message="Congratulations! You won!"+bests)
+
+            self.autosave_replay()
+            if not isSolving:
+                msg.showinfo(message="Congratulations! You won!"+bests)
             self.isWin = True
-            
-            # unbind all
-            for piece in self.pieces:
-                self.pieces[piece].unbind("<Button-1>")
 
     def complete_restart(self):
         '''PuzzleFrame.complete_restart() -> None
-        clears the entire puzzle settings'''
+        clears the entire puzzle settings, the widgets and pieces are kept'''
         if self.hints:
             self.optionBar.invoke(3)
         if self.stats.is_best_shown():
             self.optionBar.invoke(4)
-        self.customize.destroy()
-        self.destroy()
-        PuzzleFrame.__init__(self, self.master)
+        if self.nextHint:
+            self.optionBar.invoke(5)
+
+        # settings back to their starting values
+        self.shuffleLength.set(30)
+        self.shuffleMode.set("animated")
+        self.catchUp.set(True)
+        self.solveBudget.set(15)
+        self.seed = None
+        self.nextSeed = None
+        self.master.title("Slide Puzzle")
+        self.slideCanvas["bg"] = "#ecd9a9"
+        self.set_board_size((4, 4), ("#46bf79", "#ecd9a9", self.image))
+        if self.customize != None:
+            self.customize.reset()
 
     def solve(self):
         '''PuzzleFrame.solve() -> None
-        solves the puzzle'''
-        look = self.pieceList[0].get_look()
-        self.slideCanvas.delete("all")
+        starts solving the puzzle in a worker thread, the solve button cancels it'''
+        if self.isWin or self.solveThread != None:
+            return
+        self.clear_queue()
 
-        # reset attributes
-        self.isWin = True
+        # unpause game
+        if self.paused:
+            self.toggle_pause()
+
+        self.toggle_button_disable()
+        self.toggle_piece_clickable(False)
+        self.clear_hint()
+        self.solveButton.config(text="Cancel", command=self.cancel_solve, state=ACTIVE)
+        self.solveLabel["text"] = "Searching..."
+        if hasattr(self.solver, "get_fallback_note") and self.solver.get_fallback_note():
+            self.solveLabel["text"] = "Searching without the pattern database..."
+        self.solveLabel.grid(row=2, column=0, columnspan=2)
+
+        # the worker only talks to the window through the queue
+        self.solveQueue = queue.Queue()
+        self.solveCancel = threading.Event()
+        self.solveThread = threading.Thread(target=self.run_solver,
+            args=(self.board.copy(), self.solveBudget.get(), self.solveQueue, self.solveCancel), daemon=True)
+        self.solveThread.start()
+        self.ticker.add_job("solver", 0.05, self.poll_solver)
+
+    def run_solver(self, board, maxSeconds, messages, cancel):
+        '''PuzzleFrame.run_solver(board, maxSeconds, messages, cancel) -> None
+        solves board in the worker thread and puts the result in messages'''
+        try:
+            with tracer.span("solve", "solver"):
+                moves, isOptimal = solve_in_budget(self.solver, board, maxSeconds,
+                    progress=lambda info: messages.put(("progress", info)), cancel=cancel)
+            messages.put(("done", (moves, isOptimal)))
+        except SolverStopped as stopped:
+            if stopped.reason == "budget":
+                messages.put(("error", "No solution was found in the budget, this board is too big to solve quickly."))
+            else:
+                messages.put(("cancelled", None))
+        except Exception as error:
+            messages.put(("error", str(error)))
+
+    def poll_solver(self, now):
+        '''PuzzleFrame.poll_solver(now) -> bool
+        handles the messages from the worker thread, returns False once it is done'''
+        import tkinter.messagebox as msg
+        while True:
+            try:
+                kind, info = self.solveQueue.get_nowait()
+            except queue.Empty:
+                return True
+
+            if kind == "progress":
+                set_text(self.solveLabel, f"Searching depth {info['bound']}, {info['nodes']} nodes, best estimate {info['best']}")
+            else:
+                break
+
+        self.end_solve()
+        if kind == "done":
+            self.play_solution(*info)
+        elif kind == "error":
+            msg.showerror(message=info)
+        else:
+            self.update_hint()
+        return False
+
+    def cancel_solve(self):
+        '''PuzzleFrame.cancel_solve() -> None
+        asks the worker thread to stop'''
+        if self.solveCancel != None:
+            self.solveCancel.set()
+            self.solveButton["state"] = DISABLED
+            self.solveLabel["text"] = "Cancelling..."
+
+    def end_solve(self):
+        '''PuzzleFrame.end_solve() -> None
+        puts the buttons and pieces back after the worker thread is done'''
+        self.solveThread = None
+        self.solveQueue = None
+        self.solveCancel = None
+        self.solveLabel.grid_remove()
+        self.solveButton.config(text="Solve", command=self.solve, state=DISABLED)
+        self.toggle_button_disable()
+        self.toggle_piece_clickable(True)
+
+    def play_solution(self, moves, isOptimal):
+        '''PuzzleFrame.play_solution(moves, isOptimal) -> None
+        plays the moves found by the solver'''
+        import tkinter.messagebox as msg
+        self.toggle_button_disable()
+        self.toggle_piece_clickable(False)
         self.stats.clear_stats()
-        self.pieceList.clear()
-        self.pieces = {}
-        self.pauseButton["state"] = DISABLED
-        
-        # create pieces
-        num = 1
-        for column in range(4):
-            for row in range(4):
-                newPiece = PuzzlePiece(self, num, row, column, look[2], False, look[0], look[1])
-                self.pieceList.append(newPiece)
-                self.pieces[row, column] = newPiece
-                num += 1
 
-                # deal with hints
-                if self.hints:
-                    newPiece.toggle_hints()
-        self.empty = (3,3)
+        # play the solution
+        for piece in get_click_path(self.board, moves):
+            self.move_piece(piece, True, True)
+        self.board.clear_history()
+        self.recordedMoves = 0
+
+        self.toggle_button_disable()
+        self.pauseButton["state"] = DISABLED
+        kind = "" if isOptimal else "\nThe budget ran out, so this may not be the shortest solution."
+        note = self.solver.get_fallback_note() if hasattr(self.solver, "get_fallback_note") else ""
+        msg.showinfo(message=f"Solved in {len(moves)} moves.{kind}\n{self.solver.get_report()}" + (f"\n\n{note}" if note else ""))
         
-root = Tk()
-root.title("Slide Puzzle")
-PuzzleFrame(root)
-mainloop()
+def main(args=None):
+    '''main(args=None) -> None
+    plays the game or runs a command line mode'''
+    parser = argparse.ArgumentParser(description="Slide Puzzle")
+    commands = parser.add_subparsers(dest="command")
+    parser.set_defaults(seed=None, trace=None)
+    playParser = commands.add_parser("play", help="play the game (default)")
+    playParser.add_argument("-s", "--seed", type=int, default=None, help="seed of the first game")
+    playParser.add_argument("-t", "--trace", default=None, help="turn on instrumentation and write a Chrome trace here on exit")
+    startupParser = commands.add_parser("startup", help="time how long the game takes to show its first frame")
+    startupParser.add_argument("-b", "--budget", type=float, default=500, help="milliseconds allowed, exits with 1 if slower")
+
+    # batch solving
+    solveParser = commands.add_parser("solve", help="solve boards from a JSONL or text file")
+    solveParser.add_argument("boards", help="file of boards, - for stdin")
+    solveParser.add_argument("-o", "--output", default="-", help="file for the JSON line results, - for stdout")
+    solveParser.add_argument("-W", "--width", type=int, default=4, help="board width")
+    solveParser.add_argument("-H", "--height", type=int, default=4, help="board height")
+    solveParser.add_argument("-j", "--processes", type=int, default=None, help="number of worker processes")
+
+    # pattern database building
+    commands.add_parser("patterns", help="build the 4x4 pattern database for fast optimal solves")
+
+    # scramble bank building
+    bankParser = commands.add_parser("bank", help="build the bank of boards graded by optimal moves")
+    bankParser.add_argument("-W", "--width", type=int, default=4, help="board width")
+    bankParser.add_argument("-H", "--height", type=int, default=4, help="board height")
+    bankParser.add_argument("-n", "--boards", type=int, default=2000, help="number of boards to solve")
+    bankParser.add_argument("-d", "--per-distance", type=int, default=500, help="most boards kept at each distance")
+    bankParser.add_argument("-j", "--processes", type=int, default=None, help="number of worker processes")
+    bankParser.add_argument("-s", "--search", action="store_true", help="search every board from the goal instead, needs numpy")
+    bankParser.add_argument("-m", "--max-depth", type=int, default=None, help="deepest distance to search, needed above 3x3, the whole board if not given")
+    bankParser.add_argument("--seed", type=int, default=None, help="seed of the boards")
+
+    # scramble generating
+    generateParser = commands.add_parser("generate", help="write random scrambles as JSON lines")
+    generateParser.add_argument("count", type=int, help="number of boards")
+    generateParser.add_argument("-W", "--width", type=int, default=4, help="board width")
+    generateParser.add_argument("-H", "--height", type=int, default=4, help="board height")
+    generateParser.add_argument("-l", "--length", type=int, default=80, help="moves in each random walk")
+    generateParser.add_argument("-o", "--output", default="-", help="file for the boards, - for stdout")
+    generateParser.add_argument("-s", "--seed", type=int, default=None, help="seed of the walks")
+    args = parser.parse_args(args)
+
+    if args.command == "solve":
+        inFile = sys.stdin if args.boards == "-" else open(args.boards, "r")
+        outFile = sys.stdout if args.output == "-" else open(args.output, "w")
+        solve_boards(inFile, outFile, args.processes, width=args.width, height=args.height)
+    elif args.command == "patterns":
+        database = PuzzlePatternDatabase()
+        database.build(lambda number, cost, states: print(f"pattern {number+1}: cost {cost}, {states} states"))
+        print("tables are built in", database.fileName)
+    elif args.command == "bank":
+        if args.search and args.max_depth == None and args.width*args.height > 9:
+            bankParser.error("--search on a board bigger than 3x3 needs --max-depth, "
+                "the whole board does not fit in memory")
+        bank = PuzzleScrambleBank(args.width, args.height)
+        if args.search:
+            bank.build_from_search(args.max_depth, args.per_distance, seed=args.seed)
+        else:
+            bank.build(args.boards, args.per_distance, args.processes, seed=args.seed)
+    elif args.command == "startup":
+        # first frame is shown once the pending draws are done
+        root = Tk()
+        root.title("Slide Puzzle")
+        PuzzleFrame(root)
+        root.update()
+        seconds = time.perf_counter() - loadTime
+        root.destroy()
+        print(f"first interactive frame in {int(seconds*10000)/10} ms (budget {args.budget} ms)")
+        if seconds*1000 > args.budget:
+            sys.exit(1)
+    elif args.command == "generate":
+        outFile = sys.stdout if args.output == "-" else open(args.output, "w")
+        generate_boards(outFile, args.count, args.length, args.width, args.height, args.seed)
+    else:
+        root = Tk()
+        root.title("Slide Puzzle")
+        tracer.set_enabled(args.trace != None)
+        PuzzleFrame(root, seed=args.seed)
+        mainloop()
+        if args.trace != None:
+            tracer.export(args.trace)
+
+if __name__ == "__main__":
+    main()
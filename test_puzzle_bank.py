@@ -0,0 +1,83 @@
+# Slide Puzzle Scramble Bank Tests
+# Auther: G.G.Otto
+# Version: 1.3
+
+import os.path as path
+import random
+import tempfile
+import unittest
+from puzzle_bank import PuzzleScrambleBank
+from puzzle_batch import get_worker_solver
+from puzzle_board import PuzzleBoard
+from puzzle_solver import get_solver
+
+class PuzzleScrambleBankTest(unittest.TestCase):
+    '''tests of saving, loading and building banks'''
+
+    def test_round_trip(self):
+        '''saved buckets load back and every sample comes from its bucket'''
+        board = PuzzleBoard(4, 4)
+        buckets = [[board.get_state()], [], []]
+        for move in board.get_moves():
+            child = board.copy()
+            child.slide(move)
+            buckets[1].append(child.get_state())
+        buckets[2].append(12345678901234567890)
+
+        with tempfile.TemporaryDirectory() as folder:
+            bank = PuzzleScrambleBank(4, 4, path.join(folder, "bank.db"))
+            bank.save(buckets)
+            self.assertTrue(bank.load())
+            self.assertEqual(bank.get_distances(), [0, 1, 2])
+            self.assertEqual(bank.get_count(1), 2)
+            self.assertEqual(bank.get_nearest(9), 2)
+
+            randomizer = random.Random(9)
+            for distance, bucket in enumerate(buckets):
+                for i in range(10):
+                    self.assertIn(bank.sample(distance, randomizer).get_state(), bucket)
+            bank.close()
+
+            # the wrong size or a damaged file is not loaded
+            self.assertFalse(PuzzleScrambleBank(3, 3, bank.fileName).load())
+            with open(bank.fileName, "r+b") as file:
+                file.seek(-1, 2)
+                last = file.read(1)
+                file.seek(-1, 2)
+                file.write(bytes([last[0] ^ 1]))
+            self.assertFalse(bank.load())
+
+    def test_missing(self):
+        '''a missing bank has no boards'''
+        with tempfile.TemporaryDirectory() as folder:
+            bank = PuzzleScrambleBank(4, 4, path.join(folder, "bank.db"))
+            self.assertFalse(bank.load())
+            self.assertEqual(bank.get_distances(), [])
+            with self.assertRaises(ValueError):
+                bank.sample(10)
+
+    def test_worker_tables(self):
+        '''worker solvers have their tables loaded before the pool forks'''
+        self.assertIsNotNone(get_worker_solver(3, 3).table)
+        self.assertIs(get_worker_solver(3, 3), get_worker_solver(3, 3))
+
+    def test_build(self):
+        '''built banks are exact and the same seed builds the same file'''
+        table = get_solver(3, 3)
+        with tempfile.TemporaryDirectory() as folder:
+            data = []
+            for name in ("first.db", "second.db"):
+                bank = PuzzleScrambleBank(3, 3, path.join(folder, name))
+                bank.build(60, 4, 2, None, seed=10)
+                with open(bank.fileName, "rb") as file:
+                    data.append(file.read())
+            self.assertEqual(data[0], data[1])
+
+            self.assertTrue(bank.load())
+            for distance in bank.get_distances():
+                self.assertLessEqual(bank.get_count(distance), 4)
+                self.assertEqual(table.get_distance(bank.sample(distance)), distance)
+            bank.close()
+
+if __name__ == "__main__":
+    unittest.main()
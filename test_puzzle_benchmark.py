@@ -0,0 +1,28 @@
+# Slide Puzzle Benchmark Tests
+# Auther: G.G.Otto
+# Version: 1.3
+
+import unittest
+from puzzle_benchmark import compare
+
+class CompareTest(unittest.TestCase):
+    '''tests of comparing results with a baseline'''
+
+    def test_direction(self):
+        '''rates and frames per slide are better higher, times are better lower'''
+        baseline = {"metrics": {"movesPerSecond": 100, "stubFramesPerSlide": 12, "startupSeconds": 1}}
+        worse = {"metrics": {"movesPerSecond": 50, "stubFramesPerSlide": 6, "startupSeconds": 2}}
+        better = {"metrics": {"movesPerSecond": 200, "stubFramesPerSlide": 24, "startupSeconds": 0.5}}
+        self.assertEqual(len(compare(worse, baseline)), 3)
+        self.assertEqual(compare(better, baseline), [])
+        self.assertEqual(compare({"metrics": {"movesPerSecond": 90}}, baseline), [])
+
+    def test_heuristics(self):
+        '''a solver that changed heuristic is reported'''
+        baseline = {"metrics": {}, "heuristics": {"solver4x4": "patterns"}}
+        results = {"metrics": {}, "heuristics": {"solver4x4": "conflicts"}}
+        self.assertEqual(len(compare(results, baseline)), 1)
+        self.assertEqual(compare(baseline, baseline), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+# Slide Puzzle Board Tests
+# Auther: G.G.Otto
+# Version: 1.3
+
+import random
+import unittest
+from puzzle_board import PuzzleBoard, UP, DOWN, LEFT, RIGHT
+
+class PuzzleBoardTest(unittest.TestCase):
+    '''tests of the board engine'''
+
+    def test_goal(self):
+        '''the goal has the tiles in order and the empty space last'''
+        board = PuzzleBoard(4, 4)
+        self.assertEqual(board.get_tiles(), list(range(1, 16)) + [0])
+        self.assertEqual(board.get_empty(), (3, 3))
+        self.assertTrue(board.is_solved())
+
+    def test_pack(self):
+        '''packing and unpacking give back the tiles'''
+        for size in ((3, 3), (4, 4), (5, 5), (8, 8)):
+            board = PuzzleBoard(*size)
+            tiles = list(range(board.size))
+            random.Random(1).shuffle(tiles)
+            self.assertEqual(board.unpack(board.pack(tiles)), tiles)
+        self.assertEqual(PuzzleBoard(5, 5).bits, 5)
+
+    def test_set_tiles(self):
+        '''tiles that do not use every number are refused'''
+        board = PuzzleBoard(3, 3)
+        with self.assertRaises(ValueError):
+            board.set_tiles([1, 1, 2, 3, 4, 5, 6, 7, 0])
+        with self.assertRaises(ValueError):
+            PuzzleBoard(1, 4)
+
+    def test_slide(self):
+        '''slides move the tile next to the empty space into it'''
+        board = PuzzleBoard(4, 4)
+        self.assertFalse(board.slide(UP))
+        self.assertFalse(board.slide(LEFT))
+        self.assertTrue(board.slide(DOWN))
+        self.assertEqual(board.get_empty(), (3, 2))
+        self.assertEqual(board.get_tile((3, 3)), 12)
+        self.assertTrue(board.slide(RIGHT))
+        self.assertEqual(board.get_empty(), (2, 2))
+        self.assertEqual(board.get_tile((3, 2)), 11)
+        self.assertEqual(board.get_history(), [DOWN, RIGHT])
+
+    def test_undo(self):
+        '''undoing every move of a random walk gets back to the goal'''
+        randomizer = random.Random(2)
+        board = PuzzleBoard(4, 4)
+        states = []
+        for i in range(200):
+            states.append(board.get_state())
+            while not board.slide(randomizer.randrange(4)):
+                pass
+        for state in reversed(states):
+            board.undo()
+            self.assertEqual(board.get_state(), state)
+        self.assertEqual(board.get_history(), [])
+        self.assertEqual(board.undo(), None)
+
+    def test_tiles_to_move(self):
+        '''a click in line with the empty space moves every tile between them'''
+        board = PuzzleBoard(4, 4)
+        self.assertEqual(board.get_tiles_to_move((0, 3)), [15, 14, 13])
+        self.assertEqual(board.get_tiles_to_move((3, 0)), [12, 8, 4])
+        self.assertEqual(board.get_tiles_to_move((1, 1)), [])
+        self.assertEqual(board.get_tiles_to_move((3, 3)), [])
+
+        self.assertEqual(board.move_to((0, 3)), [15, 14, 13])
+        self.assertEqual(board.get_tiles()[12:], [0, 13, 14, 15])
+        self.assertEqual(board.get_history(), [RIGHT, RIGHT, RIGHT])
+
+    def test_solvable_odd_width(self):
+        '''on odd widths swapping two tiles makes a board unsolvable'''
+        board = PuzzleBoard(3, 3)
+        self.assertTrue(board.is_solvable())
+        board.set_tiles([2, 1, 3, 4, 5, 6, 7, 8, 0])
+        self.assertFalse(board.is_solvable())
+        board.set_tiles([1, 2, 3, 4, 5, 6, 0, 7, 8])
+        self.assertTrue(board.is_solvable())
+
+    def test_solvable_even_width(self):
+        '''on even widths the row of the empty space counts too'''
+        board = PuzzleBoard(4, 4)
+        board.set_tiles(list(range(1, 14)) + [15, 14, 0])
+        self.assertFalse(board.is_solvable())
+
+        # moving the empty space up a row keeps it solvable
+        board.reset()
+        board.slide(DOWN)
+        self.assertTrue(board.is_solvable())
+        self.assertEqual(board.get_tiles(), list(range(1, 12)) + [0, 13, 14, 15, 12])
+        board.set_tiles(list(range(1, 12)) + [0, 14, 13, 15, 12])
+        self.assertFalse(board.is_solvable())
+
+    def test_shuffled_boards_are_solvable(self):
+        '''walks and random boards of every shape can be solved'''
+        randomizer = random.Random(3)
+        for size in ((3, 3), (4, 4), (3, 4), (4, 3), (5, 2), (2, 5), (6, 6)):
+            board = PuzzleBoard(*size)
+            for i in range(20):
+                board.shuffle(30, randomizer)
+                self.assertTrue(board.is_solvable())
+                board.randomize(randomizer)
+                self.assertTrue(board.is_solvable())
+                self.assertEqual(sorted(board.get_tiles()), list(range(board.size)))
+
+    def test_non_square(self):
+        '''boards that are not square use width for rows and height for columns'''
+        board = PuzzleBoard(5, 3)
+        self.assertEqual(board.get_size(), (5, 3))
+        self.assertEqual(board.get_empty(), (4, 2))
+        self.assertEqual(board.get_tile((0, 1)), 6)
+        self.assertEqual(board.get_tiles_to_move((4, 0)), [10, 5])
+        self.assertEqual(board.get_tiles_to_move((0, 2)), [14, 13, 12, 11])
+        self.assertEqual(sorted(board.get_moves()), [DOWN, RIGHT])
+
+        tall = PuzzleBoard(2, 4)
+        tall.move_to((1, 0))
+        self.assertEqual(tall.get_tiles(), [1, 0, 3, 2, 5, 4, 7, 6])
+        self.assertEqual(tall.get_empty(), (1, 0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+# Slide Puzzle Frontier Tests
+# Auther: G.G.Otto
+# Version: 1.3
+
+import random
+import unittest
+from puzzle_board import PuzzleBoard
+from puzzle_frontier import PuzzleBatcher, has_numpy
+from puzzle_solver import PuzzleSolver, get_solver
+
+@unittest.skipUnless(has_numpy(), "the batch tools need numpy")
+class PuzzleBatcherTest(unittest.TestCase):
+    '''tests of the batches against the board engine and the solvers'''
+
+    def get_states(self, width, height, count, seed):
+        '''PuzzleBatcherTest.get_states(width, height, count, seed) -> list
+        returns the packed states of random boards'''
+        randomizer = random.Random(seed)
+        board = PuzzleBoard(width, height)
+        states = []
+        for i in range(count):
+            board.randomize(randomizer)
+            states.append(board.get_state())
+        return states
+
+    def test_keys(self):
+        '''boards unpack and pack back to the same states'''
+        batcher = PuzzleBatcher(4, 4)
+        states = self.get_states(4, 4, 50, 14)
+        batch = batcher.from_states(states)
+        self.assertEqual(batch[0].tolist(), PuzzleBoard(4, 4, states[0]).get_tiles())
+        self.assertEqual(batcher.get_keys(batch).tolist(), states)
+
+    def test_expand(self):
+        '''every child is the board after that move'''
+        for size in ((4, 4), (3, 3), (4, 3)):
+            batcher = PuzzleBatcher(*size)
+            states = self.get_states(*size, 30, 15)
+            children, parents, moves = batcher.expand(batcher.from_states(states))
+            keys = batcher.get_keys(children).tolist()
+
+            expected = []
+            for state in states:
+                board = PuzzleBoard(*size, state)
+                for move in range(4):
+                    child = board.copy()
+                    if child.slide(move):
+                        expected.append((state, move, child.get_state()))
+            self.assertEqual(sorted((states[parent], move, key) for parent, move, key in zip(parents.tolist(), moves.tolist(), keys)),
+                sorted(expected))
+
+    def test_heuristic(self):
+        '''the batch heuristic is the estimate of the solver'''
+        for size in ((4, 4), (3, 3), (4, 3), (2, 5)):
+            batcher = PuzzleBatcher(*size)
+            solver = PuzzleSolver(*size)
+            states = self.get_states(*size, 100, 16)
+            estimates = batcher.get_heuristic(batcher.from_states(states)).tolist()
+            self.assertEqual(estimates, [solver.get_heuristic(PuzzleBoard(*size, state).get_tiles()) for state in states])
+
+    def test_search_3x3(self):
+        '''a full 3x3 search finds every board at the distance in the table'''
+        batcher = PuzzleBatcher(3, 3)
+        table = get_solver(3, 3)
+        randomizer = random.Random(17)
+        total = 0
+        for depth, keys in batcher.search():
+            total += len(keys)
+            for index in randomizer.sample(range(len(keys)), min(20, len(keys))):
+                self.assertEqual(table.get_distance(PuzzleBoard(3, 3, int(keys[index]))), depth)
+        self.assertEqual(total, 181440)
+        self.assertEqual(depth, 31)
+
+    def test_max_depth(self):
+        '''a search stops at maxDepth'''
+        layers = [len(keys) for depth, keys in PuzzleBatcher(4, 4).search(maxDepth=3)]
+        self.assertEqual(layers, [1, 2, 4, 10])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+# Slide Puzzle Hint Tests
+# Auther: G.G.Otto
+# Version: 1.3
+
+import random
+import time
+import unittest
+from puzzle_board import PuzzleBoard
+from puzzle_hints import PuzzleHinter
+
+class PuzzleHinterTest(unittest.TestCase):
+    '''tests of the hinter and its worker thread'''
+
+    def setUp(self):
+        '''makes a 3x3 hinter'''
+        self.hinter = PuzzleHinter(3, 3)
+        self.board = PuzzleBoard(3, 3)
+        self.board.shuffle(20, random.Random(13))
+
+    def tearDown(self):
+        '''stops the worker'''
+        self.hinter.close()
+
+    def wait_for_worker(self):
+        '''waits until the worker has handled every request'''
+        for i in range(200):
+            if self.hinter.pending == None and self.hinter.requests.empty():
+                return
+            time.sleep(0.01)
+        self.fail("the worker did not finish")
+
+    def test_solution(self):
+        '''the moves of a solved request lead to the goal'''
+        self.hinter.request(self.board)
+        self.wait_for_worker()
+        board = self.board.copy()
+        while not board.is_solved():
+            self.assertTrue(board.slide(self.hinter.get_move(board)))
+
+    def test_failed_solve(self):
+        '''a state whose solve failed is asked for again'''
+        calls = []
+        def fail(board):
+            calls.append(board.get_state())
+            raise RuntimeError("solve failed")
+        self.hinter.solver.solve = fail
+        for i in range(2):
+            self.hinter.request(self.board)
+            self.wait_for_worker()
+        self.assertEqual(calls, [self.board.get_state()]*2)
+        self.assertEqual(self.hinter.get_move(self.board), None)
+        self.assertNotEqual(self.hinter.get_quick_move(self.board), None)
+
+if __name__ == "__main__":
+    unittest.main()
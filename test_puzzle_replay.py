@@ -0,0 +1,76 @@
+# Slide Puzzle Replay Tests
+# Auther: G.G.Otto
+# Version: 1.3
+
+import os
+import os.path as path
+import random
+import tempfile
+import unittest
+from puzzle_board import PuzzleBoard
+from puzzle_replay import PuzzleRecording, load_recording, save_to_folder
+
+def make_recording(moves=300, interval=16):
+    '''make_recording(moves=300, interval=16) -> PuzzleRecording
+    returns a recording of a scramble and a random walk on a 4x4 board'''
+    randomizer = random.Random(8)
+    board = PuzzleBoard(4, 4)
+    recording = PuzzleRecording(board, interval)
+    for i in range(moves):
+        while not board.slide(randomizer.randrange(4)):
+            pass
+        if i == 20:
+            recording.add_moves(board.get_history(), True)
+            board.clear_history()
+    recording.add_moves(board.get_history())
+    return recording
+
+class PuzzleReplayTest(unittest.TestCase):
+    '''tests of saving and loading recordings'''
+
+    def test_round_trip(self):
+        '''a saved recording loads with the same moves, times and boards'''
+        recording = make_recording()
+        with tempfile.TemporaryDirectory() as folder:
+            fileName = path.join(folder, "game.sprp")
+            recording.save(fileName)
+            loaded = load_recording(fileName)
+
+        self.assertEqual(len(loaded), 300)
+        self.assertEqual(loaded.get_size(), (4, 4))
+        self.assertEqual(loaded.get_scramble_count(), 21)
+        for index in range(len(recording)):
+            self.assertEqual(loaded.get_move(index), recording.get_move(index))
+            self.assertEqual(loaded.get_time(index), recording.get_time(index))
+        for index in (0, 15, 16, 17, 150, 300):
+            self.assertEqual(loaded.get_board(index).get_state(), recording.get_board(index).get_state())
+
+    def test_damaged(self):
+        '''changed or cut files are refused'''
+        with tempfile.TemporaryDirectory() as folder:
+            fileName = path.join(folder, "game.sprp")
+            make_recording().save(fileName)
+            with open(fileName, "rb") as file:
+                data = bytearray(file.read())
+
+            data[20] ^= 1
+            with open(fileName, "wb") as file:
+                file.write(data)
+            with self.assertRaises(ValueError):
+                load_recording(fileName)
+
+            with open(fileName, "wb") as file:
+                file.write(data[:10])
+            with self.assertRaises(ValueError):
+                load_recording(fileName)
+
+    def test_folder(self):
+        '''games saved to the folder keep only the newest'''
+        recording = make_recording(40)
+        with tempfile.TemporaryDirectory() as folder:
+            names = [save_to_folder(recording, folder, 3) for i in range(5)]
+            self.assertEqual(sorted(os.listdir(folder)), sorted(path.basename(name) for name in names[2:]))
+            self.assertEqual(len(load_recording(names[-1])), 40)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+# Slide Puzzle Score Tests
+# Auther: G.G.Otto
+# Version: 1.3
+
+import os.path as path
+import tempfile
+import unittest
+from puzzle_board import PuzzleBoard
+from puzzle_scores import PuzzleScoreStore, get_difficulty
+from puzzle_solver import get_solver
+
+class PuzzleScoreStoreTest(unittest.TestCase):
+    '''tests of the score store in a temporary file'''
+
+    def setUp(self):
+        '''makes an empty store'''
+        self.folder = tempfile.TemporaryDirectory()
+        self.store = PuzzleScoreStore(path.join(self.folder.name, "scores.db"))
+        self.key = (4, 4, 30, 2, "")
+
+    def tearDown(self):
+        '''closes and removes the store'''
+        self.store.close()
+        self.folder.cleanup()
+
+    def test_empty(self):
+        '''a key with no scores has no bests'''
+        self.assertEqual(self.store.get_best(self.key), (None, None))
+        self.assertEqual(self.store.get_top(self.key), [])
+        self.assertEqual(self.store.get_percentile(self.key, 10), 100)
+
+    def test_best_and_top(self):
+        '''bests and top lists only read the scores of the key'''
+        for moves, seconds in ((40, 30.5), (25, 60), (60, 12)):
+            self.store.add_score(self.key, moves, seconds)
+        self.store.add_score((4, 4, 30, 3, ""), 5, 1)
+        self.store.add_score((3, 3, 30, 2, ""), 5, 1)
+
+        self.assertEqual(self.store.get_best(self.key), (25, 12))
+        self.assertEqual(self.store.get_top(self.key, 2), [(60, 12), (40, 30.5)])
+        self.assertEqual(self.store.get_top(self.key, by="moves"), [(25, 60), (40, 30.5), (60, 12)])
+        with self.assertRaises(ValueError):
+            self.store.get_top(self.key, by="played")
+
+        # no difficulty matches every difficulty
+        self.assertEqual(self.store.get_best((4, 4, 30, None, "")), (5, 1))
+
+    def test_percentile(self):
+        '''the percentile counts the stored games worse than a value'''
+        for seconds in (10, 20, 30, 40):
+            self.store.add_score(self.key, 50, seconds)
+        self.assertEqual(self.store.get_percentile(self.key, 25), 50)
+
+        # once the game is stored it counts against itself
+        self.store.add_score(self.key, 50, 25)
+        self.assertEqual(self.store.get_percentile(self.key, 25), 40)
+        self.assertEqual(self.store.get_percentile(self.key, 45, "moves"), 100)
+
+    def test_reopen(self):
+        '''scores are kept in the file'''
+        self.store.add_score(self.key, 33, 44)
+        self.store.close()
+        self.assertEqual(PuzzleScoreStore(self.store.fileName).get_best(self.key), (33, 44))
+
+class DifficultyTest(unittest.TestCase):
+    '''tests of the difficulty grades'''
+
+    def test_difficulty(self):
+        '''3x3 boards are graded by their optimal moves, others by manhattan distance'''
+        board = PuzzleBoard(3, 3)
+        self.assertEqual(get_difficulty(board), 0)
+        board.set_tiles([8, 6, 7, 2, 5, 4, 3, 0, 1])
+        self.assertEqual(get_solver(3, 3).get_distance(board), 31)
+        self.assertEqual(get_difficulty(board), 3)
+
+        board = PuzzleBoard(4, 4)
+        board.set_tiles([0] + list(range(1, 16)))
+        self.assertEqual(get_difficulty(board), 2)
+
+if __name__ == "__main__":
+    unittest.main()
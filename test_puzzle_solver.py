@@ -0,0 +1,114 @@
+# Slide Puzzle Solver Tests
+# Auther: G.G.Otto
+# Version: 1.3
+
+import os
+import os.path as path
+import random
+import tempfile
+import unittest
+from puzzle_board import PuzzleBoard
+from puzzle_hints import PuzzleHinter
+from puzzle_solver import PuzzleSolver, SolverStopped, get_solver, solve_in_budget
+from puzzle_tables import PuzzleEightTable
+
+def play(board, moves):
+    '''play(board, moves) -> PuzzleBoard
+    returns a copy of board with the moves played'''
+    board = board.copy()
+    for move in moves:
+        if not board.slide(move):
+            raise ValueError("move cannot be played")
+    return board
+
+class PuzzleSolverTest(unittest.TestCase):
+    '''tests of the solvers against the exact 3x3 table'''
+
+    def test_optimal_3x3(self):
+        '''the IDA* solver finds solutions as short as the table says'''
+        randomizer = random.Random(4)
+        table = get_solver(3, 3)
+        solver = PuzzleSolver(3, 3)
+        board = PuzzleBoard(3, 3)
+        for i in range(40):
+            board.randomize(randomizer)
+            moves = solver.solve(board)
+            self.assertTrue(play(board, moves).is_solved())
+            self.assertEqual(len(moves), table.get_distance(board))
+
+            tableMoves = table.solve(board)
+            self.assertTrue(play(board, tableMoves).is_solved())
+            self.assertEqual(len(tableMoves), len(moves))
+
+    def test_fast_3x3(self):
+        '''quick solutions solve the board and are never shorter than optimal'''
+        randomizer = random.Random(5)
+        table = get_solver(3, 3)
+        solver = PuzzleSolver(3, 3)
+        board = PuzzleBoard(3, 3)
+        for i in range(40):
+            board.randomize(randomizer)
+            moves = solver.solve_fast(board)
+            self.assertTrue(play(board, moves).is_solved())
+            self.assertGreaterEqual(len(moves), table.get_distance(board))
+
+    def test_fast_node_cap(self):
+        '''quick solves stop at their node cap instead of growing'''
+        board = PuzzleBoard(8, 8)
+        board.randomize(random.Random(11))
+        with self.assertRaises(SolverStopped) as stopped:
+            PuzzleSolver(8, 8).solve_fast(board, maxNodes=4096)
+        self.assertEqual(stopped.exception.reason, "budget")
+
+    def test_budget_fallback(self):
+        '''a solve out of budget falls back to a quick solution'''
+        board = PuzzleBoard(4, 4)
+        board.randomize(random.Random(12))
+        moves, isOptimal = solve_in_budget(PuzzleSolver(4, 4), board, maxNodes=4096)
+        self.assertFalse(isOptimal)
+        self.assertTrue(play(board, moves).is_solved())
+
+    def test_walks_4x4(self):
+        '''short 4x4 walks are solved in no more moves than the walk'''
+        randomizer = random.Random(6)
+        solver = get_solver(4, 4)
+        board = PuzzleBoard(4, 4)
+        for i in range(10):
+            board.reset()
+            for j in range(16):
+                board.slide(randomizer.choice(board.get_moves()))
+            moves = solver.solve(board)
+            self.assertTrue(play(board, moves).is_solved())
+            self.assertLessEqual(len(moves), 16)
+
+    def test_unsolvable(self):
+        '''boards that cannot be solved are refused'''
+        board = PuzzleBoard(3, 3)
+        board.set_tiles([2, 1, 3, 4, 5, 6, 7, 8, 0])
+        with self.assertRaises(ValueError):
+            PuzzleSolver(3, 3).solve(board)
+        with self.assertRaises(ValueError):
+            get_solver(3, 3).solve(board)
+
+    def test_shared_table(self):
+        '''every 3x3 solver of the process uses the same table'''
+        self.assertIs(get_solver(3, 3).get_table(), get_solver(3, 3).get_table())
+
+    def test_shared_distances(self):
+        '''solvers and hinters of a board size use the same distance table'''
+        distances = PuzzleSolver(4, 4).distances
+        self.assertIs(PuzzleHinter(4, 4).distances, distances)
+        self.assertEqual(distances[1][15], 6)
+        self.assertEqual(distances[0], [0]*16)
+
+    def test_table_without_file(self):
+        '''the table still works in memory when it cannot be saved'''
+        with tempfile.TemporaryDirectory() as folder:
+            table = PuzzleEightTable(path.join(folder, "missing", "eight.db"))
+            board = PuzzleBoard(3, 3)
+            board.shuffle(20, random.Random(7))
+            self.assertEqual(len(table.solve(board)), get_solver(3, 3).get_distance(board))
+            self.assertEqual(os.listdir(folder), [])
+
+if __name__ == "__main__":
+    unittest.main()
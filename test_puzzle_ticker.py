@@ -0,0 +1,98 @@
+# Slide Puzzle Ticker Tests
+# Auther: G.G.Otto
+# Version: 1.3
+
+import time
+import unittest
+from slide_puzzle import PuzzleTicker
+
+class FakeWidget:
+    '''represents a widget that keeps its afters for the test to run'''
+
+    def __init__(self):
+        '''FakeWidget() -> FakeWidget
+        constructs the widget with nothing pending'''
+        self.afters = {}
+        self.count = 0
+
+    def after(self, delay, function):
+        '''FakeWidget.after(delay, function) -> int
+        keeps function to be run by run_pending'''
+        self.count += 1
+        self.afters[self.count] = function
+        return self.count
+
+    def after_cancel(self, after):
+        '''FakeWidget.after_cancel(after) -> None
+        forgets a pending function'''
+        self.afters.pop(after, None)
+
+    def run_pending(self):
+        '''FakeWidget.run_pending() -> None
+        runs every pending function'''
+        afters = list(self.afters.values())
+        self.afters = {}
+        for function in afters:
+            function()
+
+class PuzzleTickerTest(unittest.TestCase):
+    '''tests of the ticker with a fake widget'''
+
+    def test_zero_interval(self):
+        '''a job with no interval runs and can be added again from inside itself'''
+        widget = FakeWidget()
+        ticker = PuzzleTicker(widget)
+        calls = []
+        def step(now):
+            calls.append(now)
+            if len(calls) < 3:
+                ticker.add_job("replay", 0, step)
+            return False
+        ticker.add_job("replay", 0, step)
+        for i in range(5):
+            time.sleep(0.002)
+            widget.run_pending()
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(ticker.jobs, {})
+
+    def test_zero_interval_late(self):
+        '''a late job with no interval is not made to catch up'''
+        widget = FakeWidget()
+        ticker = PuzzleTicker(widget)
+        calls = []
+        ticker.add_job("poll", 0, lambda now: calls.append(now) or len(calls) < 2, -1)
+        for i in range(3):
+            widget.run_pending()
+        self.assertEqual(len(calls), 2)
+
+    def test_raising_job(self):
+        '''a job that raises can still run again'''
+        widget = FakeWidget()
+        ticker = PuzzleTicker(widget)
+        calls = []
+        def fail(now):
+            calls.append(now)
+            raise RuntimeError("job failed")
+        ticker.add_job("fail", 0, fail)
+        with self.assertRaises(RuntimeError):
+            widget.run_pending()
+        self.assertFalse(ticker.jobs["fail"][3])
+        time.sleep(0.002)
+        with self.assertRaises(RuntimeError):
+            widget.run_pending()
+        self.assertEqual(len(calls), 2)
+
+    def test_interval(self):
+        '''jobs run every interval until they return False'''
+        widget = FakeWidget()
+        ticker = PuzzleTicker(widget)
+        calls = []
+        ticker.add_job("timer", 0.001, lambda now: calls.append(now) or len(calls) < 4, 0)
+        for i in range(10):
+            time.sleep(0.002)
+            widget.run_pending()
+        self.assertEqual(len(calls), 4)
+        self.assertNotIn("timer", ticker.jobs)
+
+if __name__ == "__main__":
+    unittest.main()